@@ -0,0 +1,61 @@
+"""Compares the memory (as measured by tracemalloc) retained by every client and server TestProcedure when loaded as
+the regular object model vs the compact (slotted, frozen and deduplicated) model from cactus_test_definitions.compact.
+
+Usage: python -m benchmarks.compact_memory
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+
+
+def load_catalogs(compact: bool) -> list[TestProcedureCatalog]:
+    catalogs: list[TestProcedureCatalog] = []
+    for template in [CLIENT_CATALOG, SERVER_CATALOG]:
+        catalog = TestProcedureCatalog(template.procedures_package, template.procedure_ids, template.parse, compact)
+        catalog.use_precompiled(None)
+        catalog.load_all()
+        catalogs.append(catalog)
+    return catalogs
+
+
+def retained_bytes(load: Callable[[], Any]) -> tuple[int, Any]:
+    """Bytes still allocated (as measured by tracemalloc) after calling load (and a full collection)"""
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    result = load()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    return after - before, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+
+    load_catalogs(compact=True)  # Warm up - generate the compact classes (and any other one off allocations)
+
+    tracemalloc.start()
+    print(f"{'model':<10}{'procedures':>12}{'bytes':>12}{'bytes/procedure':>18}{'vs regular':>12}")
+    regular_bytes = 0
+    for compact in [False, True]:
+        size, catalogs = retained_bytes(lambda compact=compact: load_catalogs(compact))
+        count = sum(c.cache_info().size for c in catalogs)
+        regular_bytes = regular_bytes or size
+        name = "compact" if compact else "regular"
+        print(f"{name:<10}{count:>12}{size:>12}{size // count:>18}{size / regular_bytes:>11.0%}")
+        hash_cons_infos = [info for c in catalogs if (info := c.hash_cons_info()) is not None]
+        del catalogs
+    for info in hash_cons_infos:
+        print(f"Deduplicated {info.deduplicated} of {info.nodes} compact nodes")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compares dataclass_wizard's generic fromdict against the generated decoders (see decoders.build_decoder) for
+converting already loaded YAML into every client and server TestProcedure. YAML parsing is excluded from the timings.
+
+Usage: python -m benchmarks.decoders [--repeat N]
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+import yaml
+from dataclass_wizard import fromdict
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.schema import FastUniqueKeyLoader
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+
+def best_time_ms(decode: Callable[[Any], Any], raw_procedures: list[Any], repeat: int) -> float:
+    """Best of repeat runs (in milliseconds) of decoding every entry in raw_procedures"""
+    timer = timeit.Timer(lambda: [decode(raw) for raw in raw_procedures])
+    return min(timer.repeat(repeat=repeat, number=1)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed runs per module (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'module':<10}{'procedures':>12}{'wizard (ms)':>14}{'generated (ms)':>16}{'speedup':>10}")
+    for name, module in [("client", client_test_procedures), ("server", server_test_procedures)]:
+        raw_procedures = [
+            yaml.load(module.get_yaml_contents(tp_id), Loader=FastUniqueKeyLoader)  # noqa: S506 # SafeLoader
+            for tp_id in module.TestProcedureId
+        ]
+        wizard_ms = best_time_ms(lambda raw, cls=module.TestProcedure: fromdict(cls, raw), raw_procedures, args.repeat)
+        generated_ms = best_time_ms(module.decode_test_procedure, raw_procedures, args.repeat)
+        speedup = wizard_ms / generated_ms
+        print(f"{name:<10}{len(raw_procedures):>12}{wizard_ms:>14.2f}{generated_ms:>16.2f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compares sequential loading of the full client and server catalogs against parallel loading across a
+ProcessPoolExecutor of 1, 2, 4 and 8 workers. The precompiled artifact is ignored so every procedure is parsed from
+YAML. Parallel timings include the cost of starting the worker processes.
+
+Usage: python -m benchmarks.parallel_load [--repeat N] [--workers 1 2 4 8]
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+
+
+def fresh_catalogs() -> list[TestProcedureCatalog]:
+    catalogs: list[TestProcedureCatalog] = []
+    for template in [CLIENT_CATALOG, SERVER_CATALOG]:
+        catalog = TestProcedureCatalog(template.procedures_package, template.procedure_ids, template.parse)
+        catalog.use_precompiled(None)
+        catalogs.append(catalog)
+    return catalogs
+
+
+def time_load_ms(workers: int | None) -> float:
+    """Time (in milliseconds) to load every client/server procedure. workers of None will load sequentially"""
+    catalogs = fresh_catalogs()
+    start = time.perf_counter()
+    if workers is None:
+        for catalog in catalogs:
+            catalog.load_all()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for catalog in catalogs:
+                catalog.load_all(executor=executor)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per configuration (best reported)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare")
+    args = parser.parse_args()
+
+    sequential_ms = min(time_load_ms(None) for _ in range(args.repeat))
+    print(f"{'mode':<16}{'time (ms)':>12}{'speedup':>10}")
+    print(f"{'sequential':<16}{sequential_ms:>12.1f}{1:>9.2f}x")
+    for workers in args.workers:
+        parallel_ms = min(time_load_ms(workers) for _ in range(args.repeat))
+        print(f"{f'{workers} workers':<16}{parallel_ms:>12.1f}{sequential_ms / parallel_ms:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
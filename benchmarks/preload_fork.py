@@ -0,0 +1,96 @@
+"""Measures the memory growth of forked worker processes that each load (and walk) every client and server
+TestProcedure - comparing workers forked from a parent that didn't load anything vs a parent that called
+cactus_test_definitions.preload.preload() before forking.
+
+RSS includes pages still shared (copy on write) with the parent so the private (unshared) growth is the better measure
+of the per worker cost. Linux only (reads /proc/self/smaps_rollup).
+
+Usage: python -m benchmarks.preload_fork [--workers N] [--no-freeze]
+"""
+
+import argparse
+import gc
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.index import procedure_terms
+from cactus_test_definitions.preload import preload
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+SMAPS_ROLLUP = Path("/proc/self/smaps_rollup")
+
+
+def read_memory_kb() -> tuple[int, int]:
+    """Returns (rss, private) of the current process in KiB"""
+    values: dict[str, int] = {}
+    for line in SMAPS_ROLLUP.read_text().splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB":
+            values[parts[0].rstrip(":")] = int(parts[1])
+    return values["Rss"], values["Private_Clean"] + values["Private_Dirty"]
+
+
+def run_worker() -> tuple[int, int]:
+    """Simulates a worker - returns the (rss, private) growth in KiB"""
+    rss_before, private_before = read_memory_kb()
+    for module in [client_test_procedures, server_test_procedures]:
+        for procedure in module.get_all_test_procedures().materialize().values():
+            procedure_terms(procedure)  # Walks every node of every procedure
+    gc.collect()
+    rss_after, private_after = read_memory_kb()
+    return rss_after - rss_before, private_after - private_before
+
+
+def fork(target: Callable[..., object], *args: object) -> int:
+    """Runs target(*args) in a forked child - returning a file descriptor for reading its (JSON encoded) result"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            os.write(write_fd, json.dumps(target(*args)).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    return read_fd
+
+
+def read_result(read_fd: int) -> Any:  # noqa: ANN401
+    """Reads the result written by a child started via fork (and then waits for that child to exit)"""
+    with os.fdopen(read_fd, "rb") as f:
+        result = json.loads(f.read())
+    os.wait()
+    return result
+
+
+def run_mode(preloaded: bool, freeze: bool, workers: int) -> list[tuple[int, int]]:
+    """Forks workers from this process (after optionally preloading) - returns the growth of each worker"""
+    if preloaded:
+        preload(freeze=freeze)
+    return [read_result(fork(run_worker)) for _ in range(workers)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4, help="Number of workers forked per mode")
+    parser.add_argument("--no-freeze", action="store_true", help="Preload without calling gc.freeze()")
+    args = parser.parse_args()
+
+    if not SMAPS_ROLLUP.exists():
+        raise SystemExit(f"{SMAPS_ROLLUP} is unavailable - this benchmark requires Linux")
+
+    print(f"{'mode':<16}{'rss growth/worker (KiB)':>26}{'private growth/worker (KiB)':>30}")
+    for name, preloaded in [("no preload", False), ("preload", True)]:
+        # Each mode runs in its own fork so the preloading of one mode can't influence the other
+        growths = read_result(fork(run_mode, preloaded, not args.no_freeze, args.workers))
+        rss = sum(g[0] for g in growths) // len(growths)
+        private = sum(g[1] for g in growths) // len(growths)
+        print(f"{name:<16}{rss:>26}{private:>30}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compares the cost of starting "spawn" based worker processes that each load the first client and server
+TestProcedure (as a runner session would) when the procedures come from:
+
+- yaml: Parsing the YAML definitions (i.e. no precompiled artifact - eg running from a checkout)
+- packaged: The precompiled artifact shipped with the package (read in full by each worker)
+- shared: A single copy of the precompiled artifact in shared memory (see cactus_test_definitions.shared)
+
+Reports the private (unshared) memory growth and time taken by each worker. Linux only (reads
+/proc/self/smaps_rollup).
+
+Usage: python -m benchmarks.shared_memory [--workers N]
+"""
+
+import argparse
+import time
+from multiprocessing import get_context
+
+from benchmarks.preload_fork import SMAPS_ROLLUP, read_memory_kb
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.shared import initialise_worker, share_default_catalogs
+
+MODES = ["yaml", "packaged", "shared"]
+
+
+def run_worker(mode: str, client_name: str, server_name: str) -> tuple[int, float]:
+    """Returns the (private memory growth in KiB, elapsed ms) for loading the first client / server procedure"""
+    _, private_before = read_memory_kb()
+    start = time.perf_counter()
+    if mode == "yaml":
+        client_test_procedures.TEST_PROCEDURE_CATALOG.use_precompiled(None)
+        server_test_procedures.TEST_PROCEDURE_CATALOG.use_precompiled(None)
+    elif mode == "shared":
+        initialise_worker(client_name, server_name)
+
+    for module in [client_test_procedures, server_test_procedures]:
+        module.get_procedure_summaries()
+        module.get_test_procedure(list(module.TestProcedureId)[0])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, private_after = read_memory_kb()
+    return private_after - private_before, elapsed_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4, help="Number of workers spawned per mode")
+    args = parser.parse_args()
+
+    if not SMAPS_ROLLUP.exists():
+        raise SystemExit(f"{SMAPS_ROLLUP} is unavailable - this benchmark requires Linux")
+
+    client, server = share_default_catalogs()
+    with client, server:
+        print(f"Shared blocks: {client.shared_memory.size + server.shared_memory.size} bytes")
+        print(f"{'mode':<12}{'private growth/worker (KiB)':>30}{'time/worker (ms)':>20}")
+        for mode in MODES:
+            with get_context("spawn").Pool(args.workers, maxtasksperchild=1) as pool:
+                results = pool.starmap(run_worker, [(mode, client.name, server.name)] * args.workers)
+            private = sum(r[0] for r in results) // len(results)
+            elapsed_ms = sum(r[1] for r in results) / len(results)
+            print(f"{mode:<12}{private:>30}{elapsed_ms:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+"""Regression benchmark suite for the hot paths of this library:
+
+- catalog_load[...]: Loading every client + server procedure - cold (parsing YAML), from a precompiled artifact and
+  warm (every procedure already cached)
+- parse[...]: parse_test_procedure of the largest client / server definitions
+- validate[...]: validate_test_procedure of every procedure in a catalog (with an empty validation cache)
+- expressions: Extracting + parsing every $(...) variable expression in the catalog YAML
+- parameter_types: is_valid_parameter_type of every action / check / event / admin instruction parameter
+- import[...]: Cumulative import time (as reported by python -X importtime) of the package and the procedure models
+- scaling[...]: parse_test_procedure / validate_test_procedure of synthetic client / server procedures (see
+  cactus_test_definitions.synthetic) of increasing numbers of steps (--scaling-steps) - summarised as scaling curves
+
+Results are written as JSON (see --output) and compared against a committed baseline (benchmarks/baseline.json). Any
+benchmark slower than its baseline by more than its threshold (a fraction - eg 0.25 is 25% slower) is reported as a
+regression and the process exits with 1. Per benchmark thresholds can be set in the "thresholds" of the baseline. The
+baseline should be regenerated (--update-baseline) on the reference machine whenever an intentional change is made.
+
+The median time of a benchmark varies between invocations of the suite (not just between the runs within one) - so the
+baseline is recorded over several rounds (--rounds, each in a new process) and the noise of each benchmark (the largest
+deviation of a round's median from the median of every round) is recorded alongside its median. A benchmark is only
+reported as a regression if it's slower than both its threshold and NOISE_MULTIPLIER times its noise (scaled for the
+number of runs - a median of fewer runs varies more). Comparisons can also be made over several rounds.
+
+The timed runs of every benchmark are interleaved (see run_benchmarks) so that transient slow downs of the machine (eg
+noisy neighbours on shared CI runners) only affect a single run of each benchmark. Median times are compared (best
+times vary far more between runs) and are compared as is by default. A fixed pure python calibration workload is also
+timed within every pass (its median time is recorded in the results) - --normalize scales every comparison by the
+change in calibration since the baseline, for comparing against a baseline recorded on a machine that runs at a
+different speed.
+
+Usage: python -m benchmarks.suite [--repeat N] [--rounds N] [--filter TEXT ...] [--output FILE] [--baseline FILE]
+                                  [--threshold FRACTION] [--normalize] [--update-baseline]
+                                  [--scaling-steps N ...]
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from cactus_test_definitions import __version__
+from cactus_test_definitions.cache import configure_parse_cache, reset_parse_cache_configuration
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client import actions as client_actions
+from cactus_test_definitions.client import checks as client_checks
+from cactus_test_definitions.client import events as client_events
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client import validate as client_validate
+from cactus_test_definitions.parameters import ParameterSchema, ParameterType, is_valid_parameter_type
+from cactus_test_definitions.precompiled import PrecompiledCatalog, build_precompiled_artifact
+from cactus_test_definitions.schema import FastUniqueKeyLoader
+from cactus_test_definitions.server import actions as server_actions
+from cactus_test_definitions.server import admin_instructions as server_admin_instructions
+from cactus_test_definitions.server import checks as server_checks
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.server import validate as server_validate
+from cactus_test_definitions.synthetic import SyntheticProcedureShape, synthetic_yaml
+from cactus_test_definitions.variable_expressions import (
+    parse_variable_expression_body,
+    try_extract_variable_expression,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+BASELINE_ROUNDS = 5  # Default rounds (see --rounds) when updating the baseline
+NOISE_MULTIPLIER = 2.0  # A benchmark is only a regression if its change exceeds this multiple of its (baseline) noise
+MAX_NOISE_THRESHOLD = 1.0  # Upper bound of the threshold derived from the noise of a benchmark
+CALIBRATION_REPEAT = 3  # Calibration runs per pass (see run_benchmarks)
+LARGEST_PROCEDURE_COUNT = 2  # Number of the largest client (and server) definitions to benchmark parsing of
+SCALING_STEPS = [100, 1000]  # Default sizes (number of steps) of the synthetic procedures in the scaling benchmarks
+SCALING_PHASES = ["parse", "validate"]
+
+TEST_PROCEDURE_MODULES = {"client": client_test_procedures, "server": server_test_procedures}
+VALIDATE_MODULES = {"client": client_validate, "server": server_validate}
+IMPORT_MODULES = [
+    "cactus_test_definitions",
+    "cactus_test_definitions.client.test_procedures",
+    "cactus_test_definitions.server.test_procedures",
+]
+
+# The parameter schema table for each (parsed) element type that has parameters
+SCHEMA_TABLES: dict[type, dict[str, dict[str, ParameterSchema]]] = {
+    client_actions.Action: client_actions.ACTION_PARAMETER_SCHEMA,
+    client_checks.Check: client_checks.CHECK_PARAMETER_SCHEMA,
+    client_events.Event: client_events.EVENT_PARAMETER_SCHEMA,
+    server_actions.Action: server_actions.ACTION_PARAMETER_SCHEMA,
+    server_checks.Check: server_checks.CHECK_PARAMETER_SCHEMA,
+    server_admin_instructions.AdminInstruction: server_admin_instructions.ADMIN_INSTRUCTION_PARAMETER_SCHEMA,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+    name: str
+    measure_ms: Callable[[], float]  # Performs a single timed run - returning the elapsed time in milliseconds
+
+
+def timed(run: Callable[[], object], setup: Callable[[], object] | None = None, number: int = 1) -> Callable[[], float]:
+    """Generates a Benchmark.measure_ms that times (in milliseconds per call) number calls of run. setup (if
+    specified) is called before each timed run (and isn't timed). The garbage collector is disabled while timing"""
+
+    def measure_ms() -> float:
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            return (time.perf_counter() - start) * 1000 / number
+        finally:
+            gc.enable()
+
+    return measure_ms
+
+
+def calibration_workload() -> None:
+    """Fixed pure python work (independent of this library) - for measuring the current speed of the machine"""
+    values = {str(i): i for i in range(20000)}
+    sorted(values, key=lambda k: values[k] % 97)
+
+
+measure_calibration_ms = timed(calibration_workload, number=5)
+
+
+def fresh_catalog(kind: str) -> TestProcedureCatalog:
+    """A new (empty) instance of the default catalog of kind that will parse every YAML definition"""
+    template = TEST_PROCEDURE_MODULES[kind].TEST_PROCEDURE_CATALOG
+    catalog = TestProcedureCatalog(template.procedures_package, template.procedure_ids, template.parse)
+    catalog.use_precompiled(None)
+    return catalog
+
+
+def catalog_load_benchmarks() -> Iterator[Benchmark]:
+    def load_cold() -> None:
+        for kind in TEST_PROCEDURE_MODULES:
+            fresh_catalog(kind).load_all()
+
+    artifacts = {kind: build_precompiled_artifact(fresh_catalog(kind)) for kind in TEST_PROCEDURE_MODULES}
+
+    def load_precompiled() -> None:
+        for kind, artifact in artifacts.items():
+            catalog = fresh_catalog(kind)
+            catalog.use_precompiled(PrecompiledCatalog(artifact))
+            catalog.load_all()
+
+    warm_catalogs = [fresh_catalog(kind) for kind in TEST_PROCEDURE_MODULES]
+    for catalog in warm_catalogs:
+        catalog.load_all()
+
+    def load_warm() -> None:
+        for catalog in warm_catalogs:
+            for procedure_id in catalog.procedure_ids:
+                catalog.get(procedure_id)
+
+    yield Benchmark("catalog_load[cold]", timed(load_cold))
+    yield Benchmark("catalog_load[precompiled]", timed(load_precompiled))
+    yield Benchmark("catalog_load[warm]", timed(load_warm, number=100))
+
+
+def parse_benchmarks() -> Iterator[Benchmark]:
+    for module in TEST_PROCEDURE_MODULES.values():
+        yaml_contents = module.get_all_yaml_contents()
+        largest = sorted(yaml_contents, key=lambda procedure_id: len(yaml_contents[procedure_id]), reverse=True)
+        for procedure_id in largest[:LARGEST_PROCEDURE_COUNT]:
+            parse = module.parse_test_procedure
+            yield Benchmark(
+                f"parse[{procedure_id}]", timed(lambda p=parse, y=yaml_contents[procedure_id]: p(y), number=10)
+            )
+
+
+def validate_benchmarks() -> Iterator[Benchmark]:
+    for kind, module in TEST_PROCEDURE_MODULES.items():
+        procedures = module.get_all_test_procedures().materialize()
+        validate_module = VALIDATE_MODULES[kind]
+
+        def validate_all(procedures: dict = procedures, validate_module: Any = validate_module) -> None:  # noqa: ANN401
+            validate_module.VALIDATION_CACHE.clear()  # Measure the actual validation (not memoized results)
+            for procedure_id, procedure in procedures.items():
+                validate_module.validate_test_procedure(procedure, procedure_id)
+
+        yield Benchmark(f"validate[{kind}]", timed(validate_all, number=5))
+
+
+def iter_expressions(value: Any, key: str | None = None) -> Iterator[tuple[str, str | None]]:  # noqa: ANN401
+    """Yields the (string, parameter key) of every string containing a variable expression in raw (YAML loaded) value"""
+    if isinstance(value, dict):
+        for child_key, child in value.items():
+            yield from iter_expressions(child, child_key)
+    elif isinstance(value, list):
+        for child in value:
+            yield from iter_expressions(child, key)
+    elif isinstance(value, str):
+        try:
+            body = try_extract_variable_expression(value)
+        except ValueError:
+            return
+        if body is not None:
+            yield value, key
+
+
+def expression_benchmarks() -> Iterator[Benchmark]:
+    expressions = [
+        expression
+        for module in TEST_PROCEDURE_MODULES.values()
+        for yaml_contents in module.get_all_yaml_contents().values()
+        for expression in iter_expressions(yaml.load(yaml_contents, Loader=FastUniqueKeyLoader))  # noqa: S506
+    ]
+
+    def parse_all() -> None:
+        for value, key in expressions:
+            parse_variable_expression_body(try_extract_variable_expression(value), key)  # type: ignore[arg-type]
+
+    yield Benchmark("expressions", timed(parse_all, number=20))
+
+
+def iter_typed_parameters(value: Any) -> Iterator[tuple[ParameterType, Any]]:  # noqa: ANN401
+    """Yields the (expected type, value) of every schema defined parameter within a parsed procedure"""
+    schema_table = SCHEMA_TABLES.get(type(value), None)
+    if schema_table is not None:
+        schema = schema_table.get(value.type, {})
+        for name, parameter in (value.parameters or {}).items():
+            if name in schema:
+                yield schema[name].expected_type, parameter
+
+    if isinstance(value, list | tuple):
+        for child in value:
+            yield from iter_typed_parameters(child)
+    elif isinstance(value, dict):
+        for child in value.values():
+            yield from iter_typed_parameters(child)
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for field in dataclasses.fields(value):
+            yield from iter_typed_parameters(getattr(value, field.name))
+
+
+def parameter_type_benchmarks() -> Iterator[Benchmark]:
+    parameters = [
+        typed_parameter
+        for module in TEST_PROCEDURE_MODULES.values()
+        for procedure in module.get_all_test_procedures().materialize().values()
+        for typed_parameter in iter_typed_parameters(procedure)
+    ]
+
+    def check_all() -> None:
+        for expected_type, value in parameters:
+            is_valid_parameter_type(expected_type, value)
+
+    yield Benchmark("parameter_types", timed(check_all, number=20))
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module (in a new interpreter) as reported by python -X importtime"""
+    completed = subprocess.run(  # noqa: S603 # Only ever runs this interpreter
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise ValueError(f"Unable to find the import time of {module}")
+
+
+def import_benchmarks() -> Iterator[Benchmark]:
+    for module in IMPORT_MODULES:
+        yield Benchmark(f"import[{module}]", lambda module=module: import_time_ms(module))
+
+
+def scaling_name(kind: str, phase: str, steps: int) -> str:
+    return f"scaling[{kind}-{phase}-{steps}]"
+
+
+def scaling_benchmarks(steps: list[int]) -> Iterator[Benchmark]:
+    for kind, module in TEST_PROCEDURE_MODULES.items():
+        validate_module = VALIDATE_MODULES[kind]
+        for step_count in steps:
+            # Admin instructions are only generated for server procedures (client instructions are just text)
+            shape = SyntheticProcedureShape(steps=step_count, admin_instructions_per_step=int(kind == "server"))
+            yaml_contents = synthetic_yaml(kind, shape)
+            procedure = module.parse_test_procedure(yaml_contents)
+
+            def validate(procedure: Any = procedure, validate_module: Any = validate_module) -> None:  # noqa: ANN401
+                validate_module.VALIDATION_CACHE.clear()
+                validate_module.validate_test_procedure(procedure, "SYNTHETIC")
+
+            yield Benchmark(
+                scaling_name(kind, "parse", step_count),
+                timed(lambda p=module.parse_test_procedure, y=yaml_contents: p(y)),
+            )
+            yield Benchmark(scaling_name(kind, "validate", step_count), timed(validate))
+
+
+def print_scaling_curves(results: dict[str, dict[str, float]], steps: list[int]) -> None:
+    """Prints the time per step of each scaling benchmark (by number of steps) along with the growth exponent from the
+    previous size (1.0 is linear, 2.0 is quadratic)"""
+    print(f"\n{'scaling curve':<24}{'steps':>10}{'best (ms)':>12}{'us/step':>10}{'exponent':>10}")
+    for kind in TEST_PROCEDURE_MODULES:
+        for phase in SCALING_PHASES:
+            previous: tuple[int, float] | None = None
+            for step_count in sorted(steps):
+                result = results.get(scaling_name(kind, phase, step_count), None)
+                if result is None:
+                    continue
+                best_ms = result["best_ms"]
+                exponent = "-"
+                if previous is not None and previous[0] != step_count:
+                    exponent = f"{math.log(best_ms / previous[1]) / math.log(step_count / previous[0]):.2f}"
+                per_step_us = best_ms * 1000 / step_count
+                print(f"{kind + ' ' + phase:<24}{step_count:>10}{best_ms:>12.1f}{per_step_us:>10.1f}{exponent:>10}")
+                previous = (step_count, best_ms)
+
+
+BENCHMARK_GROUPS: list[Callable[[], Iterator[Benchmark]]] = [
+    catalog_load_benchmarks,
+    parse_benchmarks,
+    validate_benchmarks,
+    expression_benchmarks,
+    parameter_type_benchmarks,
+    import_benchmarks,
+]
+
+
+def run_benchmarks(benchmarks: list[Benchmark], repeat: int) -> tuple[dict[str, dict[str, float]], float]:
+    """Runs every benchmark repeat times - returning the best / median time (in milliseconds) of each, keyed by name,
+    along with the median time of the calibration workload.
+
+    Runs are interleaved (each pass runs the calibration workload and then every benchmark once) so that a transient
+    change in the speed of the machine affects a single run of every benchmark rather than every run of one"""
+    timings: dict[str, list[float]] = {benchmark.name: [] for benchmark in benchmarks}
+    calibration_timings: list[float] = []
+    for _ in range(repeat):
+        calibration_timings.extend(measure_calibration_ms() for _ in range(CALIBRATION_REPEAT))
+        for benchmark in benchmarks:
+            timings[benchmark.name].append(benchmark.measure_ms())
+
+    results = {}
+    for name, benchmark_timings in timings.items():
+        best_ms, median_ms = round(min(benchmark_timings), 3), round(statistics.median(benchmark_timings), 3)
+        results[name] = {"best_ms": best_ms, "median_ms": median_ms}
+        print(f"{name:<56}{best_ms:>12.3f}{median_ms:>12.3f}", flush=True)
+    return results, round(statistics.median(calibration_timings), 3)
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run_rounds(rounds: int, child_args: list[str]) -> tuple[dict[str, dict[str, float]], float]:
+    """Runs the suite rounds times (each in a new process with child_args) - returning the combined results: the
+    median of every round's median / calibration, the best of every round's best and the noise of each benchmark (the
+    largest relative deviation of a round's median from the combined median)"""
+    round_reports = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(rounds):
+            print(f"\nRound {i + 1} of {rounds}", flush=True)
+            output = Path(temp_dir) / f"round-{i}.json"
+            no_baseline = Path(temp_dir) / "no-baseline.json"  # Rounds don't compare against anything
+            command = [sys.executable, "-m", "benchmarks.suite", *child_args, "--output", str(output)]
+            subprocess.run([*command, "--baseline", str(no_baseline)], check=True)  # noqa: S603 # This module
+            round_reports.append(json.loads(output.read_text()))
+
+    results = {}
+    for name in round_reports[0]["results"]:
+        round_results = [report["results"][name] for report in round_reports]
+        median_ms = statistics.median(result["median_ms"] for result in round_results)
+        noise = max(abs(result["median_ms"] / median_ms - 1) for result in round_results)
+        results[name] = {
+            "best_ms": min(result["best_ms"] for result in round_results),
+            "median_ms": round(median_ms, 3),
+            "noise": round(noise, 4),
+        }
+    return results, round(statistics.median(report["calibration_ms"] for report in round_reports), 3)
+
+
+def allowed_change(
+    name: str, baseline: dict[str, Any], threshold: float, repeat: int = DEFAULT_REPEAT
+) -> tuple[float, bool]:
+    """The largest change (see relative_change) of benchmark name that isn't a regression - the greater of its
+    threshold (the default threshold, or its threshold in the baseline) and NOISE_MULTIPLIER times the noise of the
+    baseline result (scaled by the number of runs - repeat - that the compared median was taken from). Also returns
+    True if the noise determined the allowed change"""
+    allowed = baseline.get("thresholds", {}).get(name, threshold)
+    noise = baseline.get("results", {}).get(name, {}).get("noise", 0.0)
+    scaled_noise = noise * math.sqrt(baseline.get("repeat", DEFAULT_REPEAT) / max(repeat, 1))
+    noise_allowed = min(NOISE_MULTIPLIER * scaled_noise, MAX_NOISE_THRESHOLD)
+    return max(allowed, noise_allowed), noise_allowed > allowed
+
+
+def relative_change(
+    result: dict[str, float], baseline_result: dict[str, float], calibration_ratio: float = 1.0
+) -> float:
+    """The change in median time from baseline_result to result (eg 0.1 is 10% slower). calibration_ratio is the current
+    calibration time / the baseline calibration time (see --normalize) - 1.0 compares the median times as is"""
+    return result["median_ms"] / baseline_result["median_ms"] / calibration_ratio - 1
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, Any],
+    threshold: float,
+    calibration_ms: float | None = None,
+    report_missing: bool = True,
+    repeat: int = DEFAULT_REPEAT,
+) -> list[tuple[str, str]]:
+    """Compares the median times of results (each the median of repeat runs) against baseline - printing a row per
+    benchmark and returning the (name, description) of every regression (see allowed_change). If calibration_ms (of the
+    current run) is specified, changes are normalised by the change in calibration since the baseline. report_missing
+    will also list baseline benchmarks absent from results"""
+    baseline_results = baseline.get("results", {})
+    regressions = []
+
+    calibration_ratio = 1.0
+    if calibration_ms is not None and "calibration_ms" in baseline:
+        calibration_ratio = calibration_ms / baseline["calibration_ms"]
+    print(f"\n{'benchmark':<56}{'baseline':>12}{'current':>12}{'change':>10}  status")
+    if calibration_ratio != 1.0:
+        print(f"(changes are normalised by the calibration workload - {calibration_ratio:.3f}x the baseline)")
+    for name, result in results.items():
+        if name not in baseline_results:
+            print(f"{name:<56}{'-':>12}{result['median_ms']:>12.3f}{'-':>10}  new")
+            continue
+
+        baseline_ms = baseline_results[name]["median_ms"]
+        change = relative_change(result, baseline_results[name], calibration_ratio)
+        allowed, from_noise = allowed_change(name, baseline, threshold, repeat)
+        limit = f"{allowed:.0%}{' noise' if from_noise else ''}"
+        status = "ok"
+        if change > allowed:
+            status = f"REGRESSION (> {limit})"
+            regressions.append((name, f"{change:+.1%} slower than baseline (threshold {limit})"))
+        print(f"{name:<56}{baseline_ms:>12.3f}{result['median_ms']:>12.3f}{change:>+10.1%}  {status}")
+
+    for name in sorted(baseline_results.keys() - results.keys() if report_missing else []):
+        print(f"{name:<56}{baseline_results[name]['median_ms']:>12.3f}{'-':>12}{'-':>10}  missing")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark (median compared)")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=None,
+        help=f"Run the suite this many times (in new processes) combining the results (default 1 - or {BASELINE_ROUNDS}"
+        " with --update-baseline)",
+    )
+    parser.add_argument("--filter", nargs="+", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--output", type=Path, help="Write the results (as JSON) to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (eg 0.25)")
+    parser.add_argument("--normalize", action="store_true", help="Normalise changes by the calibration workload")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument(
+        "--scaling-steps", type=int, nargs="+", default=SCALING_STEPS, help="Steps of the synthetic procedures"
+    )
+    args = parser.parse_args()
+    rounds = args.rounds or (BASELINE_ROUNDS if args.update_baseline else 1)
+
+    if rounds > 1:
+        child_args = ["--repeat", str(args.repeat), "--scaling-steps", *map(str, args.scaling_steps)]
+        results, calibration_ms = run_rounds(rounds, child_args + (["--filter", *args.filter] if args.filter else []))
+        print(f"\n{'benchmark':<56}{'best (ms)':>12}{'median (ms)':>12}{'noise':>10}")
+        for name, result in results.items():
+            print(f"{name:<56}{result['best_ms']:>12.3f}{result['median_ms']:>12.3f}{result['noise']:>10.1%}")
+    else:
+        results, calibration_ms = run_suite(args.repeat, args.filter, args.scaling_steps)
+    print_scaling_curves(results, args.scaling_steps)
+
+    report = {
+        "library_version": __version__,
+        "environment": environment(),
+        "repeat": args.repeat,
+        "rounds": rounds,
+        "calibration_ms": calibration_ms,
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    report_or_compare(args, report)
+
+
+def run_suite(
+    repeat: int, filters: list[str] | None, scaling_steps: list[int]
+) -> tuple[dict[str, dict[str, float]], float]:
+    """Runs (a single round of) every benchmark matching filters in this process - see run_benchmarks"""
+    configure_parse_cache(None)  # Measure the actual parsing
+    try:
+        benchmarks = [benchmark for group in BENCHMARK_GROUPS for benchmark in group()]
+        benchmarks.extend(scaling_benchmarks(scaling_steps))
+        if filters:
+            benchmarks = [b for b in benchmarks if any(text in b.name for text in filters)]
+
+        print(f"{'benchmark':<56}{'best (ms)':>12}{'median (ms)':>12}")
+        results, calibration_ms = run_benchmarks(benchmarks, repeat)
+        print(f"{'(calibration)':<56}{calibration_ms:>12.3f}")
+    finally:
+        reset_parse_cache_configuration()
+    return results, calibration_ms
+
+
+def report_or_compare(args: argparse.Namespace, report: dict[str, Any]) -> None:
+    """Updates the baseline with report (--update-baseline) or compares report against the baseline - exiting with 1
+    if there are any regressions"""
+    results = report["results"]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if args.update_baseline:
+        # Retain any configured thresholds (and results of benchmarks that weren't run)
+        previous = baseline or {}
+        report["thresholds"] = previous.get("thresholds", {})
+        report["results"] = {**previous.get("results", {}), **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nUpdated baseline {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline} - nothing to compare against (see --update-baseline)")
+        return
+
+    if baseline.get("environment") != environment():
+        print(f"\nWARNING: The baseline was recorded in a different environment: {baseline.get('environment')}")
+    regressions = compare(
+        results,
+        baseline,
+        args.threshold,
+        calibration_ms=report["calibration_ms"] if args.normalize else None,
+        report_missing=not args.filter,
+        repeat=args.repeat,
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for name, description in regressions:
+            print(f"  {name}: {description}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compares the pure python UniqueKeyLoader against the libyaml accelerated CUniqueKeyLoader on the largest client
+test procedure definitions.
+
+Usage: python -m benchmarks.yaml_loader [--repeat N]
+"""
+
+import argparse
+import timeit
+
+import yaml
+
+from cactus_test_definitions.client.test_procedures import TestProcedureId, get_yaml_contents
+from cactus_test_definitions.schema import FastUniqueKeyLoader, UniqueKeyLoader
+
+BENCHMARK_PROCEDURES = [TestProcedureId.GEN_10, TestProcedureId.LOA_10]
+
+
+def best_time_ms(yaml_contents: str, loader: type, repeat: int) -> float:
+    """Best of repeat runs (in milliseconds) of loading yaml_contents with loader"""
+    timer = timeit.Timer(lambda: yaml.load(yaml_contents, Loader=loader))  # noqa: S506 # Loaders are all "safe"
+    return min(timer.repeat(repeat=repeat, number=1)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs per procedure (best is reported)")
+    args = parser.parse_args()
+
+    if FastUniqueKeyLoader is UniqueKeyLoader:
+        print("PyYAML has been installed without libyaml - there is nothing to compare against.")
+        return
+
+    print(f"{'procedure':<12}{'lines':>8}{'python (ms)':>14}{'libyaml (ms)':>14}{'speedup':>10}")
+    for tp_id in BENCHMARK_PROCEDURES:
+        yaml_contents = get_yaml_contents(tp_id)
+        python_ms = best_time_ms(yaml_contents, UniqueKeyLoader, args.repeat)
+        libyaml_ms = best_time_ms(yaml_contents, FastUniqueKeyLoader, args.repeat)
+        line_count = yaml_contents.count("\n")
+        print(f"{tp_id:<12}{line_count:>8}{python_ms:>14.2f}{libyaml_ms:>14.2f}{python_ms / libyaml_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""setuptools command hooks for building the package (see [tool.setuptools.cmdclass] in pyproject.toml)"""
+
+import os
+import subprocess
+import sys
+
+from setuptools.command.build_py import build_py
+
+# The artifacts written (into each procedures package) by python -m cactus_test_definitions.precompiled
+PRECOMPILED_OUTPUTS = [
+    f"cactus_test_definitions/{kind}/procedures/{resource}"
+    for kind in ("client", "server")
+    for resource in ("precompiled.bin", "procedures.zip")
+]
+
+
+class BuildPyWithPrecompiled(build_py):
+    """build_py that also writes the precompiled artifact and procedures bundle (see
+    cactus_test_definitions.precompiled) into the build directory - so they're shipped with the package. They're built
+    from the copied sources (not the source tree) as release artifacts. Editable installs are skipped (the YAML
+    definitions are used in place)"""
+
+    def run(self) -> None:
+        super().run()
+        if self.dry_run or getattr(self, "editable_mode", False):
+            return
+
+        build_lib = os.path.abspath(self.build_lib)
+        env = {**os.environ, "PYTHONPATH": build_lib, "PYTHONDONTWRITEBYTECODE": "1"}
+        command = [sys.executable, "-m", "cactus_test_definitions.precompiled", "--release"]
+        subprocess.run(command, cwd=build_lib, env=env, check=True)  # noqa: S603 # This package's own build step
+
+    def get_outputs(self, include_bytecode: bool = True) -> list[str]:
+        outputs = super().get_outputs(include_bytecode)
+        if getattr(self, "editable_mode", False):
+            return outputs
+        return [*outputs, *(os.path.join(self.build_lib, *path.split("/")) for path in PRECOMPILED_OUTPUTS)]
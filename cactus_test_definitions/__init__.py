@@ -1,28 +1,16 @@
-from cactus_test_definitions.csipaus import CSIPAusVersion
-from cactus_test_definitions.errors import (
-    TestProcedureDefinitionError,
-    UnparseableVariableExpressionError,
-    UnresolvableVariableError,
-)
-from cactus_test_definitions.variable_expressions import (
-    Constant,
-    ConstantType,
-    Expression,
-    NamedVariable,
-    NamedVariableType,
-    OperationType,
-    parse_binary_expression,
-    parse_time_delta,
-    parse_unary_expression,
-    parse_variable_expression_body,
-    try_extract_variable_expression,
-)
+from typing import TYPE_CHECKING
+
+from cactus_test_definitions.lazy import lazy_attributes
 
 __version__ = "1.14.8"
 
 __all__ = [
     "TestProcedureDefinitionError",
     "CSIPAusVersion",
+    "CatalogCacheInfo",
+    "LazyProcedureMapping",
+    "TestProcedureCatalog",
+    "ProcedureSummary",
     "Expression",
     "Constant",
     "ConstantType",
@@ -37,3 +25,53 @@ __all__ = [
     "parse_binary_expression",
     "parse_unary_expression",
 ]
+
+if TYPE_CHECKING:
+    from cactus_test_definitions.catalog import CatalogCacheInfo, LazyProcedureMapping, TestProcedureCatalog
+    from cactus_test_definitions.csipaus import CSIPAusVersion
+    from cactus_test_definitions.errors import (
+        TestProcedureDefinitionError,
+        UnparseableVariableExpressionError,
+        UnresolvableVariableError,
+    )
+    from cactus_test_definitions.summary import ProcedureSummary
+    from cactus_test_definitions.variable_expressions import (
+        Constant,
+        ConstantType,
+        Expression,
+        NamedVariable,
+        NamedVariableType,
+        OperationType,
+        parse_binary_expression,
+        parse_time_delta,
+        parse_unary_expression,
+        parse_variable_expression_body,
+        try_extract_variable_expression,
+    )
+
+# Everything is imported on first access (PEP 562) so importing this package (or any lightweight module within it, eg
+# csipaus) doesn't pay for importing the (relatively heavy) catalog / variable expression machinery
+__getattr__, __dir__ = lazy_attributes(
+    globals(),
+    {
+        "CatalogCacheInfo": "cactus_test_definitions.catalog",
+        "LazyProcedureMapping": "cactus_test_definitions.catalog",
+        "TestProcedureCatalog": "cactus_test_definitions.catalog",
+        "CSIPAusVersion": "cactus_test_definitions.csipaus",
+        "TestProcedureDefinitionError": "cactus_test_definitions.errors",
+        "UnparseableVariableExpressionError": "cactus_test_definitions.errors",
+        "UnresolvableVariableError": "cactus_test_definitions.errors",
+        "ProcedureSummary": "cactus_test_definitions.summary",
+        "Constant": "cactus_test_definitions.variable_expressions",
+        "ConstantType": "cactus_test_definitions.variable_expressions",
+        "Expression": "cactus_test_definitions.variable_expressions",
+        "NamedVariable": "cactus_test_definitions.variable_expressions",
+        "NamedVariableType": "cactus_test_definitions.variable_expressions",
+        "OperationType": "cactus_test_definitions.variable_expressions",
+        "parse_binary_expression": "cactus_test_definitions.variable_expressions",
+        "parse_time_delta": "cactus_test_definitions.variable_expressions",
+        "parse_unary_expression": "cactus_test_definitions.variable_expressions",
+        "parse_variable_expression_body": "cactus_test_definitions.variable_expressions",
+        "try_extract_variable_expression": "cactus_test_definitions.variable_expressions",
+    },
+)
@@ -0,0 +1,71 @@
+import io
+import json
+import zipfile
+from dataclasses import asdict
+from importlib import resources
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cactus_test_definitions.precompiled import SourcesStamp
+
+# Name of the archive (of every YAML definition) that can live alongside the YAML definitions in a procedures package
+BUNDLE_RESOURCE = "procedures.zip"
+
+_BUNDLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # Fixed timestamp for every member so bundles are reproducible
+
+
+def _encode_stamp(stamp: "SourcesStamp | None") -> bytes:
+    if stamp is None:
+        from cactus_test_definitions import __version__
+
+        return json.dumps({"library_version": __version__, "sources_digest": ""}).encode()
+    return json.dumps(asdict(stamp), sort_keys=True, separators=(",", ":")).encode()
+
+
+def _decode_stamp(comment: bytes) -> "SourcesStamp":
+    from cactus_test_definitions.precompiled import SourcesStamp  # precompiled depends on this module
+
+    raw = json.loads(comment)
+    raw["source_stats"] = {path: tuple(stat) for path, stat in raw.get("source_stats", {}).items()}
+    return SourcesStamp(**raw)
+
+
+def build_procedure_bundle(yaml_contents: dict[str, str], sources: "SourcesStamp | None" = None) -> bytes:
+    """Encodes the YAML definitions (keyed by procedure id) as an uncompressed zip archive with a member per
+    definition. The archive comment records sources - the SourcesStamp of the procedures package that the definitions
+    were read from (if any) - for detecting a stale bundle without reading the definitions in the package."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as bundle:
+        bundle.comment = _encode_stamp(sources)
+        for procedure_id in sorted(yaml_contents):
+            bundle.writestr(zipfile.ZipInfo(f"{procedure_id}.yaml", _BUNDLE_DATE_TIME), yaml_contents[procedure_id])
+    return buffer.getvalue()
+
+
+def read_procedure_bundle(procedures_package: str) -> dict[str, str] | None:
+    """Reads every YAML definition (keyed by procedure id) from the bundle shipped with procedures_package via a single
+    resource read - avoiding a separate lookup/read (or temporary file) per definition when installed as a zip.
+
+    Returns None if the bundle is missing, unreadable, was built by a different version of this library or is stale
+    (the YAML definitions in procedures_package have changed since it was built - see SourcesStamp.is_current)."""
+    try:
+        buffer = (resources.files(procedures_package) / BUNDLE_RESOURCE).read_bytes()
+        with zipfile.ZipFile(io.BytesIO(buffer)) as bundle:
+            if not _decode_stamp(bundle.comment).is_current(procedures_package):
+                return None
+            return {
+                info.filename.removesuffix(".yaml"): bundle.read(info).decode("utf-8") for info in bundle.infolist()
+            }
+    except Exception:
+        return None
+
+
+def write_procedure_bundle(procedures_package: str, yaml_contents: dict[str, str], release: bool = False) -> Path:
+    """Writes the bundle of yaml_contents (which should be the YAML definitions in procedures_package) alongside the
+    YAML definitions in procedures_package. release: see precompiled.build_precompiled_artifact"""
+    from cactus_test_definitions.precompiled import SourcesStamp  # precompiled depends on this module
+
+    bundle_path = Path(str(resources.files(procedures_package) / BUNDLE_RESOURCE))
+    bundle_path.write_bytes(build_procedure_bundle(yaml_contents, SourcesStamp.of(procedures_package, release)))
+    return bundle_path
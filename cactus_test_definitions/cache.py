@@ -0,0 +1,186 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from stat import S_IWGRP, S_IWOTH
+from typing import Any
+
+from cactus_test_definitions.interning import intern_strings
+
+# Environment variable nominating a directory for caching parsed procedures (caching is disabled if unset)
+PARSE_CACHE_DIR_ENV = "CACTUS_TEST_DEFINITIONS_CACHE_DIR"
+
+# Environment variable that (if set to a truthy value) disables the parse cache - even if configure_parse_cache is used
+PARSE_CACHE_DISABLE_ENV = "CACTUS_TEST_DEFINITIONS_CACHE_DISABLE"
+
+# Environment variable for overriding DEFAULT_PARSE_CACHE_MAX_BYTES
+PARSE_CACHE_MAX_BYTES_ENV = "CACTUS_TEST_DEFINITIONS_CACHE_MAX_BYTES"
+
+DEFAULT_PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".pickle"
+
+
+def _is_private(stat_result: os.stat_result) -> bool:
+    """True if stat_result is of a file / directory owned by the current user that no other user can write to"""
+    if not hasattr(os, "geteuid"):
+        return True  # eg Windows - where ownership / permissions aren't reflected in the stat result
+    return stat_result.st_uid == os.geteuid() and not stat_result.st_mode & (S_IWGRP | S_IWOTH)
+
+
+class ParseCache:
+    """A directory of pickled parse results, keyed by a hash of the parsed content. Safe for use by many processes
+    simultaneously - entries are written to a temporary file and then atomically renamed into place.
+
+    As unpickling can execute arbitrary code, entries are only loaded if both the entry and the directory are owned by
+    the current user and can't be written to by anyone else (see _is_private) - any other entry is ignored. New
+    directories are created accessible only to the current user.
+
+    The total size of the entries is bounded by max_bytes - the least recently used entries (by modification time,
+    which is updated on every read) are evicted to make room for new entries."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, contents: str, namespace: str) -> str:
+        """Generates the key for the parse result of contents. namespace should identify the type of the result.
+        Keys also incorporate this library's version / source code so a cache can be shared between versions"""
+        from cactus_test_definitions import __version__
+        from cactus_test_definitions.precompiled import library_sources_digest  # Only needed if caching is enabled
+
+        digest = hashlib.sha256()
+        for part in (__version__, library_sources_digest(), namespace):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(contents.encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Any | None:  # noqa: ANN401
+        """Gets the cached value for key (or None if there is no usable entry). Unreadable entries are removed - entries
+        that could have been written by another user are ignored"""
+        entry_path = self._entry_path(key)
+        try:
+            with entry_path.open("rb") as f:
+                if not (_is_private(os.fstat(f.fileno())) and _is_private(self.directory.stat())):
+                    return None
+                encoded = f.read()
+        except OSError:
+            return None
+
+        try:
+            value = pickle.loads(encoded)  # noqa: S301 # Only written by the current user (checked above)
+        except Exception:
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(entry_path)  # Mark as recently used
+        except OSError:
+            pass  # Concurrently evicted - not a problem for this read
+        return value
+
+    def put(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Stores value under key (replacing any existing entry) and then evicts entries until under max_bytes"""
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        encoded = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            temp_path = Path(f.name)
+            try:
+                f.write(encoded)
+            except BaseException:
+                f.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        os.replace(temp_path, self._entry_path(key))
+        self.evict()
+
+    def entries(self) -> list[tuple[Path, os.stat_result]]:
+        """Lists (path, stat) of every entry in this cache - least recently used first"""
+        entries: list[tuple[Path, os.stat_result]] = []
+        try:
+            paths = list(self.directory.glob(f"*{_ENTRY_SUFFIX}"))
+        except OSError:
+            return entries
+
+        for path in paths:
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                pass  # Concurrently evicted
+        return sorted(entries, key=lambda e: e[1].st_mtime_ns)
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the total size of the cache is under max_bytes"""
+        entries = self.entries()
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= stat.st_size
+
+    def clear(self) -> None:
+        """Removes every entry from this cache"""
+        for path, _ in self.entries():
+            path.unlink(missing_ok=True)
+
+
+_configured = False  # If True - _configured_cache overrides the environment
+_configured_cache: ParseCache | None = None
+
+
+def configure_parse_cache(
+    directory: str | Path | None, max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES
+) -> ParseCache | None:
+    """Nominates the directory used for caching parsed procedures (overriding PARSE_CACHE_DIR_ENV). A directory of
+    None will disable caching. Returns the configured cache"""
+    global _configured, _configured_cache
+    _configured_cache = None if directory is None else ParseCache(directory, max_bytes)
+    _configured = True
+    return _configured_cache
+
+
+def reset_parse_cache_configuration() -> None:
+    """Undoes configure_parse_cache - the cache will once again be configured via the environment"""
+    global _configured, _configured_cache
+    _configured_cache = None
+    _configured = False
+
+
+def get_parse_cache() -> ParseCache | None:
+    """Gets the currently configured ParseCache (or None if caching is not configured / disabled)"""
+    if os.environ.get(PARSE_CACHE_DISABLE_ENV, "").strip().lower() in ("1", "true", "yes", "on"):
+        return None
+    if _configured:
+        return _configured_cache
+
+    directory = os.environ.get(PARSE_CACHE_DIR_ENV, None)
+    if not directory:
+        return None
+    return ParseCache(directory, int(os.environ.get(PARSE_CACHE_MAX_BYTES_ENV, DEFAULT_PARSE_CACHE_MAX_BYTES)))
+
+
+def cached_parse[T](contents: str, cls: type[T], parse: Callable[[str], T]) -> T:
+    """Parses contents into an instance of cls via parse - using the configured ParseCache (if any) to avoid parsing
+    contents that have previously been parsed. Failed parses are never cached"""
+    cache = get_parse_cache()
+    if cache is None:
+        return parse(contents)
+
+    key = cache.key(contents, f"{cls.__module__}.{cls.__qualname__}")
+    cached = cache.get(key)
+    if isinstance(cached, cls):
+        return intern_strings(cached)  # Match the string interning of the YAML loaders
+
+    result = parse(contents)
+    try:
+        cache.put(key, result)
+    except OSError:
+        pass  # The cache is an optimisation - failing to write to it shouldn't fail the parse
+    return result
@@ -0,0 +1,543 @@
+import hashlib
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+from importlib import resources
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+# Only the standard library is imported up front - the rest of this library is imported by the methods that use it so
+# importing a catalog (eg via client.test_procedures) stays cheap
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from cactus_test_definitions.compact import HashConsInfo, HashConsPool
+    from cactus_test_definitions.index import ProcedureIndex
+    from cactus_test_definitions.precompiled import PrecompiledCatalog
+    from cactus_test_definitions.summary import ProcedureSummary
+
+# Parallel loading of fewer procedures than this isn't worth the overhead of distributing work to other processes
+MIN_PARALLEL_LOAD_COUNT = 16
+
+
+def read_procedure_yaml(procedures_package: str, procedure_id: str) -> str:
+    """Reads the raw YAML definition for procedure_id from procedures_package. Reads the resource directly so no
+    temporary file is required if the package has been installed as a zip"""
+    return (resources.files(procedures_package) / f"{procedure_id}.yaml").read_bytes().decode("utf-8")
+
+
+def parse_procedure_yaml[ProcedureT](
+    procedures_package: str, procedure_id: str, parse: Callable[[str], ProcedureT]
+) -> ProcedureT:
+    """Reads and parses the YAML definition for procedure_id. Designed to be run by a worker process so parse
+    must be picklable (eg a module level function)."""
+    return parse(read_procedure_yaml(procedures_package, procedure_id))
+
+
+def _new_pool() -> "HashConsPool":
+    from cactus_test_definitions.compact import HashConsPool
+
+    return HashConsPool()
+
+
+def mark_cached(procedure: object) -> None:
+    """Records that procedure is cached (shared) by a catalog - i.e. it's read only so can be matched by identity when
+    revalidated (see validation_cache.mark_read_only)"""
+    from cactus_test_definitions.validation_cache import mark_read_only
+
+    mark_read_only(procedure)
+
+
+@dataclass(frozen=True)
+class CatalogCacheInfo:
+    """Point in time snapshot of a TestProcedureCatalog's cache performance"""
+
+    hits: int  # Number of lookups served from the cache
+    misses: int  # Number of lookups that required the procedure to be loaded
+    size: int  # Number of procedures currently held in the cache
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Identifies the contents of a YAML definition at the time it was loaded (see TestProcedureCatalog.reload)"""
+
+    mtime_ns: int | None  # None if the definition isn't a regular file (eg the package is installed as a zip)
+    size: int | None
+    digest: str  # sha256 of the YAML definition
+
+
+def stat_procedure_yaml(procedures_package: str, procedure_id: str) -> os.stat_result | None:
+    """Stats the YAML definition for procedure_id - returns None if it isn't a regular file (eg installed as a zip)"""
+    source = resources.files(procedures_package) / f"{procedure_id}.yaml"
+    if not isinstance(source, os.PathLike):
+        return None
+    try:
+        return os.stat(source)
+    except OSError:
+        return None
+
+
+class CatalogSnapshot[IdT: StrEnum, ProcedureT](Mapping[IdT, ProcedureT]):
+    """An immutable version of every procedure in a TestProcedureCatalog, keyed by procedure id. A snapshot is never
+    affected by subsequent reloads of the catalog (see TestProcedureCatalog.reload) - eg a session can hold the
+    snapshot it started with for its lifetime."""
+
+    def __init__(self, version: int, procedures: Mapping[IdT, ProcedureT]) -> None:
+        self.version = version
+        self._procedures = MappingProxyType(dict(procedures))
+
+    def __getitem__(self, procedure_id: IdT) -> ProcedureT:
+        return self._procedures[procedure_id]
+
+    def __iter__(self) -> Iterator[IdT]:
+        return iter(self._procedures)
+
+    def __len__(self) -> int:
+        return len(self._procedures)
+
+    def __contains__(self, procedure_id: object) -> bool:
+        return procedure_id in self._procedures
+
+    def __repr__(self) -> str:
+        return f"CatalogSnapshot(version={self.version}, procedures={len(self)})"
+
+
+@dataclass(frozen=True)
+class ReloadResult[IdT: StrEnum]:
+    """The outcome of TestProcedureCatalog.reload"""
+
+    version: int  # The version of the catalog's snapshot after the reload
+    changed: tuple[IdT, ...]  # Procedures whose (changed) definitions were swapped in
+    failed: Mapping[IdT, str]  # Procedures whose changed definitions failed to parse / validate (the previous is kept)
+
+
+class TestProcedureCatalog[IdT: StrEnum, ProcedureT]:
+    """Loads test procedure definitions from the YAML files in a procedures package, parsing each definition at most
+    once and holding the result for the lifetime of the catalog.
+
+    Lookups are thread safe - concurrent requests for the same procedure will only ever parse the YAML once.
+
+    If the procedures package ships an up to date precompiled artifact (see cactus_test_definitions.precompiled), the
+    procedures will be deserialised from that instead of parsing the YAML.
+
+    The returned procedures are SHARED between every caller of the catalog and MUST be treated as read only.
+
+    Edited YAML definitions can be picked up (without a restart) via reload - which atomically swaps in a new immutable
+    CatalogSnapshot (see snapshot). Existing snapshots are unaffected."""
+
+    __test__ = False  # Prevent pytest from picking up this class
+
+    def __init__(
+        self,
+        procedures_package: str,
+        procedure_ids: type[IdT],
+        parse: Callable[[str], ProcedureT],
+        compact: bool = False,
+        validate: Callable[[ProcedureT, IdT], object] | None = None,
+    ) -> None:
+        """procedures_package: The package containing the {procedure_id}.yaml definitions
+        procedure_ids: The enum listing every procedure that can be loaded from procedures_package
+        parse: Converts a YAML definition into the procedure model
+        compact: If True - procedures are converted to their compact (slotted, frozen) equivalents before being cached
+                 to reduce memory usage (see cactus_test_definitions.compact). Compact procedures share attribute names
+                 with the procedure model but are NOT instances of the model classes. Structurally equal nodes are
+                 shared between every procedure in the catalog (see hash_cons_info).
+        validate: Raises if a procedure is invalid - used to reject changed definitions picked up by reload"""
+        self.procedures_package = procedures_package
+        self.procedure_ids = procedure_ids
+        self.parse = parse
+        self.compact = compact
+        self.validate = validate
+        self._pool: HashConsPool | None = _new_pool() if compact else None  # Released once everything is loaded
+        self._hash_cons_info: HashConsInfo | None = None  # Final stats of a released _pool
+
+        self._cache: dict[IdT, ProcedureT] = {}
+        self._id_locks: dict[IdT, threading.Lock] = {}
+        self._lock = threading.Lock()  # Guards _id_locks, _precompiled and the hit/miss counters
+        self._precompiled: PrecompiledCatalog | None = None
+        self._precompiled_checked = False  # Set once we've attempted to load the precompiled artifact
+        self._hits = 0
+        self._misses = 0
+        self._summaries: dict[IdT, ProcedureSummary] | None = None
+        self._index: ProcedureIndex[IdT] | None = None
+
+        self._reload_lock = threading.Lock()  # Held for the duration of snapshot creation / reload
+        self._snapshot: CatalogSnapshot[IdT, ProcedureT] | None = None
+        self._version = 0
+        self._sources: dict[IdT, SourceFingerprint] = {}  # Definitions of the current snapshot (see reload)
+
+    def read_yaml(self, procedure_id: IdT) -> str:
+        """Reads the raw YAML definition for procedure_id from the procedures package"""
+        return read_procedure_yaml(self.procedures_package, procedure_id)
+
+    def read_all_yaml(self, bundled: bool = False) -> dict[IdT, str]:
+        """Reads the raw YAML definition of every procedure, keyed by procedure id.
+
+        bundled: If True - read every definition from the bundle shipped with the procedures package (see
+                 cactus_test_definitions.bundle) in a single read. Falls back to reading each definition individually
+                 if the bundle is missing/unusable or doesn't contain every procedure."""
+        if bundled:
+            from cactus_test_definitions.bundle import read_procedure_bundle
+
+            bundle = read_procedure_bundle(self.procedures_package)
+            if bundle is not None and all(procedure_id in bundle for procedure_id in self.procedure_ids):
+                return {procedure_id: bundle[procedure_id] for procedure_id in self.procedure_ids}
+
+        return {procedure_id: self.read_yaml(procedure_id) for procedure_id in self.procedure_ids}
+
+    def use_precompiled(self, precompiled: "PrecompiledCatalog | None") -> None:
+        """Overrides the precompiled artifact that will be used for loading procedures not yet in the cache. None will
+        force all subsequent loads to parse the YAML definitions"""
+        with self._lock:
+            self._precompiled = precompiled
+            self._precompiled_checked = True
+
+    def _get_precompiled(self) -> "PrecompiledCatalog | None":
+        with self._lock:
+            if not self._precompiled_checked:
+                from cactus_test_definitions.precompiled import load_precompiled_catalog
+
+                self._precompiled = load_precompiled_catalog(self.procedures_package)
+                self._precompiled_checked = True
+            return self._precompiled
+
+    def load(self, procedure_id: IdT) -> ProcedureT:
+        """Loads a new instance of the nominated procedure (bypassing the cache). Prefers the precompiled artifact,
+        falling back to parsing the YAML definition if the procedure can't be deserialised."""
+        from cactus_test_definitions.instrumentation import DESERIALISE, READ, phase, procedure_scope
+
+        with procedure_scope(procedure_id):
+            procedure = None
+            precompiled = self._get_precompiled()
+            if precompiled is not None and procedure_id in precompiled:
+                try:
+                    with phase(DESERIALISE):
+                        procedure = precompiled.load(procedure_id)
+                except Exception:
+                    # Artifact is incompatible with this environment - the YAML is the source of truth so stop using it
+                    self.use_precompiled(None)
+
+            if procedure is None:
+                with phase(READ):
+                    yaml_contents = self.read_yaml(procedure_id)
+                procedure = self.parse(yaml_contents)
+            return self._finalise(procedure)
+
+    def _finalise(self, procedure: ProcedureT) -> ProcedureT:
+        """Applies any catalog specific conversions to a newly loaded procedure"""
+        if not self.compact:
+            return procedure
+        from cactus_test_definitions.compact import compact
+
+        return compact(procedure, self._pool)  # _pool will be None if everything has already been loaded
+
+    def _release_pool_if_complete(self) -> None:
+        """The HashConsPool is only useful for loading procedures - once every procedure is cached it can be released
+        (it holds a reference to every distinct node)"""
+        with self._lock:
+            if self._pool is not None and len(self._cache) == len(self.procedure_ids):
+                self._hash_cons_info = self._pool.info()
+                self._pool = None
+
+    def hash_cons_info(self) -> "HashConsInfo | None":
+        """Reports the number of nodes that were deduplicated while loading compact procedures (None if not compact)"""
+        with self._lock:
+            if self._pool is not None:
+                return self._pool.info()
+            return self._hash_cons_info
+
+    def get(self, procedure_id: IdT) -> ProcedureT:
+        """Gets the procedure with the nominated ID, parsing its definition if this is the first request for it."""
+        procedure = self._cache.get(procedure_id, None)
+        if procedure is not None:
+            with self._lock:
+                self._hits += 1
+            return procedure
+
+        with self._lock:
+            id_lock = self._id_locks.setdefault(procedure_id, threading.Lock())
+
+        with id_lock:
+            # Another thread may have finished parsing while we were waiting for id_lock
+            procedure = self._cache.get(procedure_id, None)
+            if procedure is None:
+                loaded = self.load(procedure_id)
+                mark_cached(loaded)
+                procedure = self._cache.setdefault(procedure_id, loaded)
+                is_hit = False
+                self._release_pool_if_complete()
+            else:
+                is_hit = True
+
+        with self._lock:
+            if is_hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return procedure
+
+    def view(self, procedure_id: IdT) -> ProcedureT:
+        """Gets a copy on write view (see cactus_test_definitions.views) over the shared procedure returned by get.
+        The view can be freely modified - changes are only visible via that view (the cached procedure is unchanged)"""
+        from cactus_test_definitions.views import view
+
+        return view(self.get(procedure_id))
+
+    def load_all(
+        self, parallel: bool = False, executor: "Executor | None" = None, max_workers: int | None = None
+    ) -> None:
+        """Ensures every procedure is loaded into the cache.
+
+        parallel: If True - uncached procedures will be parsed across a new ProcessPoolExecutor (of max_workers)
+        executor: If specified - uncached procedures will be parsed via this executor (overrides parallel)
+
+        Loading will fall back to running sequentially if there is too little work to benefit from parallelism."""
+        pending_ids = [procedure_id for procedure_id in self.procedure_ids if procedure_id not in self._cache]
+
+        run_sequential = (
+            (executor is None and not parallel)
+            or len(pending_ids) < MIN_PARALLEL_LOAD_COUNT
+            or (executor is None and (max_workers or os.cpu_count() or 1) < 2)
+            or self._get_precompiled() is not None  # Deserialising will be faster than any parallel parsing
+        )
+        if run_sequential:
+            for procedure_id in pending_ids:
+                self.get(procedure_id)
+        elif executor is not None:
+            self._load_all_via_executor(pending_ids, executor)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=max_workers) as process_executor:
+                self._load_all_via_executor(pending_ids, process_executor)
+
+    def _load_all_via_executor(self, procedure_ids: list[IdT], executor: "Executor") -> None:
+        from cactus_test_definitions.interning import intern_strings
+
+        futures = [
+            (procedure_id, executor.submit(parse_procedure_yaml, self.procedures_package, procedure_id, self.parse))
+            for procedure_id in procedure_ids
+        ]
+        for procedure_id, future in futures:
+            procedure = self._finalise(intern_strings(future.result()))  # Strings were interned in another process
+            mark_cached(procedure)
+            with self._lock:
+                self._cache.setdefault(procedure_id, procedure)  # Don't replace anything concurrently loaded via get()
+                self._misses += 1
+        self._release_pool_if_complete()
+
+    def summaries(self) -> "dict[IdT, ProcedureSummary]":
+        """Gets the ProcedureSummary of every procedure (keyed by procedure id) without parsing any procedures. The
+        summaries are read from the precompiled artifact (if available) otherwise they are scanned from the YAML
+        definitions. The result is calculated once and then shared - it MUST be treated as read only."""
+        summaries = self._summaries
+        if summaries is not None:
+            return summaries
+
+        from cactus_test_definitions.summary import summarise_procedure_yaml
+
+        precompiled = self._get_precompiled()
+        summaries = {}
+        for procedure_id in self.procedure_ids:
+            summary = None if precompiled is None else precompiled.summary(procedure_id)
+            if summary is None:
+                summary = summarise_procedure_yaml(self.read_yaml(procedure_id))
+            summaries[procedure_id] = summary
+        with self._lock:
+            if self._summaries is None:
+                self._summaries = summaries
+            return self._summaries
+
+    def index(self) -> "ProcedureIndex[IdT]":
+        """Gets the inverted indexes over every procedure (see find). The index terms are read from the precompiled
+        artifact (if available) otherwise every procedure is loaded. The index is built once and then shared."""
+        from cactus_test_definitions.index import ProcedureIndex, procedure_terms
+
+        index = self._index
+        if index is not None:
+            return index
+
+        precompiled = self._get_precompiled()
+        terms_by_id = {}
+        for procedure_id in self.procedure_ids:
+            terms = None if precompiled is None else precompiled.terms(procedure_id)
+            if terms is None:
+                terms = procedure_terms(self.get(procedure_id))
+            terms_by_id[procedure_id] = terms
+
+        index = ProcedureIndex(self.procedure_ids, terms_by_id)
+        with self._lock:
+            if self._index is None:
+                self._index = index
+            return self._index
+
+    def find(
+        self,
+        target_version: str | None = None,
+        classes_any: Iterable[str] | None = None,
+        category: str | None = None,
+        uses_action: str | None = None,
+        uses_check: str | None = None,
+        uses_event: str | None = None,
+        client_type: str | None = None,
+    ) -> list[IdT]:
+        """Finds the ids of every procedure matching ALL of the specified criteria (None criteria are ignored). See
+        ProcedureIndex.find for details on each criteria.
+
+        eg: catalog.find(target_version=CSIPAusVersion.RELEASE_1_2, classes_any=["A", "DR-A"])"""
+        return self.index().find(
+            target_version=target_version,
+            classes_any=classes_any,
+            category=category,
+            uses_action=uses_action,
+            uses_check=uses_check,
+            uses_event=uses_event,
+            client_type=client_type,
+        )
+
+    def snapshot(self) -> CatalogSnapshot[IdT, ProcedureT]:
+        """Gets the current (immutable) snapshot of every procedure - loading every procedure on first use. The result
+        is unaffected by any subsequent reload."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._reload_lock:
+            return self._take_snapshot() if self._snapshot is None else self._snapshot
+
+    def _take_snapshot(self) -> CatalogSnapshot[IdT, ProcedureT]:
+        """Loads every procedure and records the source of each. Must be called with _reload_lock held"""
+        self.load_all()
+        sources = {}
+        for procedure_id in self.procedure_ids:
+            sources[procedure_id], _ = self._read_source(procedure_id, None)
+        with self._lock:
+            self._version += 1
+            self._sources = sources
+            self._snapshot = CatalogSnapshot(self._version, self._cache)
+            return self._snapshot
+
+    def _read_source(
+        self, procedure_id: IdT, previous: SourceFingerprint | None
+    ) -> tuple[SourceFingerprint, str | None]:
+        """Returns the current SourceFingerprint of procedure_id and its YAML definition - the YAML will be None if
+        the definition is unchanged since previous (only a stat is required if the mtime / size are unchanged)"""
+        stat = stat_procedure_yaml(self.procedures_package, procedure_id)
+        mtime_ns, size = (None, None) if stat is None else (stat.st_mtime_ns, stat.st_size)
+        if previous is not None and mtime_ns is not None and (mtime_ns, size) == (previous.mtime_ns, previous.size):
+            return previous, None
+
+        yaml_contents = self.read_yaml(procedure_id)
+        fingerprint = SourceFingerprint(mtime_ns, size, hashlib.sha256(yaml_contents.encode()).hexdigest())
+        if previous is not None and fingerprint.digest == previous.digest:
+            return fingerprint, None  # Touched but not modified
+        return fingerprint, yaml_contents
+
+    def reload(self) -> ReloadResult[IdT]:
+        """Re-parses (and re-validates) every YAML definition whose mtime / contents have changed since the current
+        snapshot was taken. If anything changed, a new snapshot (with a new version) is atomically swapped in - get /
+        snapshot will return the new definitions while previously returned snapshots (and procedures) are unchanged.
+
+        Changed definitions that fail to parse or validate are reported in the result (the previous definition is
+        kept). Only procedures listed in procedure_ids can be reloaded."""
+        with self._reload_lock:
+            snapshot = self._take_snapshot() if self._snapshot is None else self._snapshot
+
+            sources = dict(self._sources)
+            changed: dict[IdT, ProcedureT] = {}
+            failed: dict[IdT, str] = {}
+            for procedure_id in self.procedure_ids:
+                previous = sources.get(procedure_id, None)
+                try:
+                    source, yaml_contents = self._read_source(procedure_id, previous)
+                    if yaml_contents is not None:
+                        changed[procedure_id] = self._load_changed(procedure_id, yaml_contents)
+                except Exception as exc:
+                    failed[procedure_id] = f"{type(exc).__name__}: {exc}"
+                    continue  # Will be retried on the next reload (as the recorded source is unchanged)
+                sources[procedure_id] = source
+
+            with self._lock:
+                self._sources = sources
+                if changed:
+                    self._swap(snapshot, changed)
+                return ReloadResult(self._version, tuple(changed), MappingProxyType(failed))
+
+    def _load_changed(self, procedure_id: IdT, yaml_contents: str) -> ProcedureT:
+        from cactus_test_definitions.instrumentation import procedure_scope
+        from cactus_test_definitions.interning import intern_strings
+
+        with procedure_scope(procedure_id):
+            procedure = self.parse(yaml_contents)
+            if self.validate is not None:
+                self.validate(procedure, procedure_id)
+            procedure = self._finalise(intern_strings(procedure))
+            mark_cached(procedure)
+            return procedure
+
+    def _swap(self, snapshot: CatalogSnapshot[IdT, ProcedureT], changed: dict[IdT, ProcedureT]) -> None:
+        """Replaces the cache / current snapshot with snapshot + changed. Must be called with _lock held"""
+        cache = {**snapshot, **changed}
+        self._version += 1
+        self._cache = cache
+        self._snapshot = CatalogSnapshot(self._version, cache)
+
+        # Everything derived from the previous definitions is now stale - the precompiled artifact will be rechecked
+        # against the (changed) sources on the next load
+        self._precompiled = None
+        self._precompiled_checked = False
+        self._summaries = None
+        self._index = None
+
+    def cache_info(self) -> CatalogCacheInfo:
+        """Returns the current hit/miss counters for this catalog"""
+        with self._lock:
+            return CatalogCacheInfo(hits=self._hits, misses=self._misses, size=len(self._cache))
+
+    def clear(self) -> None:
+        """Discards every cached procedure and resets the hit/miss counters. Any precompiled artifact (including one set
+        via use_precompiled) is discarded - it will be reloaded (if current) on the next load"""
+        with self._lock:
+            self._cache.clear()
+            self._precompiled = None
+            self._precompiled_checked = False
+            if self.compact:
+                self._pool = _new_pool()
+                self._hash_cons_info = None
+            self._id_locks.clear()
+            self._summaries = None
+            self._index = None
+            self._snapshot = None
+            self._sources = {}
+            self._hits = 0
+            self._misses = 0
+
+
+class LazyProcedureMapping[IdT: StrEnum, ProcedureT](Mapping[IdT, ProcedureT]):
+    """Read only Mapping of every procedure in a TestProcedureCatalog, keyed by procedure id.
+
+    Procedures are only loaded (via the catalog) on first access - iterating keys, len() and "in" are all cheap."""
+
+    def __init__(self, catalog: TestProcedureCatalog[IdT, ProcedureT]) -> None:
+        self.catalog = catalog
+        self._procedure_ids = frozenset(catalog.procedure_ids)
+
+    def __getitem__(self, procedure_id: IdT) -> ProcedureT:
+        if procedure_id not in self._procedure_ids:
+            raise KeyError(procedure_id)
+        return self.catalog.get(procedure_id)
+
+    def __iter__(self) -> Iterator[IdT]:
+        return iter(self.catalog.procedure_ids)
+
+    def __len__(self) -> int:
+        return len(self._procedure_ids)
+
+    def __contains__(self, procedure_id: object) -> bool:
+        return procedure_id in self._procedure_ids
+
+    def materialize(self) -> dict[IdT, ProcedureT]:
+        """Loads every procedure, returning them as a regular dict"""
+        return {procedure_id: self.catalog.get(procedure_id) for procedure_id in self}
@@ -0,0 +1,279 @@
+"""The cactus-defs command line interface for listing, showing, validating, exporting, benchmarking and measuring the
+memory of the test procedures. Designed to start quickly - modules are only imported by the subcommands that need them
+and nothing is parsed unless the subcommand requires it (eg list only reads the ProcedureSummary metadata)."""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Sequence
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from cactus_test_definitions.procedure_ids import KINDS, procedure_ids, test_procedures_module
+
+if TYPE_CHECKING:
+    from cactus_test_definitions.catalog import TestProcedureCatalog
+
+
+def find_procedure(procedure_id: str, kinds: Sequence[str] = KINDS) -> tuple[str, StrEnum] | None:
+    """Finds the (kind, TestProcedureId) of procedure_id. Returns None if it isn't a known procedure"""
+    for kind in kinds:
+        ids = procedure_ids(kind)
+        if procedure_id in ids:
+            return kind, ids(procedure_id)
+    return None
+
+
+def report_unknown(procedure_id: str) -> int:
+    print(f"Unknown procedure '{procedure_id}'", file=sys.stderr)
+    return 2
+
+
+def metadata_catalog(kind: str) -> "TestProcedureCatalog":
+    """A TestProcedureCatalog for kind that will only import the procedure model if something is actually parsed"""
+    from cactus_test_definitions.catalog import TestProcedureCatalog
+
+    def parse(yaml_contents: str) -> Any:  # noqa: ANN401
+        return test_procedures_module(kind).parse_test_procedure(yaml_contents)
+
+    return TestProcedureCatalog(f"cactus_test_definitions.{kind}.procedures", procedure_ids(kind), parse)
+
+
+def to_jsonable(value: Any) -> Any:  # noqa: ANN401
+    """Converts a parsed procedure (or any part of one) into JSON compatible values"""
+    import dataclasses
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_jsonable(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, list | tuple):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    return str(value)
+
+
+def selected_kinds(args: argparse.Namespace) -> Sequence[str]:
+    return KINDS if args.kind is None else (args.kind,)
+
+
+def command_list(args: argparse.Namespace) -> int:
+    rows = []
+    for kind in selected_kinds(args):
+        for procedure_id, summary in metadata_catalog(kind).summaries().items():
+            if args.category is not None and summary.category != args.category:
+                continue
+            if args.target_version is not None and args.target_version not in summary.target_versions:
+                continue
+            if args.classes and not set(args.classes).intersection(summary.classes):
+                continue
+            rows.append({"id": str(procedure_id), "kind": kind, **to_jsonable(summary)})
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        for row in rows:
+            versions = ",".join(row["target_versions"])
+            print(f"{row['id']:<14}{row['kind']:<8}{row['category']:<32}{versions:<28}{row['description']}")
+    return 0
+
+
+def command_show(args: argparse.Namespace) -> int:
+    found = find_procedure(args.procedure_id, selected_kinds(args))
+    if found is None:
+        return report_unknown(args.procedure_id)
+
+    kind, procedure_id = found
+    if args.json:
+        procedure = test_procedures_module(kind).get_test_procedure(procedure_id)
+        print(json.dumps(to_jsonable(procedure), indent=2))
+    else:
+        print(metadata_catalog(kind).read_yaml(procedure_id), end="")  # The YAML doesn't require parsing
+    return 0
+
+
+def command_validate(args: argparse.Namespace) -> int:
+    from cactus_test_definitions.validation import validate_all
+
+    targets: dict[str, list[str]] = {kind: [] for kind in selected_kinds(args)}
+    for requested_id in args.procedure_ids:
+        found = find_procedure(requested_id, selected_kinds(args))
+        if found is None:
+            return report_unknown(requested_id)
+        targets[found[0]].append(str(found[1]))
+
+    reports = [
+        validate_all(kind, workers=args.workers, procedure_ids=ids if args.procedure_ids else None)
+        for kind, ids in targets.items()
+        if ids or not args.procedure_ids
+    ]
+
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            failed_ids = set(report.failed_procedure_ids())
+            for failure in report.failures:
+                print(f"FAIL {failure.procedure_id} [{failure.location}]: {failure.message}")
+            if args.verbose:
+                for procedure_id in report.procedure_ids:
+                    if procedure_id not in failed_ids:
+                        print(f"OK   {procedure_id}")
+        checked = sum(len(report.procedure_ids) for report in reports)
+        failed = sum(len(report.failed_procedure_ids()) for report in reports)
+        print(f"{checked - failed}/{checked} procedures valid")
+    return 0 if all(report.ok for report in reports) else 1
+
+
+def command_export(args: argparse.Namespace) -> int:
+    kinds = selected_kinds(args)
+    if args.format == "zip":
+        from cactus_test_definitions.bundle import build_procedure_bundle
+
+        yaml_contents = {str(k): v for kind in kinds for k, v in metadata_catalog(kind).read_all_yaml().items()}
+        encoded = build_procedure_bundle(yaml_contents)
+    else:
+        exported = {}
+        for kind in kinds:
+            procedures = test_procedures_module(kind).get_all_test_procedures().materialize()
+            exported[kind] = {str(procedure_id): to_jsonable(tp) for procedure_id, tp in procedures.items()}
+        encoded = json.dumps(exported, indent=2).encode()
+
+    if args.output is None:
+        sys.stdout.buffer.write(encoded)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(encoded)
+    return 0
+
+
+def time_ms(action: Callable[[], object], repeat: int) -> float:
+    """Best time (in milliseconds) of repeat runs of action"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    from cactus_test_definitions.cache import configure_parse_cache, reset_parse_cache_configuration
+
+    configure_parse_cache(None)  # Measure the actual parsing
+    try:
+        bench_kinds(selected_kinds(args), args.repeat)
+    finally:
+        reset_parse_cache_configuration()
+    return 0
+
+
+def bench_kinds(kinds: Sequence[str], repeat: int) -> None:
+    from cactus_test_definitions.precompiled import load_precompiled_catalog
+
+    print(f"{'kind':<8}{'phase':<20}{'time (ms)':>12}")
+    for kind in kinds:
+        catalog = metadata_catalog(kind)
+        ids = list(catalog.procedure_ids)
+        yaml_contents = catalog.read_all_yaml()
+        parse = test_procedures_module(kind).parse_test_procedure
+
+        def scan_summaries(catalog: "TestProcedureCatalog" = catalog) -> None:
+            catalog.use_precompiled(None)
+            catalog.clear()
+            catalog.summaries()
+
+        phases: list[tuple[str, Callable[[], object]]] = [
+            ("read yaml", catalog.read_all_yaml),
+            ("scan summaries", scan_summaries),
+            ("parse", lambda parse=parse, yaml_contents=yaml_contents: [parse(y) for y in yaml_contents.values()]),
+        ]
+        precompiled = load_precompiled_catalog(catalog.procedures_package)
+        if precompiled is not None:
+            phases.append(("load precompiled", lambda p=precompiled, ids=ids: [p.load(i) for i in ids]))
+
+        for phase, action in phases:
+            print(f"{kind:<8}{phase:<20}{time_ms(action, repeat):>12.1f}")
+
+
+def command_memory(args: argparse.Namespace) -> int:
+    from cactus_test_definitions.memory import measure_all
+
+    kinds = selected_kinds(args)
+    for requested_id in args.procedure_ids:
+        if find_procedure(requested_id, kinds) is None:
+            return report_unknown(requested_id)
+
+    report = measure_all(kinds, compact=args.compact, procedure_ids=args.procedure_ids or None)
+    if args.json:
+        print(report.to_json())
+        return 0
+
+    columns = ["Step", "Action", "Check", "Expression"]
+    print(f"{'id':<14}{'kind':<8}{'bytes':>10}{'objects':>9}" + "".join(f"{c:>12}" for c in columns) + "  largest")
+    for footprint in report.top(args.top):
+        counts = "".join(f"{footprint.object_counts[c]:>12}" for c in columns)
+        largest = ", ".join(f"{name} {size}" for name, size in footprint.top_types(3))
+        print(
+            f"{footprint.procedure_id:<14}{footprint.kind:<8}{footprint.retained_bytes:>10}"
+            f"{footprint.object_count:>9}{counts}  {largest}"
+        )
+    count = len(report.footprints)
+    print(f"{report.retained_bytes} bytes retained by {count} procedures ({report.retained_bytes // count} average)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cactus-defs", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, command: Callable[[argparse.Namespace], int], help: str) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, help=help, description=help)
+        subparser.add_argument("--kind", choices=KINDS, default=None, help="Only client or server procedures")
+        subparser.set_defaults(command=command)
+        return subparser
+
+    list_parser = add_command("list", command_list, "List procedures (without parsing them)")
+    list_parser.add_argument("--category", help="Only procedures with this category")
+    list_parser.add_argument("--target-version", help="Only procedures targeting this CSIP-Aus version (eg v1.2)")
+    list_parser.add_argument("--classes", nargs="+", help="Only procedures with at least one of these classes")
+    list_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    show_parser = add_command("show", command_show, "Show the definition of a procedure")
+    show_parser.add_argument("procedure_id", help="eg ALL-01 or S-ALL-01")
+    show_parser.add_argument("--json", action="store_true", help="Output the parsed procedure as JSON (vs YAML)")
+
+    validate_parser = add_command("validate", command_validate, "Parse and validate procedures")
+    validate_parser.add_argument("procedure_ids", nargs="*", help="Procedures to validate (default: all)")
+    validate_parser.add_argument("-v", "--verbose", action="store_true", help="Also report valid procedures")
+    validate_parser.add_argument("--workers", type=int, default=1, help="Number of processes to validate across")
+    validate_parser.add_argument("--json", action="store_true", help="Output the validation reports as JSON")
+
+    export_parser = add_command("export", command_export, "Export every procedure")
+    export_parser.add_argument("--format", choices=["json", "zip"], default="json", help="Parsed JSON / YAML zip")
+    export_parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+
+    bench_parser = add_command("bench", command_bench, "Time reading / scanning / parsing every procedure")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per phase (best reported)")
+
+    memory_parser = add_command("memory", command_memory, "Report the memory retained by each loaded procedure")
+    memory_parser.add_argument("procedure_ids", nargs="*", help="Procedures to measure (default: all)")
+    memory_parser.add_argument("--compact", action="store_true", help="Measure the compact equivalent of procedures")
+    memory_parser.add_argument("--top", type=int, default=20, help="Number of (largest) procedures to list")
+    memory_parser.add_argument("--json", action="store_true", help="Output every procedure's footprint as JSON")
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.command(args)
+    except BrokenPipeError:
+        return 0  # eg piped into head
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,6 @@
-from cactus_test_definitions.client.actions import ACTION_PARAMETER_SCHEMA, Action
-from cactus_test_definitions.client.checks import CHECK_PARAMETER_SCHEMA, Check
-from cactus_test_definitions.client.events import EVENT_PARAMETER_SCHEMA, Event
-from cactus_test_definitions.client.test_procedures import (
-    Preconditions,
-    Step,
-    TestProcedure,
-    TestProcedureId,
-    get_all_test_procedures,
-    get_test_procedure,
-    get_yaml_contents,
-    parse_test_procedure,
-)
+from typing import TYPE_CHECKING
+
+from cactus_test_definitions.lazy import lazy_attributes
 
 __all__ = [
     "TestProcedureId",
@@ -23,8 +13,53 @@ __all__ = [
     "Step",
     "Preconditions",
     "TestProcedure",
+    "TEST_PROCEDURE_CATALOG",
     "get_all_test_procedures",
+    "get_all_yaml_contents",
+    "get_procedure_summaries",
     "get_test_procedure",
     "get_yaml_contents",
     "parse_test_procedure",
 ]
+
+if TYPE_CHECKING:
+    from cactus_test_definitions.client.actions import ACTION_PARAMETER_SCHEMA, Action
+    from cactus_test_definitions.client.checks import CHECK_PARAMETER_SCHEMA, Check
+    from cactus_test_definitions.client.events import EVENT_PARAMETER_SCHEMA, Event
+    from cactus_test_definitions.client.procedure_ids import TestProcedureId
+    from cactus_test_definitions.client.test_procedures import (
+        TEST_PROCEDURE_CATALOG,
+        Preconditions,
+        Step,
+        TestProcedure,
+        get_all_test_procedures,
+        get_all_yaml_contents,
+        get_procedure_summaries,
+        get_test_procedure,
+        get_yaml_contents,
+        parse_test_procedure,
+    )
+
+# Imported on first access (PEP 562) - TestProcedureId is available without importing any of the YAML parsing machinery
+__getattr__, __dir__ = lazy_attributes(
+    globals(),
+    {
+        "ACTION_PARAMETER_SCHEMA": "cactus_test_definitions.client.actions",
+        "Action": "cactus_test_definitions.client.actions",
+        "CHECK_PARAMETER_SCHEMA": "cactus_test_definitions.client.checks",
+        "Check": "cactus_test_definitions.client.checks",
+        "EVENT_PARAMETER_SCHEMA": "cactus_test_definitions.client.events",
+        "Event": "cactus_test_definitions.client.events",
+        "TEST_PROCEDURE_CATALOG": "cactus_test_definitions.client.test_procedures",
+        "Preconditions": "cactus_test_definitions.client.test_procedures",
+        "Step": "cactus_test_definitions.client.test_procedures",
+        "TestProcedure": "cactus_test_definitions.client.test_procedures",
+        "TestProcedureId": "cactus_test_definitions.client.procedure_ids",
+        "get_all_test_procedures": "cactus_test_definitions.client.test_procedures",
+        "get_all_yaml_contents": "cactus_test_definitions.client.test_procedures",
+        "get_procedure_summaries": "cactus_test_definitions.client.test_procedures",
+        "get_test_procedure": "cactus_test_definitions.client.test_procedures",
+        "get_yaml_contents": "cactus_test_definitions.client.test_procedures",
+        "parse_test_procedure": "cactus_test_definitions.client.test_procedures",
+    },
+)
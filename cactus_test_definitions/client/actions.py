@@ -5,6 +5,7 @@ from cactus_test_definitions.errors import TestProcedureDefinitionError
 from cactus_test_definitions.parameters import (
     ParameterSchema,
     ParameterType,
+    SchemaTable,
     validate_parameters,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -28,109 +29,111 @@ class Action:
 
 
 # The parameter schema for each action, keyed by the action name
-ACTION_PARAMETER_SCHEMA: dict[str, dict[str, ParameterSchema]] = {
-    "enable-steps": {"steps": ParameterSchema(True, ParameterType.ListString)},
-    "remove-steps": {"steps": ParameterSchema(True, ParameterType.ListString)},
-    "finish-test": {
-        "fail_message": ParameterSchema(False, ParameterType.String),  # If set - this test is a failed finish
-    },
-    "set-default-der-control": {
-        "derp_id": ParameterSchema(False, ParameterType.Integer),
-        "opModImpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModExpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModGenLimW": ParameterSchema(False, ParameterType.Float),
-        "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
-        "opModStorageTargetW": ParameterSchema(False, ParameterType.Float),
-        "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
-        "cancelled": ParameterSchema(False, ParameterType.Boolean),
-    },
-    "create-der-control": {
-        "start": ParameterSchema(True, ParameterType.DateTime),
-        "duration_seconds": ParameterSchema(True, ParameterType.Integer),
-        "pow_10_multipliers": ParameterSchema(False, ParameterType.Integer),
-        "der_program_tag": ParameterSchema(False, ParameterType.String),  # Parent DERProgram to nest under
-        "primacy": ParameterSchema(False, ParameterType.Integer),
-        "fsa_id": ParameterSchema(False, ParameterType.Integer),
-        "randomizeStart_seconds": ParameterSchema(False, ParameterType.Integer),
-        "ramp_time_seconds": ParameterSchema(False, ParameterType.Float),
-        "opModEnergize": ParameterSchema(False, ParameterType.Boolean),
-        "opModConnect": ParameterSchema(False, ParameterType.Boolean),
-        "opModImpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModExpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModGenLimW": ParameterSchema(False, ParameterType.Float),
-        "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
-        "opModFixedW": ParameterSchema(False, ParameterType.Float),
-        "opModStorageTargetW": ParameterSchema(False, ParameterType.Float),
-        "tag": ParameterSchema(False, ParameterType.String),
-        "end_device_indexes": ParameterSchema(
-            False, ParameterType.ListInteger
-        ),  # If set - have this control be "shared" across these specified EndDevice's
-    },
-    "create-der-program": {
-        "primacy": ParameterSchema(True, ParameterType.Integer),
-        "fsa_id": ParameterSchema(False, ParameterType.Integer),
-        "end_device_indexes": ParameterSchema(
-            False, ParameterType.ListInteger
-        ),  # If set - have this DERProgram be "shared" across these specified EndDevice's
-        "tag": ParameterSchema(False, ParameterType.String),
-    },
-    "cancel-active-der-controls": {},
-    "set-comms-rate": {
-        "dcap_poll_seconds": ParameterSchema(False, ParameterType.Integer),
-        "edev_post_seconds": ParameterSchema(False, ParameterType.Integer),
-        "edev_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
-        "fsa_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
-        "derp_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
-        "der_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
-        "mup_post_seconds": ParameterSchema(False, ParameterType.Integer),
-        "tp_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),  # TariffProfileList poll rate
-        "tti_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),  # TimeTariffIntervalList poll rate
-    },
-    "communications-status": {"enabled": ParameterSchema(True, ParameterType.Boolean)},
-    "edev-registration-links": {"enabled": ParameterSchema(True, ParameterType.Boolean)},
-    "register-end-device": {
-        "nmi": ParameterSchema(False, ParameterType.String),
-        "registration_pin": ParameterSchema(False, ParameterType.Integer),
-        "aggregator_lfdi": ParameterSchema(False, ParameterType.HexBinary),
-        "aggregator_sfdi": ParameterSchema(False, ParameterType.Integer),
-    },
-    "create-tariff-profile": {
-        "primacy": ParameterSchema(True, ParameterType.Integer),
-        "fsa_id": ParameterSchema(False, ParameterType.Integer),
-        "price_pow_10_multiplier": ParameterSchema(False, ParameterType.Integer),
-        "tag": ParameterSchema(False, ParameterType.String),
-    },
-    "create-rate-component": {
-        "tariff_profile_tag": ParameterSchema(False, ParameterType.String),  # Parent TariffProfile to nest under
-        "role_flags": ParameterSchema(False, ParameterType.Integer),
-        "commodity": ParameterSchema(False, ParameterType.Integer),
-        "data_qualifier": ParameterSchema(False, ParameterType.Integer),
-        "flow_direction": ParameterSchema(False, ParameterType.Integer),
-        "kind": ParameterSchema(False, ParameterType.Integer),
-        "phase": ParameterSchema(False, ParameterType.Integer),
-        "power_of_ten_multiplier": ParameterSchema(False, ParameterType.Integer),
-        "uom": ParameterSchema(False, ParameterType.Integer),
-        "tag": ParameterSchema(False, ParameterType.String),
-    },
-    "create-time-tariff-interval": {
-        "start": ParameterSchema(True, ParameterType.DateTime),
-        "duration_seconds": ParameterSchema(True, ParameterType.Integer),
-        "rate_component_tag": ParameterSchema(False, ParameterType.String),  # Parent RateComponent to nest under
-        "price_pow10_encoded_block0": ParameterSchema(True, ParameterType.Integer),  # pow10 encoded price
-        "price_pow10_encoded_block1": ParameterSchema(False, ParameterType.Integer),  # pow10 encoded price
-        "price_start_pow10_block1": ParameterSchema(False, ParameterType.Integer),  # startValue for block1
-        "tag": ParameterSchema(False, ParameterType.String),
-    },
-    "cancel-time-tariff-intervals": {
-        "tag": ParameterSchema(False, ParameterType.String),  # If set - ONLY cancel the TTI with the specified tag
-    },
-    "delete-rate-component": {
-        "tag": ParameterSchema(True, ParameterType.String),
-    },
-    "remove-function-set-assignment": {
-        "fsa_id": ParameterSchema(True, ParameterType.Integer),
-    },  # Removes / Hides a FunctionSetAssignment
-}
+ACTION_PARAMETER_SCHEMA: SchemaTable[str, dict[str, ParameterSchema]] = SchemaTable(
+    {
+        "enable-steps": {"steps": ParameterSchema(True, ParameterType.ListString)},
+        "remove-steps": {"steps": ParameterSchema(True, ParameterType.ListString)},
+        "finish-test": {
+            "fail_message": ParameterSchema(False, ParameterType.String),  # If set - this test is a failed finish
+        },
+        "set-default-der-control": {
+            "derp_id": ParameterSchema(False, ParameterType.Integer),
+            "opModImpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModExpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModGenLimW": ParameterSchema(False, ParameterType.Float),
+            "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
+            "opModStorageTargetW": ParameterSchema(False, ParameterType.Float),
+            "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
+            "cancelled": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "create-der-control": {
+            "start": ParameterSchema(True, ParameterType.DateTime),
+            "duration_seconds": ParameterSchema(True, ParameterType.Integer),
+            "pow_10_multipliers": ParameterSchema(False, ParameterType.Integer),
+            "der_program_tag": ParameterSchema(False, ParameterType.String),  # Parent DERProgram to nest under
+            "primacy": ParameterSchema(False, ParameterType.Integer),
+            "fsa_id": ParameterSchema(False, ParameterType.Integer),
+            "randomizeStart_seconds": ParameterSchema(False, ParameterType.Integer),
+            "ramp_time_seconds": ParameterSchema(False, ParameterType.Float),
+            "opModEnergize": ParameterSchema(False, ParameterType.Boolean),
+            "opModConnect": ParameterSchema(False, ParameterType.Boolean),
+            "opModImpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModExpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModGenLimW": ParameterSchema(False, ParameterType.Float),
+            "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
+            "opModFixedW": ParameterSchema(False, ParameterType.Float),
+            "opModStorageTargetW": ParameterSchema(False, ParameterType.Float),
+            "tag": ParameterSchema(False, ParameterType.String),
+            "end_device_indexes": ParameterSchema(
+                False, ParameterType.ListInteger
+            ),  # If set - have this control be "shared" across these specified EndDevice's
+        },
+        "create-der-program": {
+            "primacy": ParameterSchema(True, ParameterType.Integer),
+            "fsa_id": ParameterSchema(False, ParameterType.Integer),
+            "end_device_indexes": ParameterSchema(
+                False, ParameterType.ListInteger
+            ),  # If set - have this DERProgram be "shared" across these specified EndDevice's
+            "tag": ParameterSchema(False, ParameterType.String),
+        },
+        "cancel-active-der-controls": {},
+        "set-comms-rate": {
+            "dcap_poll_seconds": ParameterSchema(False, ParameterType.Integer),
+            "edev_post_seconds": ParameterSchema(False, ParameterType.Integer),
+            "edev_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
+            "fsa_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
+            "derp_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
+            "der_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),
+            "mup_post_seconds": ParameterSchema(False, ParameterType.Integer),
+            "tp_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),  # TariffProfileList poll rate
+            "tti_list_poll_seconds": ParameterSchema(False, ParameterType.Integer),  # TimeTariffIntervalList poll rate
+        },
+        "communications-status": {"enabled": ParameterSchema(True, ParameterType.Boolean)},
+        "edev-registration-links": {"enabled": ParameterSchema(True, ParameterType.Boolean)},
+        "register-end-device": {
+            "nmi": ParameterSchema(False, ParameterType.String),
+            "registration_pin": ParameterSchema(False, ParameterType.Integer),
+            "aggregator_lfdi": ParameterSchema(False, ParameterType.HexBinary),
+            "aggregator_sfdi": ParameterSchema(False, ParameterType.Integer),
+        },
+        "create-tariff-profile": {
+            "primacy": ParameterSchema(True, ParameterType.Integer),
+            "fsa_id": ParameterSchema(False, ParameterType.Integer),
+            "price_pow_10_multiplier": ParameterSchema(False, ParameterType.Integer),
+            "tag": ParameterSchema(False, ParameterType.String),
+        },
+        "create-rate-component": {
+            "tariff_profile_tag": ParameterSchema(False, ParameterType.String),  # Parent TariffProfile to nest under
+            "role_flags": ParameterSchema(False, ParameterType.Integer),
+            "commodity": ParameterSchema(False, ParameterType.Integer),
+            "data_qualifier": ParameterSchema(False, ParameterType.Integer),
+            "flow_direction": ParameterSchema(False, ParameterType.Integer),
+            "kind": ParameterSchema(False, ParameterType.Integer),
+            "phase": ParameterSchema(False, ParameterType.Integer),
+            "power_of_ten_multiplier": ParameterSchema(False, ParameterType.Integer),
+            "uom": ParameterSchema(False, ParameterType.Integer),
+            "tag": ParameterSchema(False, ParameterType.String),
+        },
+        "create-time-tariff-interval": {
+            "start": ParameterSchema(True, ParameterType.DateTime),
+            "duration_seconds": ParameterSchema(True, ParameterType.Integer),
+            "rate_component_tag": ParameterSchema(False, ParameterType.String),  # Parent RateComponent to nest under
+            "price_pow10_encoded_block0": ParameterSchema(True, ParameterType.Integer),  # pow10 encoded price
+            "price_pow10_encoded_block1": ParameterSchema(False, ParameterType.Integer),  # pow10 encoded price
+            "price_start_pow10_block1": ParameterSchema(False, ParameterType.Integer),  # startValue for block1
+            "tag": ParameterSchema(False, ParameterType.String),
+        },
+        "cancel-time-tariff-intervals": {
+            "tag": ParameterSchema(False, ParameterType.String),  # If set - ONLY cancel the TTI with the specified tag
+        },
+        "delete-rate-component": {
+            "tag": ParameterSchema(True, ParameterType.String),
+        },
+        "remove-function-set-assignment": {
+            "fsa_id": ParameterSchema(True, ParameterType.Integer),
+        },  # Removes / Hides a FunctionSetAssignment
+    }
+)
 VALID_ACTION_NAMES: set[str] = set(ACTION_PARAMETER_SCHEMA.keys())
 
 
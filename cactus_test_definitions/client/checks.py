@@ -5,6 +5,7 @@ from cactus_test_definitions.errors import TestProcedureDefinitionError
 from cactus_test_definitions.parameters import (
     ParameterSchema,
     ParameterType,
+    SchemaTable,
     validate_parameters,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -44,102 +45,104 @@ def factory_readings_schema() -> dict[str, Any]:
 
 
 # The parameter schema for each action, keyed by the action name
-CHECK_PARAMETER_SCHEMA: dict[str, dict[str, ParameterSchema]] = {
-    "all-steps-complete": {"ignored_steps": ParameterSchema(False, ParameterType.ListString)},
-    "all-notifications-transmitted": {},
-    "end-device-contents": {
-        "has_connection_point_id": ParameterSchema(False, ParameterType.Boolean),
-        "deviceCategory_anyset": ParameterSchema(False, ParameterType.HexBinary),  # Any of these bits set to 1
-        "check_lfdi": ParameterSchema(False, ParameterType.Boolean),  # Should LFDI be validated in detail
-    },
-    "end-device-count": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),
-    },
-    "der-settings-contents": {
-        "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
-        "doeModesEnabled": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "doeModesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "doeModesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "modesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "modesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "vppModesEnabled": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "vppModesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "vppModesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "setMaxVA": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxVar": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxVarNeg": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxChargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxDischargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMaxWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMinWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMinPFOverExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "setMinPFUnderExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-    },
-    "der-capability-contents": {
-        "doeModesSupported": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "doeModesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "doeModesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "modesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "modesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "vppModesSupported": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "vppModesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
-        "vppModesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
-        "rtgMaxVA": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxVar": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxVarNeg": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxChargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxDischargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMaxWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMinPFOverExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-        "rtgMinPFUnderExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
-    },
-    "der-status-contents": {
-        "genConnectStatus": ParameterSchema(False, ParameterType.Integer),
-        "genConnectStatus_bit0": ParameterSchema(False, ParameterType.Boolean),
-        "genConnectStatus_bit1": ParameterSchema(False, ParameterType.Boolean),
-        "genConnectStatus_bit2": ParameterSchema(False, ParameterType.Boolean),
-        "operationalModeStatus": ParameterSchema(False, ParameterType.Integer),
-        "alarmStatus": ParameterSchema(False, ParameterType.Integer),
-    },
-    "readings-voltage": factory_readings_schema(),
-    "readings-site-active-power": factory_readings_schema(),
-    "readings-site-reactive-power": factory_readings_schema(),
-    "readings-der-active-power": factory_readings_schema(),
-    "readings-der-reactive-power": factory_readings_schema(),
-    "readings-der-stored-energy": factory_readings_schema(),
-    "subscription-contents": {"subscribed_resource": ParameterSchema(True, ParameterType.String)},
-    "response-contents": {
-        "latest": ParameterSchema(False, ParameterType.Boolean),
-        "status": ParameterSchema(False, ParameterType.Integer),
-        "all": ParameterSchema(False, ParameterType.Boolean),
-        "subject_tag": ParameterSchema(False, ParameterType.String),
-        "exists": ParameterSchema(
-            False, ParameterType.Boolean
-        ),  # Default is True - If True, assert the response exists. Otherwise assert it does NOT exist
-    },
-    "all-polls-at-correct-time": {
-        "endpoint": ParameterSchema(True, ParameterType.String),  # e.g. /dcap
-        "poll_interval_seconds": ParameterSchema(True, ParameterType.Integer),
-        "request_type_str": ParameterSchema(True, ParameterType.String),  # e.g. GET, POST
-    },
-    "resource-requests": {
-        "resources": ParameterSchema(True, ParameterType.ListCSIPAusResource),  # What resource(s) to count
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Has at least this many requests
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Has at most this many requests
-    },
-    "price-response-contents": {
-        "latest": ParameterSchema(False, ParameterType.Boolean),
-        "status": ParameterSchema(False, ParameterType.Integer),
-        "all": ParameterSchema(False, ParameterType.Boolean),
-        "subject_tag": ParameterSchema(False, ParameterType.String),
-        "exists": ParameterSchema(
-            False, ParameterType.Boolean
-        ),  # Default is True - If True, assert the response exists. Otherwise assert it does NOT exist
-    },
-}
+CHECK_PARAMETER_SCHEMA: SchemaTable[str, dict[str, ParameterSchema]] = SchemaTable(
+    {
+        "all-steps-complete": {"ignored_steps": ParameterSchema(False, ParameterType.ListString)},
+        "all-notifications-transmitted": {},
+        "end-device-contents": {
+            "has_connection_point_id": ParameterSchema(False, ParameterType.Boolean),
+            "deviceCategory_anyset": ParameterSchema(False, ParameterType.HexBinary),  # Any of these bits set to 1
+            "check_lfdi": ParameterSchema(False, ParameterType.Boolean),  # Should LFDI be validated in detail
+        },
+        "end-device-count": {
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),
+        },
+        "der-settings-contents": {
+            "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
+            "doeModesEnabled": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "doeModesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "doeModesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "modesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "modesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "vppModesEnabled": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "vppModesEnabled_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "vppModesEnabled_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "setMaxVA": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxVar": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxVarNeg": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxChargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxDischargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMaxWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMinWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMinPFOverExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "setMinPFUnderExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+        },
+        "der-capability-contents": {
+            "doeModesSupported": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "doeModesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "doeModesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "modesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "modesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "vppModesSupported": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "vppModesSupported_set": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to one
+            "vppModesSupported_unset": ParameterSchema(False, ParameterType.HexBinary),  # Minimum bits set to zero
+            "rtgMaxVA": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxVar": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxVarNeg": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxChargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxDischargeRateW": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMaxWh": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMinPFOverExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+            "rtgMinPFUnderExcited": ParameterSchema(False, ParameterType.Boolean),  # Is ANY value set?
+        },
+        "der-status-contents": {
+            "genConnectStatus": ParameterSchema(False, ParameterType.Integer),
+            "genConnectStatus_bit0": ParameterSchema(False, ParameterType.Boolean),
+            "genConnectStatus_bit1": ParameterSchema(False, ParameterType.Boolean),
+            "genConnectStatus_bit2": ParameterSchema(False, ParameterType.Boolean),
+            "operationalModeStatus": ParameterSchema(False, ParameterType.Integer),
+            "alarmStatus": ParameterSchema(False, ParameterType.Integer),
+        },
+        "readings-voltage": factory_readings_schema(),
+        "readings-site-active-power": factory_readings_schema(),
+        "readings-site-reactive-power": factory_readings_schema(),
+        "readings-der-active-power": factory_readings_schema(),
+        "readings-der-reactive-power": factory_readings_schema(),
+        "readings-der-stored-energy": factory_readings_schema(),
+        "subscription-contents": {"subscribed_resource": ParameterSchema(True, ParameterType.String)},
+        "response-contents": {
+            "latest": ParameterSchema(False, ParameterType.Boolean),
+            "status": ParameterSchema(False, ParameterType.Integer),
+            "all": ParameterSchema(False, ParameterType.Boolean),
+            "subject_tag": ParameterSchema(False, ParameterType.String),
+            "exists": ParameterSchema(
+                False, ParameterType.Boolean
+            ),  # Default is True - If True, assert the response exists. Otherwise assert it does NOT exist
+        },
+        "all-polls-at-correct-time": {
+            "endpoint": ParameterSchema(True, ParameterType.String),  # e.g. /dcap
+            "poll_interval_seconds": ParameterSchema(True, ParameterType.Integer),
+            "request_type_str": ParameterSchema(True, ParameterType.String),  # e.g. GET, POST
+        },
+        "resource-requests": {
+            "resources": ParameterSchema(True, ParameterType.ListCSIPAusResource),  # What resource(s) to count
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Has at least this many requests
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Has at most this many requests
+        },
+        "price-response-contents": {
+            "latest": ParameterSchema(False, ParameterType.Boolean),
+            "status": ParameterSchema(False, ParameterType.Integer),
+            "all": ParameterSchema(False, ParameterType.Boolean),
+            "subject_tag": ParameterSchema(False, ParameterType.String),
+            "exists": ParameterSchema(
+                False, ParameterType.Boolean
+            ),  # Default is True - If True, assert the response exists. Otherwise assert it does NOT exist
+        },
+    }
+)
 VALID_CHECK_NAMES: set[str] = set(CHECK_PARAMETER_SCHEMA.keys())
 
 
@@ -6,6 +6,7 @@ from cactus_test_definitions.errors import TestProcedureDefinitionError
 from cactus_test_definitions.parameters import (
     ParameterSchema,
     ParameterType,
+    SchemaTable,
     validate_parameters,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -36,26 +37,28 @@ class Event:
 
 
 # The parameter schema for each event, keyed by the event name
-EVENT_PARAMETER_SCHEMA: dict[str, dict[str, ParameterSchema]] = {
-    "GET-request-received": {
-        "endpoint": ParameterSchema(True, ParameterType.String),
-        "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
-    },
-    "POST-request-received": {
-        "endpoint": ParameterSchema(True, ParameterType.String),
-        "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
-    },
-    "PUT-request-received": {
-        "endpoint": ParameterSchema(True, ParameterType.String),
-        "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
-    },
-    "DELETE-request-received": {
-        "endpoint": ParameterSchema(True, ParameterType.String),
-        "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
-    },
-    "wait": {"duration_seconds": ParameterSchema(True, ParameterType.Integer)},
-    "proceed": {"timeout_seconds": ParameterSchema(False, ParameterType.Integer)},
-}
+EVENT_PARAMETER_SCHEMA: SchemaTable[str, dict[str, ParameterSchema]] = SchemaTable(
+    {
+        "GET-request-received": {
+            "endpoint": ParameterSchema(True, ParameterType.String),
+            "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "POST-request-received": {
+            "endpoint": ParameterSchema(True, ParameterType.String),
+            "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "PUT-request-received": {
+            "endpoint": ParameterSchema(True, ParameterType.String),
+            "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "DELETE-request-received": {
+            "endpoint": ParameterSchema(True, ParameterType.String),
+            "serve_request_first": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "wait": {"duration_seconds": ParameterSchema(True, ParameterType.Integer)},
+        "proceed": {"timeout_seconds": ParameterSchema(False, ParameterType.Integer)},
+    }
+)
 VALID_EVENT_NAMES: set[str] = set(EVENT_PARAMETER_SCHEMA.keys())
 
 
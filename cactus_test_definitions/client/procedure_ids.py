@@ -0,0 +1,98 @@
+from enum import StrEnum
+
+
+class TestProcedureId(StrEnum):
+    """The set of all available test ID's
+
+    This should be kept in sync with the current set of client test procedures loaded from the procedures directory"""
+
+    __test__ = False  # Prevent pytest from picking up this class
+    ALL_01 = "ALL-01"
+    ALL_02 = "ALL-02"
+    ALL_03 = "ALL-03"
+    ALL_03_REJ = "ALL-03-REJ"
+    ALL_04 = "ALL-04"
+    ALL_05 = "ALL-05"
+    ALL_06 = "ALL-06"
+    ALL_07 = "ALL-07"
+    ALL_08 = "ALL-08"
+    ALL_09 = "ALL-09"
+    ALL_10 = "ALL-10"
+    ALL_11 = "ALL-11"
+    ALL_12 = "ALL-12"
+    ALL_13 = "ALL-13"
+    ALL_14 = "ALL-14"
+    ALL_15 = "ALL-15"
+    ALL_16 = "ALL-16"
+    ALL_17 = "ALL-17"
+    ALL_18 = "ALL-18"
+    ALL_19 = "ALL-19"
+    ALL_20 = "ALL-20"
+    ALL_21 = "ALL-21"
+    ALL_22 = "ALL-22"
+    ALL_23 = "ALL-23"
+    ALL_24 = "ALL-24"
+    ALL_25 = "ALL-25"
+    ALL_25_EXT = "ALL-25-EXT"
+    ALL_26 = "ALL-26"
+    ALL_27 = "ALL-27"
+    ALL_28 = "ALL-28"
+    ALL_29 = "ALL-29"
+    ALL_30 = "ALL-30"
+    DRA_01 = "DRA-01"
+    DRA_02 = "DRA-02"
+    DRD_01 = "DRD-01"
+    DRL_01 = "DRL-01"
+    DRG_01 = "DRG-01"
+    GEN_01 = "GEN-01"
+    GEN_02 = "GEN-02"
+    GEN_03 = "GEN-03"
+    GEN_04 = "GEN-04"
+    GEN_05 = "GEN-05"
+    GEN_06 = "GEN-06"
+    GEN_07 = "GEN-07"
+    GEN_08 = "GEN-08"
+    GEN_09 = "GEN-09"
+    GEN_10 = "GEN-10"
+    GEN_11 = "GEN-11"
+    GEN_12 = "GEN-12"
+    GEN_13 = "GEN-13"
+    LOA_01 = "LOA-01"
+    LOA_02 = "LOA-02"
+    LOA_03 = "LOA-03"
+    LOA_04 = "LOA-04"
+    LOA_05 = "LOA-05"
+    LOA_06 = "LOA-06"
+    LOA_07 = "LOA-07"
+    LOA_08 = "LOA-08"
+    LOA_09 = "LOA-09"
+    LOA_10 = "LOA-10"
+    LOA_11 = "LOA-11"
+    LOA_12 = "LOA-12"
+    LOA_13 = "LOA-13"
+    MUL_01 = "MUL-01"
+    MUL_02 = "MUL-02"
+    MUL_03 = "MUL-03"
+
+    # Provisional tests
+    P_01 = "P-01"
+    P_02 = "P-02"
+
+    # Alternate tests
+    ALT_ALL_29 = "ALT-ALL-29"
+    ALT_LOA_13 = "ALT-LOA-13"
+
+    # Storage extension
+    STO_01 = "STO-01"
+    STO_02 = "STO-02"
+    STO_03 = "STO-03"
+    STO_04 = "STO-04"
+    STO_05 = "STO-05"
+    STO_06 = "STO-06"
+
+    # Pricing extension
+    PRC_01 = "PRC-01"
+    PRC_02 = "PRC-02"
+    PRC_03 = "PRC-03"
+    PRC_04 = "PRC-04"
+    PRC_05 = "PRC-05"
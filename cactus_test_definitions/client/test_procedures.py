@@ -1,112 +1,24 @@
 from dataclasses import dataclass
-from enum import StrEnum
-from importlib import resources
+from typing import TYPE_CHECKING
 
 import yaml
 from dataclass_wizard import LoadMeta, YAMLWizard
 
+from cactus_test_definitions.cache import cached_parse
+from cactus_test_definitions.catalog import LazyProcedureMapping, TestProcedureCatalog
 from cactus_test_definitions.client.actions import Action
 from cactus_test_definitions.client.checks import Check
 from cactus_test_definitions.client.events import Event
+from cactus_test_definitions.client.procedure_ids import TestProcedureId
 from cactus_test_definitions.csipaus import CSIPAusVersion
-from cactus_test_definitions.schema import UniqueKeyLoader
+from cactus_test_definitions.decoders import build_decoder
+from cactus_test_definitions.instrumentation import DECODE, SCAN, phase
+from cactus_test_definitions.schema import FastUniqueKeyLoader
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-class TestProcedureId(StrEnum):
-    """The set of all available test ID's
-
-    This should be kept in sync with the current set of client test procedures loaded from the procedures directory"""
-
-    __test__ = False  # Prevent pytest from picking up this class
-    ALL_01 = "ALL-01"
-    ALL_02 = "ALL-02"
-    ALL_03 = "ALL-03"
-    ALL_03_REJ = "ALL-03-REJ"
-    ALL_04 = "ALL-04"
-    ALL_05 = "ALL-05"
-    ALL_06 = "ALL-06"
-    ALL_07 = "ALL-07"
-    ALL_08 = "ALL-08"
-    ALL_09 = "ALL-09"
-    ALL_10 = "ALL-10"
-    ALL_11 = "ALL-11"
-    ALL_12 = "ALL-12"
-    ALL_13 = "ALL-13"
-    ALL_14 = "ALL-14"
-    ALL_15 = "ALL-15"
-    ALL_16 = "ALL-16"
-    ALL_17 = "ALL-17"
-    ALL_18 = "ALL-18"
-    ALL_19 = "ALL-19"
-    ALL_20 = "ALL-20"
-    ALL_21 = "ALL-21"
-    ALL_22 = "ALL-22"
-    ALL_23 = "ALL-23"
-    ALL_24 = "ALL-24"
-    ALL_25 = "ALL-25"
-    ALL_25_EXT = "ALL-25-EXT"
-    ALL_26 = "ALL-26"
-    ALL_27 = "ALL-27"
-    ALL_28 = "ALL-28"
-    ALL_29 = "ALL-29"
-    ALL_30 = "ALL-30"
-    DRA_01 = "DRA-01"
-    DRA_02 = "DRA-02"
-    DRD_01 = "DRD-01"
-    DRL_01 = "DRL-01"
-    DRG_01 = "DRG-01"
-    GEN_01 = "GEN-01"
-    GEN_02 = "GEN-02"
-    GEN_03 = "GEN-03"
-    GEN_04 = "GEN-04"
-    GEN_05 = "GEN-05"
-    GEN_06 = "GEN-06"
-    GEN_07 = "GEN-07"
-    GEN_08 = "GEN-08"
-    GEN_09 = "GEN-09"
-    GEN_10 = "GEN-10"
-    GEN_11 = "GEN-11"
-    GEN_12 = "GEN-12"
-    GEN_13 = "GEN-13"
-    LOA_01 = "LOA-01"
-    LOA_02 = "LOA-02"
-    LOA_03 = "LOA-03"
-    LOA_04 = "LOA-04"
-    LOA_05 = "LOA-05"
-    LOA_06 = "LOA-06"
-    LOA_07 = "LOA-07"
-    LOA_08 = "LOA-08"
-    LOA_09 = "LOA-09"
-    LOA_10 = "LOA-10"
-    LOA_11 = "LOA-11"
-    LOA_12 = "LOA-12"
-    LOA_13 = "LOA-13"
-    MUL_01 = "MUL-01"
-    MUL_02 = "MUL-02"
-    MUL_03 = "MUL-03"
-
-    # Provisional tests
-    P_01 = "P-01"
-    P_02 = "P-02"
-
-    # Alternate tests
-    ALT_ALL_29 = "ALT-ALL-29"
-    ALT_LOA_13 = "ALT-LOA-13"
-
-    # Storage extension
-    STO_01 = "STO-01"
-    STO_02 = "STO-02"
-    STO_03 = "STO-03"
-    STO_04 = "STO-04"
-    STO_05 = "STO-05"
-    STO_06 = "STO-06"
-
-    # Pricing extension
-    PRC_01 = "PRC-01"
-    PRC_02 = "PRC-02"
-    PRC_03 = "PRC-03"
-    PRC_04 = "PRC-04"
-    PRC_05 = "PRC-05"
+    from cactus_test_definitions.summary import ProcedureSummary  # Only needed for get_procedure_summaries
 
 
 @dataclass
@@ -171,38 +83,86 @@ class TestProcedure(YAMLWizard):
 
 LoadMeta(raise_on_unknown_json_key=True).bind_to(TestProcedure)
 
+# Specialised equivalent of TestProcedure.from_dict (generated once at import) - see decoders.build_decoder
+decode_test_procedure = build_decoder(TestProcedure)
+
+
+def _parse_test_procedure(yaml_contents: str) -> TestProcedure:
+    """Uncached implementation of parse_test_procedure"""
+    with phase(SCAN):
+        raw = yaml.load(yaml_contents, Loader=FastUniqueKeyLoader)  # type: ignore # noqa: S506 # Loader is a SafeLoader
+    if isinstance(raw, list):
+        raise ValueError("Expected a singleton - not a list")
+
+    with phase(DECODE):
+        return decode_test_procedure(raw)
+
 
 def parse_test_procedure(yaml_contents: str) -> TestProcedure:
     """Given a YAML string - parse a TestProcedure.
 
-    This will ensure the YAML parser will use all the "strict" extensions to reduce the incidence of errors"""
-
-    tp = TestProcedure.from_yaml(
-        yaml_contents,
-        decoder=yaml.load,  # type: ignore
-        Loader=UniqueKeyLoader,
-    )
-    if isinstance(tp, list):
-        raise ValueError("Expected a singleton - not a list")
+    This will ensure the YAML parser will use all the "strict" extensions to reduce the incidence of errors
 
-    return tp
+    If a parse cache has been configured (see cactus_test_definitions.cache) a previous parse of the same YAML will
+    be loaded from the cache instead"""
+    return cached_parse(yaml_contents, TestProcedure, _parse_test_procedure)
 
 
 def get_yaml_contents(test_procedure_id: TestProcedureId) -> str:
     """Finds the YAML contents for the TestProcedure with the specified TestProcedureId"""
-    yaml_resource = resources.files("cactus_test_definitions.client.procedures") / f"{test_procedure_id}.yaml"
-    with resources.as_file(yaml_resource) as yaml_file:
-        with open(yaml_file) as f:
-            yaml_contents = f.read()
-            return yaml_contents
+    return TEST_PROCEDURE_CATALOG.read_yaml(test_procedure_id)
+
+
+def get_procedure_summaries() -> "dict[TestProcedureId, ProcedureSummary]":
+    """Gets the header metadata (description, category, classes, target versions and counts) of every TestProcedure
+    keyed by TestProcedureId. This is significantly cheaper than get_all_test_procedures as no Steps are parsed.
+
+    The returned dict is shared and MUST be treated as read only"""
+    return TEST_PROCEDURE_CATALOG.summaries()
+
+
+def get_all_yaml_contents(bundled: bool = False) -> dict[TestProcedureId, str]:
+    """Finds the YAML contents for every TestProcedure, keyed by TestProcedureId.
+
+    bundled: If True - read everything from the bundled archive of definitions in a single read (if it's available)"""
+    return TEST_PROCEDURE_CATALOG.read_all_yaml(bundled=bundled)
+
+
+def get_test_procedure(test_procedure_id: TestProcedureId, view: bool = False) -> TestProcedure:
+    """Gets the TestProcedure with the nominated ID. The definition is only loaded from disk on the first request, after
+    which the same (shared) instance is returned from TEST_PROCEDURE_CATALOG - it MUST be treated as read only.
+
+    view: If True - returns a copy on write view over the shared instance instead (see cactus_test_definitions.views).
+          The view can be modified without affecting any other caller (and is much cheaper than a deepcopy)"""
+    if view:
+        return TEST_PROCEDURE_CATALOG.view(test_procedure_id)
+    return TEST_PROCEDURE_CATALOG.get(test_procedure_id)
+
+
+def get_all_test_procedures(
+    parallel: bool = False, executor: "Executor | None" = None
+) -> LazyProcedureMapping[TestProcedureId, TestProcedure]:
+    """Gets a read only Mapping of every TestProcedure, keyed by their TestProcedureId. Each TestProcedure is only
+    loaded on first access - use materialize() on the result to load everything into a regular dict.
+
+    If parallel is True (or an executor is specified), every TestProcedure will be eagerly loaded with the YAML parsing
+    spread across multiple processes (see TestProcedureCatalog.load_all)"""
+    if parallel or executor is not None:
+        TEST_PROCEDURE_CATALOG.load_all(parallel=parallel, executor=executor)
+    return LazyProcedureMapping(TEST_PROCEDURE_CATALOG)
+
 
+def _validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
+    """Validates procedures picked up by TEST_PROCEDURE_CATALOG.reload"""
+    from cactus_test_definitions.client.validate import validate_test_procedure  # validate depends on this module
 
-def get_test_procedure(test_procedure_id: TestProcedureId) -> TestProcedure:
-    """Gets the TestProcedure with the nominated ID by loading its definition from disk"""
-    yaml_contents = get_yaml_contents(test_procedure_id)
-    return parse_test_procedure(yaml_contents)
+    validate_test_procedure(test_procedure, test_procedure_id)
 
 
-def get_all_test_procedures() -> dict[TestProcedureId, TestProcedure]:
-    """Gets every TestProcedure, keyed by their TestProcedureId"""
-    return {tp_id: get_test_procedure(tp_id) for tp_id in TestProcedureId}
+# The default catalog of every client TestProcedure - each definition is parsed at most once per process
+TEST_PROCEDURE_CATALOG: TestProcedureCatalog[TestProcedureId, TestProcedure] = TestProcedureCatalog(
+    "cactus_test_definitions.client.procedures",
+    TestProcedureId,
+    parse_test_procedure,
+    validate=_validate_test_procedure,
+)
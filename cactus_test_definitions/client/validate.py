@@ -1,11 +1,19 @@
-from cactus_test_definitions.client.actions import Action, validate_action_parameters
-from cactus_test_definitions.client.checks import validate_check_parameters
-from cactus_test_definitions.client.events import validate_event_parameters
+from collections.abc import Callable, Iterator
+from functools import partial
+
+from cactus_test_definitions.client.actions import ACTION_PARAMETER_SCHEMA, Action, validate_action_parameters
+from cactus_test_definitions.client.checks import CHECK_PARAMETER_SCHEMA, validate_check_parameters
+from cactus_test_definitions.client.events import EVENT_PARAMETER_SCHEMA, validate_event_parameters
 from cactus_test_definitions.client.test_procedures import (
     TestProcedure,
     TestProcedureId,
 )
 from cactus_test_definitions.errors import TestProcedureDefinitionError
+from cactus_test_definitions.instrumentation import VALIDATE, phase, procedure_scope
+from cactus_test_definitions.validation_cache import ValidationCache, ValidationStamp
+
+# Memoizes the successful results of validate_test_procedure
+VALIDATION_CACHE = ValidationCache([ACTION_PARAMETER_SCHEMA, CHECK_PARAMETER_SCHEMA, EVENT_PARAMETER_SCHEMA])
 
 
 def validate_action(
@@ -32,6 +40,53 @@ def validate_action(
                     )
 
 
+# A single validation of a procedure - (location, validate) where location identifies the validated element (eg
+# steps.GET-DER.actions[0]) and validate raises TestProcedureDefinitionError on failure
+Validation = tuple[str, Callable[[], None]]
+
+
+def _iter_action_validations(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> Iterator[Validation]:
+    if test_procedure.preconditions:
+        for name in ("actions", "init_actions"):
+            for i, action in enumerate(getattr(test_procedure.preconditions, name) or []):
+                yield (
+                    f"preconditions.{name}[{i}]",
+                    partial(validate_action, test_procedure, test_procedure_id, "Precondition", action),
+                )
+
+    for step_name, step in test_procedure.steps.items():
+        for i, action in enumerate(step.actions):
+            yield (
+                f"steps.{step_name}.actions[{i}]",
+                partial(validate_action, test_procedure, test_procedure_id, step_name, action),
+            )
+
+
+def _iter_check_validations(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> Iterator[Validation]:
+    if test_procedure.criteria and test_procedure.criteria.checks:
+        for i, check in enumerate(test_procedure.criteria.checks):
+            yield f"criteria.checks[{i}]", partial(validate_check_parameters, f"{test_procedure_id}: Criteria", check)
+
+    if test_procedure.preconditions and test_procedure.preconditions.checks:
+        for i, check in enumerate(test_procedure.preconditions.checks):
+            yield (
+                f"preconditions.checks[{i}]",
+                partial(validate_check_parameters, f"{test_procedure_id}: Preconditions", check),
+            )
+
+    for step_name, step in test_procedure.steps.items():
+        for i, check in enumerate(step.event.checks or []):
+            yield (
+                f"steps.{step_name}.event.checks[{i}]",
+                partial(validate_check_parameters, f"{test_procedure_id}: Step {step_name}", check),
+            )
+
+
+def _iter_event_validations(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> Iterator[Validation]:
+    for step_name, step in (test_procedure.steps or {}).items():
+        yield f"steps.{step_name}.event", partial(validate_event_parameters, test_procedure_id, step_name, step.event)
+
+
 def validate_test_procedure_actions(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
     """Validate actions of test procedure steps / preconditions
 
@@ -39,21 +94,8 @@ def validate_test_procedure_actions(test_procedure: TestProcedure, test_procedur
     - action has the correct parameters
     - if parameters refer to steps then those steps are defined for the test procedure
     """
-
-    # Validate actions in the preconditions
-    if test_procedure.preconditions:
-        if test_procedure.preconditions.actions:
-            for action in test_procedure.preconditions.actions:
-                validate_action(test_procedure, test_procedure_id, "Precondition", action)
-
-        if test_procedure.preconditions.init_actions:
-            for action in test_procedure.preconditions.init_actions:
-                validate_action(test_procedure, test_procedure_id, "Precondition", action)
-
-    # Validate actions that exist on steps
-    for step_name, step in test_procedure.steps.items():
-        for action in step.actions:
-            validate_action(test_procedure, test_procedure_id, step_name, action)
+    for _, validate in _iter_action_validations(test_procedure, test_procedure_id):
+        validate()
 
 
 def validate_test_procedure_checks(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
@@ -62,19 +104,8 @@ def validate_test_procedure_checks(test_procedure: TestProcedure, test_procedure
     Ensure,
     - check has the correct parameters
     """
-
-    if test_procedure.criteria and test_procedure.criteria.checks:
-        for check in test_procedure.criteria.checks:
-            validate_check_parameters(f"{test_procedure_id}: Criteria", check)
-
-    if test_procedure.preconditions and test_procedure.preconditions.checks:
-        for check in test_procedure.preconditions.checks:
-            validate_check_parameters(f"{test_procedure_id}: Preconditions", check)
-
-    for step_name, step in test_procedure.steps.items():
-        if step.event.checks:
-            for check in step.event.checks:
-                validate_check_parameters(f"{test_procedure_id}: Step {step_name}", check)
+    for _, validate in _iter_check_validations(test_procedure, test_procedure_id):
+        validate()
 
 
 def validate_test_procedure_events(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
@@ -83,16 +114,31 @@ def validate_test_procedure_events(test_procedure: TestProcedure, test_procedure
     Ensure,
     - event has the correct parameters
     """
+    for _, validate in _iter_event_validations(test_procedure, test_procedure_id):
+        validate()
 
-    if test_procedure.steps:
-        for step_name, step in test_procedure.steps.items():
-            validate_event_parameters(test_procedure_id, step_name, step.event)
 
+def iter_validations(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> Iterator[Validation]:
+    """Yields every individual (location, validate) that makes up validate_test_procedure (in the order that it
+    applies them) - so that every failure of a procedure can be collected (see cactus_test_definitions.validation)"""
+    yield from _iter_action_validations(test_procedure, test_procedure_id)
+    yield from _iter_check_validations(test_procedure, test_procedure_id)
+    yield from _iter_event_validations(test_procedure, test_procedure_id)
 
-def validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
+
+def validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> ValidationStamp:
     """Performs additional "high level" validation of a test procedure. (eg: ensuring all action names are valid)
 
+    Successful validations are memoized (see VALIDATION_CACHE) so revalidating an unchanged procedure is cheap.
+
     raises TestProcedureDefinitionError on error"""
-    validate_test_procedure_actions(test_procedure, test_procedure_id)
-    validate_test_procedure_checks(test_procedure, test_procedure_id)
-    validate_test_procedure_events(test_procedure, test_procedure_id)
+    with procedure_scope(test_procedure_id), phase(VALIDATE):
+        return VALIDATION_CACHE.validate(
+            test_procedure, partial(_validate_test_procedure, test_procedure, test_procedure_id)
+        )
+
+
+def _validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
+    """Uncached implementation of validate_test_procedure"""
+    for _, validate in iter_validations(test_procedure, test_procedure_id):
+        validate()
@@ -0,0 +1,158 @@
+import dataclasses
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, NoReturn
+
+from cactus_test_definitions.variable_expressions import BaseExpression
+
+# Leaf types where equal values are interchangeable - any other leaf is also keyed on its repr (eg so datetimes at the
+# same instant in different time zones aren't merged)
+_EXACT_LEAF_TYPES = frozenset([str, int, bool, bytes, type(None)])
+
+
+def _leaf_key(value: Any) -> tuple | None:  # noqa: ANN401
+    """The HashConsPool key of a leaf value - None if it shouldn't be shared"""
+    leaf_type = type(value)
+    if leaf_type in _EXACT_LEAF_TYPES:
+        return (leaf_type, value)
+    if leaf_type is float:
+        if math.isnan(value):
+            return None  # Not equal to itself - so can never be matched
+        return (float, value, math.copysign(1.0, value))  # 0.0 == -0.0
+    return (leaf_type, value, repr(value))
+
+
+class ReadOnlyDict(dict):
+    """A dict that raises TypeError on any attempt at modification. Used instead of a MappingProxyType as it has no
+    overhead beyond the dict itself (and remains an instance of dict)"""
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:  # noqa: ANN401
+        raise TypeError(f"{type(self).__name__} does not support modification")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __reduce__(self) -> tuple[type, tuple[dict]]:
+        return (type(self), (dict(self),))
+
+
+_compact_classes: dict[type, type] = {}
+_compact_types: set[type] = set()  # Every generated compact class
+_compact_classes_lock = threading.Lock()
+
+
+def compact_class(cls: type) -> type:
+    """Gets the compact counterpart of the dataclass cls - a slots=True / frozen=True dataclass with identical fields
+    (but none of the methods / __post_init__ of cls). Generated on first request and then shared"""
+    compact_cls = _compact_classes.get(cls, None)
+    if compact_cls is not None:
+        return compact_cls
+
+    with _compact_classes_lock:
+        compact_cls = _compact_classes.get(cls, None)
+        if compact_cls is None:
+            compact_cls = dataclasses.make_dataclass(
+                cls.__name__,
+                [(f.name, Any) for f in dataclasses.fields(cls)],
+                frozen=True,
+                slots=True,
+                module=__name__,
+            )
+            compact_cls.__doc__ = f"Compact (slotted, frozen) counterpart of {cls.__module__}.{cls.__qualname__}"
+            _compact_classes[cls] = compact_cls
+            _compact_types.add(compact_cls)
+        return compact_cls
+
+
+def is_compact(value: Any) -> bool:  # noqa: ANN401
+    """True if value is an instance of a compact class (see compact) - i.e. its structure (fields, tuples and
+    ReadOnlyDicts) can't be modified. Variable expressions it contains are shared (not frozen) and MUST be treated as
+    read only"""
+    return type(value) in _compact_types
+
+
+@dataclass(frozen=True)
+class HashConsInfo:
+    """Point in time snapshot of a HashConsPool's effectiveness"""
+
+    nodes: int  # Number of compact nodes (dataclass instances, tuples, dicts) that have been through the pool
+    deduplicated: int  # Number of those nodes that were replaced by an existing, structurally equal, node
+    unique: int  # Number of distinct nodes (and leaf values) currently held by the pool
+
+
+class HashConsPool:
+    """Maps structurally equal compact nodes (and leaf values) onto a single shared instance. Only safe for immutable
+    values - see compact.
+
+    Nodes are keyed by their type and the identities of their (already shared) children so structural equality can
+    be determined without recursively comparing / hashing entire subtrees."""
+
+    def __init__(self) -> None:
+        self._shared: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._nodes = 0
+        self._deduplicated = 0
+
+    def share_leaf(self, value: Any) -> Any:  # noqa: ANN401
+        """Gets the shared instance of the (immutable) leaf value. Only values that are indistinguishable are shared (eg
+        0.0 and -0.0 are kept distinct). Unhashable values (and NaN's) are returned unchanged"""
+        try:
+            key = _leaf_key(value)
+            return value if key is None else self._shared.setdefault(key, value)
+        except TypeError:
+            return value
+
+    def share_node(self, value: Any, children: tuple) -> Any:  # noqa: ANN401
+        """Gets the shared instance of the node value (which MUST be composed of children - already shared)"""
+        key = (type(value), *(id(c) for c in children))
+        with self._lock:
+            shared = self._shared.setdefault(key, value)
+            self._nodes += 1
+            if shared is not value:
+                self._deduplicated += 1
+        return shared
+
+    def info(self) -> HashConsInfo:
+        with self._lock:
+            return HashConsInfo(nodes=self._nodes, deduplicated=self._deduplicated, unique=len(self._shared))
+
+
+def compact(value: Any, pool: HashConsPool | None = None) -> Any:  # noqa: ANN401
+    """Converts a (parsed) object model into a compact equivalent (whose structure is read only) with a smaller memory
+    footprint:
+
+    - dataclass instances become instances of their compact_class (no per instance __dict__)
+    - lists become tuples
+    - dicts (eg parameters) become ReadOnlyDict copies
+
+    Variable expressions (and any other values) are returned unchanged (i.e. shared with value) - they are NOT frozen.
+    Modifying one (eg Constant.value) will modify value, every compact procedure sharing it and (as compact procedures
+    are matched by identity) won't invalidate any ValidationCache stamp - they MUST be treated as read only.
+
+    If pool is specified, structurally equal nodes / values (across every call using that pool) will be deduplicated
+    into a single shared instance (hash consing).
+
+    The compact equivalents share field names with the original dataclasses so attribute access is unchanged - but
+    they are NOT instances of the original classes and can't be pickled."""
+    if isinstance(value, list | tuple):
+        items = tuple(compact(item, pool) for item in value)
+        return items if pool is None else pool.share_node(items, items)
+    if isinstance(value, dict):
+        mapping = ReadOnlyDict({compact(key, pool): compact(item, pool) for key, item in value.items()})
+        return mapping if pool is None else pool.share_node(mapping, tuple(c for kv in mapping.items() for c in kv))
+    if isinstance(value, BaseExpression) or isinstance(value, type) or not dataclasses.is_dataclass(value):
+        return value if pool is None else pool.share_leaf(value)
+
+    compact_cls = compact_class(type(value))
+    field_values = tuple(compact(getattr(value, f.name), pool) for f in dataclasses.fields(value))
+    node = compact_cls(*field_values)
+    return node if pool is None else pool.share_node(node, field_values)
@@ -0,0 +1,146 @@
+import dataclasses
+import types
+import typing
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from dataclass_wizard.errors import MissingData, MissingFields, ParseError, UnknownKeysError
+from dataclass_wizard.utils.string_conv import to_snake_case
+from dataclass_wizard.utils.type_conv import as_bool, as_str
+
+
+def resolve_field_name(key: str, field_names: frozenset[str], field_names_lower: dict[str, str]) -> str | None:
+    """Maps a raw (YAML) key onto a dataclass field name in the same way as dataclass_wizard - an exact match,
+    otherwise a case insensitive match of the snake_case version of key (eg TargetVersions -> target_versions).
+
+    Returns None if key can't be matched to any field"""
+    if key in field_names:
+        return key
+    return field_names_lower.get(to_snake_case(key).lower(), None)
+
+
+class DecoderGenerator:
+    """Generates (and compiles) specialised functions for converting raw (YAML) dicts into dataclass instances. The
+    generated code is functionally equivalent to dataclass_wizard's fromdict (including the key casing, rejection of
+    unknown keys and error types) but avoids all of the generic type introspection / dispatch at decode time.
+
+    Only the annotations used by the test procedure models are supported: dataclasses, str, bool, Any, Enum
+    subclasses, list[X], dict[str, X] and X | None"""
+
+    def __init__(self) -> None:
+        self.namespace: dict[str, Any] = {
+            "as_bool": as_bool,
+            "as_str": as_str,
+            "resolve_field_name": resolve_field_name,
+            "MissingData": MissingData,
+            "MissingFields": MissingFields,
+            "ParseError": ParseError,
+            "UnknownKeysError": UnknownKeysError,
+        }
+        self.sources: list[str] = []
+        self._decoder_names: dict[type, str] = {}
+
+    def bind(self, value: Any) -> str:  # noqa: ANN401
+        """Makes value available to the generated code - returning the name it can be referenced by"""
+        name = f"_bound{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def decoder_name(self, cls: type) -> str:
+        """Gets the name of the generated decoder function for cls (generating it if required)"""
+        name = self._decoder_names.get(cls, None)
+        if name is None:
+            name = f"decode_{cls.__name__}_{len(self._decoder_names)}"
+            self._decoder_names[cls] = name
+            self.sources.append(self._generate_decoder(cls, name))
+        return name
+
+    def compile(self) -> None:
+        """Compiles all generated decoders into namespace"""
+        exec(compile("\n\n".join(self.sources), "<cactus_test_definitions.decoders>", "exec"), self.namespace)  # noqa: S102 # nosec
+
+    def value_expression(self, annotation: Any, var: str, depth: int = 0) -> str:  # noqa: ANN401
+        """Generates a python expression that will convert the raw value in variable var to the annotation type"""
+        if annotation is Any:
+            return var
+        if annotation is str:
+            return f"({var} if type({var}) is str else as_str({var}))"
+        if annotation is bool:
+            return f"({var} if type({var}) is bool else as_bool({var}))"
+        if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+            return f"{self.decoder_name(annotation)}({var})"
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return f"{self.bind(annotation)}({var})"
+
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin in (types.UnionType, typing.Union) and len(args) == 2 and type(None) in args:
+            inner = args[0] if args[1] is type(None) else args[1]
+            return f"(None if {var} is None else {self.value_expression(inner, var, depth)})"
+        if origin is list and len(args) == 1:
+            elem = f"e{depth}"
+            return f"[{self.value_expression(args[0], elem, depth + 1)} for {elem} in {var}]"
+        if origin is dict and len(args) == 2:
+            key, val = f"k{depth}", f"v{depth}"
+            key_expr = self.value_expression(args[0], key, depth + 1)
+            val_expr = self.value_expression(args[1], val, depth + 1)
+            return f"{{{key_expr}: {val_expr} for {key}, {val} in {var}.items()}}"
+
+        raise TypeError(f"Unsupported annotation {annotation} for generating a decoder.")
+
+    def _generate_decoder(self, cls: type, name: str) -> str:
+        type_hints = typing.get_type_hints(cls)
+        init_fields = [f for f in dataclasses.fields(cls) if f.init]
+        field_names = frozenset(f.name for f in init_fields)
+
+        cls_name = self.bind(cls)
+        cls_fields_name = self.bind(dataclasses.fields(cls))
+        field_names_name = self.bind(field_names)
+        field_names_lower_name = self.bind({f.lower(): f for f in field_names})
+        key_to_field_name = self.bind({})  # Cache of raw keys that have been resolved to field names
+
+        lines = [
+            f"def {name}(o):",
+            "    init_kwargs = {}",
+            "    try:",
+            "        for json_key in o:",
+            f"            field = {key_to_field_name}.get(json_key, None)",
+            "            if field is None:",
+            f"                field = resolve_field_name(json_key, {field_names_name}, {field_names_lower_name})",
+            "                if field is None:",
+            f"                    raise UnknownKeysError(json_key, o, {cls_name}, {cls_fields_name}) from None",
+            f"                {key_to_field_name}[json_key] = field",
+            "            value = o[json_key]",
+        ]
+        for i, field in enumerate(init_fields):
+            keyword = "if" if i == 0 else "elif"
+            value_expression = self.value_expression(type_hints[field.name], "value")
+            lines.append(f"            {keyword} field == {field.name!r}:")
+            lines.append(f"                init_kwargs[{field.name!r}] = {value_expression}")
+        lines.extend(
+            [
+                "    except TypeError:",
+                "        if o is None:",
+                f"            raise MissingData({cls_name}) from None",
+                "        if not isinstance(o, dict):",
+                "            e = TypeError('Incorrect type for field')",
+                f"            raise ParseError(e, o, dict, {cls_name}, desired_type=dict) from None",
+                "        raise",
+                "    try:",
+                f"        return {cls_name}(**init_kwargs)",
+                "    except TypeError as e:",
+                f"        raise MissingFields(e, o, {cls_name}, {cls_fields_name}, init_kwargs) from None",
+            ]
+        )
+        return "\n".join(lines)
+
+
+def build_decoder[T](cls: type[T]) -> Callable[[Any], T]:
+    """Generates and compiles a specialised decoder for converting a raw (YAML) dict into an instance of the dataclass
+    cls (and any nested dataclasses). The decoder will raise the same errors as dataclass_wizard's fromdict with
+    raise_on_unknown_json_key enabled."""
+    generator = DecoderGenerator()
+    name = generator.decoder_name(cls)
+    generator.compile()
+    return generator.namespace[name]
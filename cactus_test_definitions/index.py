@@ -0,0 +1,131 @@
+import dataclasses
+from collections.abc import Iterable, Iterator, Mapping
+from enum import StrEnum
+from typing import Any
+
+from cactus_test_definitions.client.actions import Action as ClientAction
+from cactus_test_definitions.client.checks import Check as ClientCheck
+from cactus_test_definitions.client.events import Event as ClientEvent
+from cactus_test_definitions.compact import compact_class
+from cactus_test_definitions.server.actions import Action as ServerAction
+from cactus_test_definitions.server.checks import Check as ServerCheck
+
+# The names of every field that a ProcedureIndex can be queried by
+INDEX_FIELDS = (
+    "target_version",
+    "classes",
+    "category",
+    "uses_action",
+    "uses_check",
+    "uses_event",
+    "client_type",
+)
+
+# The classes of each indexed node - including their compact counterparts (see cactus_test_definitions.compact)
+ACTION_CLASSES = tuple(cls for base in (ClientAction, ServerAction) for cls in (base, compact_class(base)))
+CHECK_CLASSES = tuple(cls for base in (ClientCheck, ServerCheck) for cls in (base, compact_class(base)))
+EVENT_CLASSES = (ClientEvent, compact_class(ClientEvent))
+
+
+def _iter_dataclasses(value: Any) -> Iterator[Any]:  # noqa: ANN401
+    """Yields value and every dataclass nested within it (via lists / tuples / dicts). Parameters are not traversed"""
+    if dataclasses.is_dataclass(value):
+        yield value
+        for field in dataclasses.fields(value):
+            if field.name != "parameters":
+                yield from _iter_dataclasses(getattr(value, field.name))
+    elif isinstance(value, list | tuple):
+        for item in value:
+            yield from _iter_dataclasses(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_dataclasses(item)
+
+
+def procedure_terms(procedure: Any) -> dict[str, frozenset[str]]:  # noqa: ANN401
+    """Extracts the index terms (keyed by INDEX_FIELDS) of a parsed (client or server) TestProcedure - or its compact
+    equivalent"""
+    terms: dict[str, set[str]] = {
+        "target_version": {str(v) for v in procedure.target_versions},
+        "classes": set(procedure.classes),
+        "category": {procedure.category},
+        "uses_action": set(),
+        "uses_check": set(),
+        "uses_event": set(),
+        "client_type": set(),
+    }
+    for node in _iter_dataclasses(procedure):
+        if isinstance(node, ACTION_CLASSES):
+            terms["uses_action"].add(node.type)
+        elif isinstance(node, CHECK_CLASSES):
+            terms["uses_check"].add(node.type)
+        elif isinstance(node, EVENT_CLASSES):
+            terms["uses_event"].add(node.type)
+        elif (client_type := getattr(node, "client_type", None)) is not None:
+            terms["client_type"].add(str(client_type))  # RequiredClient
+    return {field: frozenset(values) for field, values in terms.items()}
+
+
+class ProcedureIndex[IdT: StrEnum]:
+    """Inverted indexes (field -> term -> procedure ids) over a set of procedures. Queries are answered by set
+    intersection of the relevant postings rather than inspecting any procedures."""
+
+    def __init__(self, procedure_ids: Iterable[IdT], terms_by_id: Mapping[IdT, Mapping[str, Iterable[str]]]) -> None:
+        """procedure_ids: Every indexed procedure id (in the order that results should be returned)
+        terms_by_id: The terms (keyed by INDEX_FIELDS) of each procedure - see procedure_terms"""
+        self.procedure_ids = tuple(procedure_ids)
+        postings: dict[str, dict[str, set[IdT]]] = {field: {} for field in INDEX_FIELDS}
+        for procedure_id in self.procedure_ids:
+            for field, terms in terms_by_id[procedure_id].items():
+                for term in terms:
+                    postings[field].setdefault(term, set()).add(procedure_id)
+
+        self.postings: dict[str, dict[str, frozenset[IdT]]] = {
+            field: {term: frozenset(ids) for term, ids in field_postings.items()}
+            for field, field_postings in postings.items()
+        }
+
+    def terms(self, field: str) -> list[str]:
+        """The sorted list of every term indexed for field (eg every action type for "uses_action")"""
+        return sorted(self.postings[field])
+
+    def lookup(self, field: str, term: str) -> frozenset[IdT]:
+        """The set of procedure ids with term in field"""
+        return self.postings[field].get(str(term), frozenset())
+
+    def find(
+        self,
+        target_version: str | None = None,
+        classes_any: Iterable[str] | None = None,
+        category: str | None = None,
+        uses_action: str | None = None,
+        uses_check: str | None = None,
+        uses_event: str | None = None,
+        client_type: str | None = None,
+    ) -> list[IdT]:
+        """Finds the ids of every procedure matching ALL of the specified criteria (None criteria are ignored).
+
+        target_version: Procedure targets this CSIPAusVersion
+        classes_any: Procedure has at least one of these classes (eg ["A", "DR-A"])
+        category: Procedure has this category
+        uses_action / uses_check / uses_event: Procedure uses an action / check / event of this type
+        client_type: Procedure has a RequiredClient of this ClientType (server procedures only)"""
+        selections: list[frozenset[IdT]] = []
+        if classes_any is not None:
+            selections.append(frozenset().union(*(self.lookup("classes", c) for c in classes_any)))
+        for field, term in [
+            ("target_version", target_version),
+            ("category", category),
+            ("uses_action", uses_action),
+            ("uses_check", uses_check),
+            ("uses_event", uses_event),
+            ("client_type", client_type),
+        ]:
+            if term is not None:
+                selections.append(self.lookup(field, term))
+
+        if not selections:
+            return list(self.procedure_ids)
+
+        matches = frozenset.intersection(*sorted(selections, key=len))
+        return [procedure_id for procedure_id in self.procedure_ids if procedure_id in matches]
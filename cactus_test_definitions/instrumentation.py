@@ -0,0 +1,218 @@
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# The phases recorded while loading procedures. EXPRESSIONS is nested within DECODE (variable expressions are parsed by
+# the __post_init__ of each action / check / event) - see PhaseTiming.self_seconds for the time excluding nested phases
+READ = "read"  # Reading a YAML definition from the procedures package
+SCAN = "scan"  # Scanning / parsing YAML into plain python objects
+DECODE = "decode"  # Decoding the plain python objects into the procedure dataclasses
+EXPRESSIONS = "expressions"  # Parsing a variable expression (eg "$(now - '5 minutes')")
+DESERIALISE = "deserialise"  # Loading a procedure from a precompiled artifact
+VALIDATE = "validate"  # Validating a procedure against the parameter schemas
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """A single completed phase, as passed to every listener"""
+
+    procedure_id: str | None  # The procedure being loaded / validated (see procedure_scope) - None if unknown
+    phase: str  # eg SCAN
+    seconds: float  # Wall clock duration of the phase
+    self_seconds: float  # seconds excluding any phases nested within this phase
+
+
+PhaseListener = Callable[[PhaseTiming], Any]
+
+_listeners: tuple[PhaseListener, ...] = ()  # Replaced (never mutated) so it can be read without locking
+_listeners_lock = threading.Lock()
+_procedure_id: ContextVar[str | None] = ContextVar("procedure_id", default=None)
+_active = threading.local()  # .stack is the list of in progress _Phase on this thread
+
+
+def add_phase_listener(listener: PhaseListener) -> None:
+    """Registers listener to be called (on the recording thread) with the PhaseTiming of every subsequent phase"""
+    global _listeners
+    with _listeners_lock:
+        _listeners = (*_listeners, listener)
+
+
+def remove_phase_listener(listener: PhaseListener) -> None:
+    """Unregisters a listener added via add_phase_listener. Does nothing if listener isn't registered"""
+    global _listeners
+    with _listeners_lock:
+        _listeners = tuple(existing for existing in _listeners if existing is not listener)
+
+
+def is_enabled() -> bool:
+    """True if any listener is registered (ie phases are being timed)"""
+    return bool(_listeners)
+
+
+class _Disabled:
+    """Shared no-op context manager returned when nothing is listening"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: object) -> None:
+        return None
+
+
+_DISABLED = _Disabled()
+
+
+class _Phase:
+    __slots__ = ("name", "start", "nested_seconds")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.nested_seconds = 0.0
+
+    def __enter__(self) -> None:
+        stack = getattr(_active, "stack", None)
+        if stack is None:
+            stack = _active.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args: object) -> None:
+        seconds = time.perf_counter() - self.start
+        stack = _active.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested_seconds += seconds
+
+        timing = PhaseTiming(_procedure_id.get(), self.name, seconds, seconds - self.nested_seconds)
+        for listener in _listeners:
+            listener(timing)
+
+
+def phase(name: str) -> _Phase | _Disabled:
+    """Context manager that times the enclosed block as the phase name (eg SCAN). If nothing is listening, a shared
+    no-op is returned so instrumented code costs (almost) nothing. Eg:
+
+    with phase(SCAN):
+        raw = yaml.load(...)
+    """
+    if not _listeners:
+        return _DISABLED
+    return _Phase(name)
+
+
+def instrumented[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator that times every call of the decorated function as the phase name (see phase)"""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _listeners:
+                return func(*args, **kwargs)
+            with _Phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def procedure_scope(procedure_id: str) -> Iterator[None]:
+    """Attributes every phase recorded within the enclosed block (on this thread / context) to procedure_id"""
+    token = _procedure_id.set(str(procedure_id))
+    try:
+        yield
+    finally:
+        _procedure_id.reset(token)
+
+
+@dataclass
+class PhaseStats:
+    """Aggregated timings of a single phase"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    self_seconds: float = 0.0  # total_seconds excluding nested phases
+    max_seconds: float = 0.0
+
+
+class PhaseRecorder:
+    """A phase listener that aggregates PhaseTiming by phase (and by procedure id). Eg:
+
+    with record_phases() as recorder:
+        get_all_test_procedures().materialize()
+    print(recorder.to_json())
+
+    Phases that run in other processes (eg TestProcedureCatalog.load_all with parallel=True) aren't recorded."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str | None, str], PhaseStats] = {}  # Keyed by (procedure_id, phase)
+
+    def __call__(self, timing: PhaseTiming) -> None:
+        with self._lock:
+            stats = self._stats.get((timing.procedure_id, timing.phase), None)
+            if stats is None:
+                stats = self._stats[(timing.procedure_id, timing.phase)] = PhaseStats()
+            stats.count += 1
+            stats.total_seconds += timing.seconds
+            stats.self_seconds += timing.self_seconds
+            stats.max_seconds = max(stats.max_seconds, timing.seconds)
+
+    def phases(self) -> dict[str, PhaseStats]:
+        """The stats of each phase (across every procedure), keyed by phase"""
+        totals: dict[str, PhaseStats] = {}
+        with self._lock:
+            for (_, phase_name), stats in self._stats.items():
+                total = totals.setdefault(phase_name, PhaseStats())
+                total.count += stats.count
+                total.total_seconds += stats.total_seconds
+                total.self_seconds += stats.self_seconds
+                total.max_seconds = max(total.max_seconds, stats.max_seconds)
+        return totals
+
+    def procedures(self) -> dict[str | None, dict[str, PhaseStats]]:
+        """The stats of each phase, keyed by procedure id (None for phases outside of any procedure_scope) then phase"""
+        by_procedure: dict[str | None, dict[str, PhaseStats]] = {}
+        with self._lock:
+            for (procedure_id, phase_name), stats in self._stats.items():
+                by_procedure.setdefault(procedure_id, {})[phase_name] = PhaseStats(**asdict(stats))
+        return by_procedure
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain (JSON serialisable) dict of everything recorded - phases outside of any procedure_scope are listed
+        under the procedure id "" """
+        return {
+            "phases": {phase_name: asdict(stats) for phase_name, stats in self.phases().items()},
+            "procedures": {
+                procedure_id or "": {phase_name: asdict(stats) for phase_name, stats in phases.items()}
+                for procedure_id, phases in self.procedures().items()
+            },
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+@contextmanager
+def record_phases(recorder: PhaseRecorder | None = None) -> Iterator[PhaseRecorder]:
+    """Records every phase (on any thread) within the enclosed block to recorder (a new PhaseRecorder if None)"""
+    if recorder is None:
+        recorder = PhaseRecorder()
+    add_phase_listener(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_phase_listener(recorder)
@@ -0,0 +1,40 @@
+import dataclasses
+import sys
+from typing import Any
+
+# Strings longer than this (eg descriptions / instructions) are rarely repeated so aren't worth interning
+MAX_INTERNED_LENGTH = 64
+
+
+def intern_str(value: str) -> str:
+    """Interns value (via sys.intern) if it's short enough to likely be repeated (eg identifiers, types, keys)"""
+    return sys.intern(value) if len(value) <= MAX_INTERNED_LENGTH else value
+
+
+def intern_strings(value: Any) -> Any:  # noqa: ANN401
+    """Interns (see intern_str) every str nested within value - updating lists, dicts and dataclass instances in place.
+    Returns the interned equivalent of value.
+
+    Designed for object models created without going via the YAML loaders (eg unpickled procedures) which would
+    otherwise hold a separate copy of every repeated string. Str subclasses (eg StrEnum members) are unchanged."""
+    value_type = type(value)
+    if value_type is str:
+        return sys.intern(value) if len(value) <= MAX_INTERNED_LENGTH else value
+    if value_type is list:
+        for i, item in enumerate(value):
+            value[i] = intern_strings(item)
+    elif value_type is tuple:
+        return tuple(intern_strings(item) for item in value)
+    elif value_type is dict:
+        items = [(intern_strings(k), intern_strings(v)) for k, v in value.items()]
+        value.clear()
+        value.update(items)
+    elif hasattr(value_type, "__dataclass_fields__"):
+        attributes = getattr(value, "__dict__", None)
+        if attributes is not None:
+            for name, attribute in attributes.items():
+                attributes[name] = intern_strings(attribute)  # Replacing values doesn't alter the dict's size
+        else:
+            for field in dataclasses.fields(value):
+                object.__setattr__(value, field.name, intern_strings(getattr(value, field.name)))
+    return value
@@ -0,0 +1,27 @@
+from collections.abc import Callable, Mapping
+from typing import Any
+
+
+def lazy_attributes(
+    module_globals: dict[str, Any], attributes: Mapping[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Generates the (PEP 562) module level __getattr__ and __dir__ for a module whose attributes (keys of attributes)
+    are imported from other modules (values of attributes) on first access rather than at import time, eg:
+
+    __getattr__, __dir__ = lazy_attributes(globals(), {"TestProcedureCatalog": "cactus_test_definitions.catalog"})
+    """
+    module_name = module_globals["__name__"]
+
+    def __getattr__(name: str) -> Any:  # noqa: ANN401, N807
+        source_module = attributes.get(name, None)
+        if source_module is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        # __import__ (rather than importlib.import_module) so the import is still reported by python -X importtime
+        value = getattr(__import__(source_module, fromlist=[name]), name)
+        module_globals[name] = value  # Subsequent lookups won't need to go via __getattr__
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted(set(module_globals) | set(attributes))
+
+    return __getattr__, __dir__
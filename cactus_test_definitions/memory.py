@@ -0,0 +1,187 @@
+"""Reports the memory footprint of each loaded test procedure (as measured by tracemalloc) - along with the objects
+(by type) that make up each procedure. Useful for sizing runners and measuring the effect of compact catalogs (see
+cactus_test_definitions.compact)"""
+
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any
+
+from cactus_test_definitions.cache import configure_parse_cache, reset_parse_cache_configuration
+from cactus_test_definitions.compact import HashConsPool, compact
+from cactus_test_definitions.procedure_ids import KINDS, check_kind, test_procedures_module
+from cactus_test_definitions.procedure_ids import procedure_ids as kind_procedure_ids
+
+# The types always listed in ProcedureFootprint.object_counts (even if a procedure has none of them)
+REPORTED_TYPES = ("Step", "Action", "Check", "Event", "Expression", "NamedVariable", "Constant", "dict", "list", "str")
+
+
+@dataclass(frozen=True)
+class ProcedureFootprint:
+    """The memory retained by a single loaded procedure"""
+
+    kind: str  # client or server
+    procedure_id: str
+    retained_bytes: int  # Bytes still allocated (as measured by tracemalloc) after loading the procedure
+    object_counts: dict[str, int]  # Distinct objects reachable from the procedure, keyed by type name
+    object_bytes: dict[str, int]  # Shallow size (sys.getsizeof) of the objects in object_counts, keyed by type name
+
+    @property
+    def object_count(self) -> int:
+        return sum(self.object_counts.values())
+
+    def top_types(self, n: int = 5) -> list[tuple[str, int]]:
+        """The (type name, bytes) of the n types with the largest object_bytes"""
+        return Counter(self.object_bytes).most_common(n)
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """The footprint of every measured procedure (see measure_all)"""
+
+    compact: bool  # Were procedures measured as their compact (slotted, frozen, deduplicated) equivalents
+    footprints: tuple[ProcedureFootprint, ...]
+
+    @property
+    def retained_bytes(self) -> int:
+        return sum(f.retained_bytes for f in self.footprints)
+
+    def object_counts(self) -> dict[str, int]:
+        """Total objects of each type across every procedure"""
+        totals: Counter[str] = Counter()
+        for footprint in self.footprints:
+            totals.update(footprint.object_counts)
+        return dict(totals)
+
+    def top(self, n: int = 10) -> list[ProcedureFootprint]:
+        """The n procedures that retain the most memory (largest first)"""
+        return sorted(self.footprints, key=lambda f: f.retained_bytes, reverse=True)[:n]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "compact": self.compact,
+            "procedures": len(self.footprints),
+            "retained_bytes": self.retained_bytes,
+            "object_counts": self.object_counts(),
+            "footprints": [asdict(f) for f in self.footprints],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def count_objects(value: Any) -> tuple[dict[str, int], dict[str, int]]:  # noqa: ANN401
+    """Walks every distinct object reachable from value (via dataclass fields, dicts, lists and tuples) - returning the
+    (counts, shallow bytes) of those objects keyed by type name. Enum members and types are shared by every procedure
+    so aren't counted. Instances of dataclasses are recorded under their class name (eg Step)"""
+    counts: Counter[str] = Counter()
+    sizes: Counter[str] = Counter()
+    seen: set[int] = set()
+    pending = [value]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or current is None or isinstance(current, Enum | type | bool):
+            continue
+        seen.add(id(current))
+
+        name = type(current).__name__
+        counts[name] += 1
+        sizes[name] += sys.getsizeof(current)
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, list | tuple):
+            pending.extend(current)
+        elif dataclasses.is_dataclass(current):
+            pending.extend(getattr(current, f.name) for f in dataclasses.fields(current))
+
+    for name in REPORTED_TYPES:
+        counts.setdefault(name, 0)
+        sizes.setdefault(name, 0)
+    return dict(counts), dict(sizes)
+
+
+def retained_bytes(load: Callable[[], Any]) -> tuple[int, Any]:
+    """Calls load - returning the bytes that remain allocated afterwards (as measured by tracemalloc) and the result.
+    tracemalloc must already be tracing"""
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    result = load()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    return after - before, result
+
+
+def _loader(kind: str, procedure_id: str, compact_procedure: bool) -> Callable[[], Any]:
+    """Creates a function that parses a new (unshared) instance of procedure_id. The YAML is read up front so it isn't
+    included in the measurement"""
+    module = test_procedures_module(kind)
+    yaml_contents = module.TEST_PROCEDURE_CATALOG.read_yaml(module.TestProcedureId(procedure_id))
+
+    def load() -> Any:  # noqa: ANN401
+        procedure = module.parse_test_procedure(yaml_contents)
+        return compact(procedure, HashConsPool()) if compact_procedure else procedure
+
+    return load
+
+
+def measure_procedure(kind: str, procedure_id: str, compact: bool = False) -> ProcedureFootprint:
+    """Measures the memory retained by a newly parsed instance of procedure_id (see measure_all)"""
+    load = _loader(kind, procedure_id, compact)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        size, procedure = retained_bytes(load)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    counts, sizes = count_objects(procedure)
+    return ProcedureFootprint(kind, str(procedure_id), size, counts, sizes)
+
+
+def measure_all(
+    kinds: Sequence[str] = KINDS, compact: bool = False, procedure_ids: Iterable[str] | None = None
+) -> MemoryReport:
+    """Measures the memory footprint of every procedure of kinds (client and/or server).
+
+    Each procedure is parsed (bypassing any parse cache / precompiled artifact) under tracemalloc - retained_bytes is
+    what remains allocated once parsing has finished. Every procedure is parsed once before measuring so that one off
+    allocations (eg generated decoders / compact classes) aren't attributed to the first procedure. Short strings are
+    interned - those shared with another live procedure (eg the shared catalogs) aren't included in retained_bytes.
+
+    compact: If True - measure procedures after converting them to their compact equivalents (deduplicating within
+             each procedure - see cactus_test_definitions.compact)
+    procedure_ids: If specified - only these procedures are measured (must belong to one of kinds)"""
+    requested = None if procedure_ids is None else [str(procedure_id) for procedure_id in procedure_ids]
+    targets: list[tuple[str, str]] = []
+    for kind in kinds:
+        check_kind(kind)
+        ids = kind_procedure_ids(kind)
+        selected = ids if requested is None else [i for i in requested if i in ids]
+        targets.extend((kind, str(procedure_id)) for procedure_id in selected)
+
+    unknown = set(requested or []).difference(procedure_id for _, procedure_id in targets)
+    if unknown:
+        raise ValueError(f"Unknown procedure(s) {sorted(unknown)} for {tuple(kinds)}")
+
+    configure_parse_cache(None)  # Measure the parsed procedure (not something unpickled from the parse cache)
+    started = not tracemalloc.is_tracing()
+    try:
+        for kind, procedure_id in targets:
+            _loader(kind, procedure_id, compact)()  # Warm up
+        if started:
+            tracemalloc.start()
+        footprints = tuple(measure_procedure(kind, procedure_id, compact) for kind, procedure_id in targets)
+    finally:
+        if started:
+            tracemalloc.stop()
+        reset_parse_cache_configuration()
+    return MemoryReport(compact, footprints)
@@ -42,6 +42,67 @@ class ParameterSchema:
     expected_type: ParameterType
 
 
+_schema_generation = 0  # Incremented on every modification of any SchemaTable
+
+
+def schema_generation() -> int:
+    """Changes whenever any SchemaTable (eg ACTION_PARAMETER_SCHEMA) is modified. Allows anything derived from the
+    schema tables (eg memoized validation results) to detect that it is out of date without re-reading the tables"""
+    return _schema_generation
+
+
+def _schema_modified() -> None:
+    global _schema_generation
+    _schema_generation += 1
+
+
+class SchemaTable[K, V](dict[K, V]):
+    """A dict of parameter schemas (eg action type -> parameter name -> ParameterSchema) that increments
+    schema_generation whenever it (or any nested dict value) is modified"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        for key, value in self.items():
+            if type(value) is dict:
+                super().__setitem__(key, SchemaTable(value))
+        _schema_modified()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, SchemaTable(value) if type(value) is dict else value)  # type: ignore[arg-type]
+        _schema_modified()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        _schema_modified()
+
+    def __ior__(self, other: Any) -> "SchemaTable[K, V]":  # type: ignore[override,misc] # noqa: ANN401
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: K, default: V = None) -> V:  # type: ignore[assignment]
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args: Any) -> Any:  # noqa: ANN401
+        value = super().pop(*args)
+        _schema_modified()
+        return value
+
+    def popitem(self) -> tuple[K, V]:
+        item = super().popitem()
+        _schema_modified()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        _schema_modified()
+
+
 def is_valid_parameter_type(expected_type: ParameterType, value: Any) -> bool:  # noqa: C901, ANN401
     """Returns true if the specified value "passes" as the expected type. Only performs rudimentary checks to try
     and catch obvious misconfigurations"""
@@ -73,9 +134,9 @@ def is_valid_parameter_type(expected_type: ParameterType, value: Any) -> bool:
         case ParameterType.DateTime:
             return isinstance(value, datetime)
         case ParameterType.ListString:
-            return isinstance(value, list) and all(isinstance(e, str) for e in value)
+            return isinstance(value, list | tuple) and all(isinstance(e, str) for e in value)
         case ParameterType.ListInteger:
-            return isinstance(value, list) and all(isinstance(e, int) for e in value)
+            return isinstance(value, list | tuple) and all(isinstance(e, int) for e in value)
         case ParameterType.HexBinary:
             try:
                 int(value, 16)
@@ -88,7 +149,7 @@ def is_valid_parameter_type(expected_type: ParameterType, value: Any) -> bool:
             except Exception:
                 return False
         case ParameterType.ListCSIPAusResource:
-            return isinstance(value, list) and all(
+            return isinstance(value, list | tuple) and all(
                 is_valid_parameter_type(ParameterType.CSIPAusResource, e) for e in value
             )
         case ParameterType.CSIPAusReadingType:
@@ -97,7 +158,7 @@ def is_valid_parameter_type(expected_type: ParameterType, value: Any) -> bool:
             except Exception:
                 return False
         case ParameterType.ListCSIPAusReadingType:
-            return isinstance(value, list) and all(
+            return isinstance(value, list | tuple) and all(
                 is_valid_parameter_type(ParameterType.CSIPAusReadingType, e) for e in value
             )
         case ParameterType.CSIPAusReadingLocation:
@@ -113,7 +174,7 @@ def is_valid_parameter_type(expected_type: ParameterType, value: Any) -> bool:
             for reading_type, reading_vals in value.items():
                 if (
                     not is_valid_parameter_type(ParameterType.CSIPAusReadingType, reading_type)
-                    or not isinstance(reading_vals, list)
+                    or not isinstance(reading_vals, list | tuple)
                     or not all(is_valid_parameter_type(ParameterType.Float, rv) for rv in reading_vals)
                 ):
                     return False
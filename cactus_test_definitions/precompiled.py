@@ -0,0 +1,302 @@
+import functools
+import hashlib
+import importlib.util
+import os
+import pickle
+import struct
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field
+from importlib import resources
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from cactus_test_definitions.bundle import write_procedure_bundle
+from cactus_test_definitions.interning import intern_strings
+from cactus_test_definitions.summary import ProcedureSummary, summarise_procedure
+
+if TYPE_CHECKING:
+    from cactus_test_definitions.catalog import TestProcedureCatalog
+
+# Name of the precompiled artifact that lives alongside the YAML definitions in a procedures package
+PRECOMPILED_RESOURCE = "precompiled.bin"
+
+PRECOMPILED_MAGIC = b"CACTUS-TD-PRECOMPILED-2\n"  # Changing the encoding of the artifact MUST change this value
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# Source files modified this recently (when stamped) may be modified again without changing their size / mtime (mtimes
+# can be coarser than the time between edits) - so their stats can't be relied upon for detecting changes
+_RACY_SOURCE_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class PrecompiledHeader:
+    """Describes the contents of a precompiled artifact"""
+
+    library_version: str  # The cactus_test_definitions.__version__ that built the artifact
+    sources_digest: str  # The sources_digest of the procedures package at the time the artifact was built
+    source_stats: dict[str, tuple[int, int]]  # See SourcesStamp
+    release: bool  # See SourcesStamp
+    offsets: dict[str, tuple[int, int]]  # (offset, length) of each pickled procedure (relative to the body), by id
+    summaries: dict[str, dict[str, Any]] = field(default_factory=dict)  # ProcedureSummary (as dict) by procedure id
+    terms: dict[str, dict[str, frozenset[str]]] = field(default_factory=dict)  # index.procedure_terms by procedure id
+
+    @property
+    def stamp(self) -> "SourcesStamp":
+        return SourcesStamp(self.library_version, self.sources_digest, self.source_stats, self.release)
+
+
+def _iter_python_sources(package: Traversable) -> Iterator[Traversable]:
+    for child in package.iterdir():
+        if child.is_dir():
+            yield from _iter_python_sources(child)
+        elif child.name.endswith(".py"):
+            yield child
+
+
+@functools.cache
+def library_sources_digest() -> str:
+    """Calculates a digest of the python sources of this library (that define the procedure models). Calculated once
+    per process - used for detecting serialised procedures that were created by different code"""
+    digest = hashlib.sha256()
+    python_resources = list(_iter_python_sources(resources.files("cactus_test_definitions")))
+    for source in sorted(python_resources, key=lambda r: str(r)):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def sources_digest(procedures_package: str) -> str:
+    """Calculates a digest of every YAML definition in procedures_package (and the python sources of this library that
+    define the procedure models) - used for detecting a stale artifact. Reads every source file (see source_stats for a
+    cheaper check)"""
+    digest = hashlib.sha256()
+    yaml_resources = [r for r in resources.files(procedures_package).iterdir() if r.name.endswith(".yaml")]
+    for source in sorted(yaml_resources, key=lambda r: r.name):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    digest.update(library_sources_digest().encode())
+    return digest.hexdigest()
+
+
+def _scan_stats(directory: str, suffix: str, prefix: str, stats: dict[str, tuple[int, int]], recurse: bool) -> None:
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if recurse and entry.is_dir() and entry.name != "__pycache__":
+                _scan_stats(entry.path, suffix, f"{prefix}{entry.name}/", stats, recurse)
+            elif entry.name.endswith(suffix) and entry.is_file():
+                stat = entry.stat()
+                stats[f"{prefix}{entry.name}"] = (stat.st_size, stat.st_mtime_ns)
+
+
+def _package_dirs(package: str) -> list[str]:
+    spec = importlib.util.find_spec(package)
+    return [] if spec is None else list(spec.submodule_search_locations or [])
+
+
+def source_stats(procedures_package: str) -> dict[str, tuple[int, int]]:
+    """The (size, mtime_ns) of every YAML definition in procedures_package and python source of this library, keyed by
+    path. Only requires listing / stat'ing the source files (no reads). Empty if the sources aren't files (eg zipped)"""
+    stats: dict[str, tuple[int, int]] = {}
+    try:
+        for i, directory in enumerate(_package_dirs(procedures_package)):
+            _scan_stats(directory, ".yaml", f"{procedures_package}[{i}]:", stats, recurse=False)
+        for i, directory in enumerate(_package_dirs("cactus_test_definitions")):
+            _scan_stats(directory, ".py", f"cactus_test_definitions[{i}]:", stats, recurse=True)
+    except OSError:
+        return {}
+    return stats
+
+
+@dataclass(frozen=True)
+class SourcesStamp:
+    """Identifies the sources (YAML definitions and library python sources) that a build artifact (eg the precompiled
+    artifact or a procedures bundle) was built from - for cheaply detecting a stale artifact (see is_current)"""
+
+    library_version: str  # The cactus_test_definitions.__version__ that built the artifact
+    sources_digest: str  # The sources_digest of the procedures package (empty if not built from a procedures package)
+
+    # The source_stats when built - empty if they can't be relied upon (eg sources modified immediately before building)
+    source_stats: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    # True if built for a release (by the package build) - the artifact is installed alongside the sources it was built
+    # from so it's current for as long as the same library version is installed
+    release: bool = False
+
+    @staticmethod
+    def of(procedures_package: str, release: bool = False) -> "SourcesStamp":
+        """Stamps the current sources of procedures_package"""
+        from cactus_test_definitions import __version__
+
+        stats = {} if release else source_stats(procedures_package)
+        racy_after = time.time_ns() - _RACY_SOURCE_NS
+        if any(mtime_ns >= racy_after for _, mtime_ns in stats.values()):
+            stats = {}
+        return SourcesStamp(__version__, sources_digest(procedures_package), stats, release)
+
+    def is_current(self, procedures_package: str) -> bool:
+        """True if the sources of procedures_package are unchanged since this stamp was taken (by this library
+        version). Release stamps only compare the library version - otherwise the source_stats are compared, falling
+        back to comparing the (relatively expensive) sources_digest if any source has been touched."""
+        from cactus_test_definitions import __version__
+
+        if self.library_version != __version__:
+            return False
+        if self.release:
+            return True
+        if self.source_stats and self.source_stats == source_stats(procedures_package):
+            return True
+        return bool(self.sources_digest) and self.sources_digest == sources_digest(procedures_package)
+
+
+class PrecompiledCatalog:
+    """Read only view over a precompiled artifact - a collection of individually pickled procedures that can be
+    deserialised on demand. The artifact is encoded as:
+
+    PRECOMPILED_MAGIC | header length (8 bytes, little endian) | pickled PrecompiledHeader (as dict) | procedures..."""
+
+    def __init__(self, buffer: bytes | memoryview) -> None:
+        view = memoryview(buffer)
+        magic_end = len(PRECOMPILED_MAGIC)
+        if view[:magic_end] != PRECOMPILED_MAGIC:
+            raise ValueError("Buffer is not a precompiled cactus_test_definitions artifact.")
+
+        (header_length,) = _HEADER_LENGTH.unpack_from(view, magic_end)
+        header_start = magic_end + _HEADER_LENGTH.size
+        raw_header = pickle.loads(view[header_start : header_start + header_length])  # noqa: S301
+        self.header = PrecompiledHeader(**raw_header)
+        self.buffer = view  # The entire artifact
+        self._body = view[header_start + header_length :]
+
+    @staticmethod
+    def build(
+        procedures: Mapping[str, Any],
+        sources: "SourcesStamp | str",
+        summaries: Mapping[str, ProcedureSummary] | None = None,
+        terms: Mapping[str, Mapping[str, frozenset[str]]] | None = None,
+    ) -> bytes:
+        """Encodes procedures (keyed by their procedure id) into a precompiled artifact. sources is the SourcesStamp of
+        the procedures package they were parsed from (or just its sources_digest). summaries and (index) terms (both
+        keyed by procedure id) will be stored in the header - readable without deserialising any procedures"""
+        from cactus_test_definitions import __version__
+
+        stamp = SourcesStamp(__version__, sources) if isinstance(sources, str) else sources
+        offsets: dict[str, tuple[int, int]] = {}
+        body = bytearray()
+        for procedure_id, procedure in procedures.items():
+            encoded = pickle.dumps(procedure, protocol=pickle.HIGHEST_PROTOCOL)
+            offsets[str(procedure_id)] = (len(body), len(encoded))
+            body += encoded
+
+        # The header is encoded as builtin types so the artifact doesn't depend on how this module was imported
+        header = pickle.dumps(
+            asdict(
+                PrecompiledHeader(
+                    library_version=stamp.library_version,
+                    sources_digest=stamp.sources_digest,
+                    source_stats=stamp.source_stats,
+                    release=stamp.release,
+                    offsets=offsets,
+                    summaries={str(k): asdict(v) for k, v in (summaries or {}).items()},
+                    terms={str(k): dict(v) for k, v in (terms or {}).items()},
+                )
+            ),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        return PRECOMPILED_MAGIC + _HEADER_LENGTH.pack(len(header)) + header + body
+
+    def is_current(self, sources_digest: str) -> bool:
+        """True if this artifact was built by this version of the library from YAML matching sources_digest"""
+        from cactus_test_definitions import __version__
+
+        return self.header.library_version == __version__ and self.header.sources_digest == sources_digest
+
+    def __contains__(self, procedure_id: object) -> bool:
+        return procedure_id in self.header.offsets
+
+    def summary(self, procedure_id: str) -> ProcedureSummary | None:
+        """Gets the ProcedureSummary for procedure_id stored in the header (or None if it wasn't stored)"""
+        raw = self.header.summaries.get(procedure_id, None)
+        return None if raw is None else ProcedureSummary(**raw)
+
+    def terms(self, procedure_id: str) -> dict[str, frozenset[str]] | None:
+        """Gets the index terms for procedure_id stored in the header (or None if they weren't stored)"""
+        return self.header.terms.get(procedure_id, None)
+
+    def load(self, procedure_id: str) -> Any:  # noqa: ANN401
+        """Deserialises a new instance of the procedure with the specified id. Raises KeyError if it's not present.
+        Short strings are interned (to match procedures parsed from YAML)"""
+        offset, length = self.header.offsets[procedure_id]
+        return intern_strings(pickle.loads(self._body[offset : offset + length]))  # noqa: S301
+
+    def release(self) -> None:
+        """Releases this catalog's views of the underlying buffer (eg so a shared memory block can be closed). Any
+        subsequent load will raise ValueError"""
+        self._body.release()
+        self.buffer.release()
+
+
+def load_precompiled_catalog(procedures_package: str) -> PrecompiledCatalog | None:
+    """Loads the precompiled artifact shipped with procedures_package. Returns None if the artifact is missing,
+    unreadable or stale (i.e. doesn't match the YAML definitions currently in procedures_package - see
+    SourcesStamp.is_current)"""
+    try:
+        buffer = (resources.files(procedures_package) / PRECOMPILED_RESOURCE).read_bytes()
+        precompiled = PrecompiledCatalog(buffer)
+        if not precompiled.header.stamp.is_current(procedures_package):
+            return None
+    except Exception:
+        return None
+    return precompiled
+
+
+def build_precompiled_artifact(
+    catalog: "TestProcedureCatalog", validate: Callable[[Any, Any], None] | None = None, release: bool = False
+) -> bytes:
+    """Parses (and optionally validates via validate(procedure, procedure_id)) every procedure in catalog from its
+    YAML definition, encoding the results (along with their summaries / index terms) into a precompiled artifact.
+
+    release: If True - the artifact will be considered current for as long as this library version is installed (see
+             SourcesStamp). Only for artifacts built by the package build"""
+    from cactus_test_definitions.index import procedure_terms
+
+    procedures = {}
+    for procedure_id in catalog.procedure_ids:
+        procedure = catalog.parse(catalog.read_yaml(procedure_id))
+        if validate is not None:
+            validate(procedure, procedure_id)
+        procedures[procedure_id] = procedure
+
+    summaries = {procedure_id: summarise_procedure(procedure) for procedure_id, procedure in procedures.items()}
+    terms = {procedure_id: procedure_terms(procedure) for procedure_id, procedure in procedures.items()}
+    stamp = SourcesStamp.of(catalog.procedures_package, release)
+    return PrecompiledCatalog.build(procedures, stamp, summaries, terms)
+
+
+def build_precompiled_catalogs(release: bool = False) -> list[Path]:
+    """Parses and validates every client and server TestProcedure, writing the results into a precompiled artifact
+    alongside the YAML definitions (as well as a bundle of the YAML definitions - see cactus_test_definitions.bundle).
+    Returns the paths of the written artifacts.
+
+    release: If True - the artifacts are being built for a release (see build_precompiled_artifact)"""
+    from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+    from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_procedure
+    from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+    from cactus_test_definitions.server.validate import validate_test_procedure as validate_server_procedure
+
+    written: list[Path] = []
+    for catalog, validate in [(CLIENT_CATALOG, validate_client_procedure), (SERVER_CATALOG, validate_server_procedure)]:
+        artifact = build_precompiled_artifact(catalog, validate, release)
+        artifact_path = Path(str(resources.files(catalog.procedures_package) / PRECOMPILED_RESOURCE))
+        artifact_path.write_bytes(artifact)
+        written.append(artifact_path)
+        written.append(write_procedure_bundle(catalog.procedures_package, catalog.read_all_yaml(), release))
+    return written
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in build_precompiled_catalogs(release="--release" in sys.argv[1:]):
+        print(f"Wrote {path} ({path.stat().st_size} bytes)")
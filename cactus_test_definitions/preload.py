@@ -0,0 +1,54 @@
+import gc
+import time
+from dataclasses import dataclass
+
+from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_test_procedure
+from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+from cactus_test_definitions.server.validate import validate_test_procedure as validate_server_test_procedure
+
+
+@dataclass(frozen=True)
+class PreloadInfo:
+    """Summary of the work undertaken by preload"""
+
+    client_procedures: int  # Number of client TestProcedures loaded (and validated)
+    server_procedures: int  # Number of server TestProcedures loaded (and validated)
+    duration_seconds: float  # Total time taken by preload
+    frozen_objects: int  # Number of objects moved to the permanent generation by gc.freeze (0 if freeze=False)
+
+
+def preload(validate: bool = True, freeze: bool = True, parallel: bool = False) -> PreloadInfo:
+    """Loads every client and server TestProcedure (along with their summaries / indexes) into the default catalogs.
+    Intended to be called in the parent process of a pre-forking server (or worker pool) immediately before forking so
+    that every child shares the loaded procedures (copy on write) instead of each child loading its own copy.
+
+    validate: If True - every procedure is also validated (raising TestProcedureDefinitionError on failure)
+    freeze: If True - gc.freeze() is called after loading so that garbage collections in the forked children don't
+            write to (and thus copy) the pages holding the shared procedures. Children that call gc.unfreeze() will
+            lose this benefit.
+    parallel: Passed through to TestProcedureCatalog.load_all"""
+    start = time.perf_counter()
+    for catalog, validate_test_procedure in [
+        (CLIENT_CATALOG, validate_client_test_procedure),
+        (SERVER_CATALOG, validate_server_test_procedure),
+    ]:
+        catalog.load_all(parallel=parallel)
+        catalog.summaries()
+        catalog.index()
+        if validate:
+            for procedure_id in catalog.procedure_ids:
+                validate_test_procedure(catalog.get(procedure_id), procedure_id)
+
+    frozen_objects = 0
+    if freeze:
+        gc.collect()  # Don't freeze any garbage - it would never be collected
+        gc.freeze()
+        frozen_objects = gc.get_freeze_count()
+
+    return PreloadInfo(
+        client_procedures=len(CLIENT_CATALOG.procedure_ids),
+        server_procedures=len(SERVER_CATALOG.procedure_ids),
+        duration_seconds=time.perf_counter() - start,
+        frozen_objects=frozen_objects,
+    )
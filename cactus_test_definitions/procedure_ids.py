@@ -0,0 +1,30 @@
+"""The kinds of test procedure (client and server) - and the lookup of each kind's modules. Importing this module (or
+calling procedure_ids) doesn't import any of the parsing machinery."""
+
+import importlib
+from enum import StrEnum
+from types import ModuleType
+
+KINDS = ("client", "server")
+
+
+def check_kind(kind: str) -> None:
+    """Raises a ValueError if kind isn't one of KINDS"""
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {KINDS} not '{kind}'")
+
+
+def kind_module(kind: str, name: str) -> ModuleType:
+    """Imports the module name (eg test_procedures or validate) from the package for kind (client or server)"""
+    check_kind(kind)
+    return importlib.import_module(f"cactus_test_definitions.{kind}.{name}")
+
+
+def procedure_ids(kind: str) -> type[StrEnum]:
+    """The TestProcedureId enum for kind (client or server)"""
+    return kind_module(kind, "procedure_ids").TestProcedureId
+
+
+def test_procedures_module(kind: str) -> ModuleType:
+    """The (relatively slow to import) test_procedures module for kind (client or server)"""
+    return kind_module(kind, "test_procedures")
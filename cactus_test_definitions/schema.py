@@ -1,9 +1,11 @@
 import yaml
 
+from cactus_test_definitions.interning import intern_str
 
-class UniqueKeyLoader(yaml.SafeLoader):
+
+class UniqueKeyConstructorMixin:
     """Originally sourced from https://gist.github.com/pypt/94d747fe5180851196eb
-    Prevents duplicate keys from overwriting eachother instead of raising a ValueError.
+    Prevents duplicate keys from overwriting eachother instead of raising a ValueError. Also interns short strings.
 
     eg - consider the following YAML, it will parse OK but should be treated as an error:
 
@@ -15,8 +17,38 @@ class UniqueKeyLoader(yaml.SafeLoader):
     def construct_mapping(self, node: yaml.MappingNode, deep: bool = False) -> dict:
         mapping = set()
         for key_node, _ in node.value:
-            key = self.construct_object(key_node, deep=deep)
+            key = self.construct_object(key_node, deep=deep)  # type: ignore # Provided by the yaml Loader
             if key in mapping:
                 raise ValueError(f"Duplicate {key!r} key found in YAML.")
             mapping.add(key)
-        return super().construct_mapping(node, deep)
+        return super().construct_mapping(node, deep)  # type: ignore # Provided by the yaml Loader
+
+    def construct_yaml_str(self, node: yaml.ScalarNode) -> str:
+        """Short strings (identifiers, types, parameter keys etc) are heavily repeated across definitions so they are
+        interned to save memory (and speed up lookups) - see interning.intern_str"""
+        return intern_str(super().construct_yaml_str(node))  # type: ignore # Provided by the yaml Loader
+
+
+class UniqueKeyLoader(UniqueKeyConstructorMixin, yaml.SafeLoader):
+    """Pure python yaml.SafeLoader that raises a ValueError on duplicate keys"""
+
+    pass
+
+
+UniqueKeyLoader.add_constructor("tag:yaml.org,2002:str", UniqueKeyConstructorMixin.construct_yaml_str)
+
+
+# The fastest available loader that rejects duplicate keys. Prefer this for parsing definitions
+FastUniqueKeyLoader: type[UniqueKeyConstructorMixin]
+
+if yaml.__with_libyaml__:
+
+    class CUniqueKeyLoader(UniqueKeyConstructorMixin, yaml.CSafeLoader):
+        """libyaml accelerated yaml.CSafeLoader that raises a ValueError on duplicate keys"""
+
+        pass
+
+    CUniqueKeyLoader.add_constructor("tag:yaml.org,2002:str", UniqueKeyConstructorMixin.construct_yaml_str)
+    FastUniqueKeyLoader = CUniqueKeyLoader
+else:
+    FastUniqueKeyLoader = UniqueKeyLoader  # PyYAML was installed without the libyaml bindings
@@ -5,6 +5,7 @@ from cactus_test_definitions.errors import TestProcedureDefinitionError
 from cactus_test_definitions.parameters import (
     ParameterSchema,
     ParameterType,
+    SchemaTable,
     validate_parameters,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -35,115 +36,135 @@ class Check:
 
 
 # The parameter schema for each action, keyed by the action name
-CHECK_PARAMETER_SCHEMA: dict[str, dict[str, ParameterSchema]] = {
-    "discovered": {
-        "resources": ParameterSchema(False, ParameterType.ListCSIPAusResource),
-        "links": ParameterSchema(False, ParameterType.ListCSIPAusResource),
-    },
-    "time-synced": {},  # Passes if the current Time resource is synced with this client's date/time
-    "function-set-assignment": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many FSAs to pass
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many FSAs to pass
-        "matches_client_edev": ParameterSchema(
-            False, ParameterType.Boolean
-        ),  # If True - only FSAs assigned to the client's EndDevice will be counted
-        "sub_id": ParameterSchema(
-            False, ParameterType.String
-        ),  # If set - only FSAs received via this subscription will be counted
-    },
-    "end-device-list": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many edev lists to pass
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many edev lists to pass
-        "poll_rate": ParameterSchema(
-            False, ParameterType.Integer
-        ),  # If set - will only count an EndDeviceList with this exact pollRate
-        "sub_id": ParameterSchema(
-            False, ParameterType.String
-        ),  # If set - only EndDeviceLists received via this subscription will be counted
-    },
-    "end-device": {
-        "matches_client": ParameterSchema(
-            True, ParameterType.Boolean
-        ),  # assert the existence / non existence of an EndDevice for the current client
-        "matches_pin": ParameterSchema(
-            False, ParameterType.Boolean
-        ),  # if set - The matches_client criteria will ALSO check the registration PIN for the EndDevice. Default False
-    },
-    "der-program": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many derps to pass
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many derps to pass
-        "primacy": ParameterSchema(False, ParameterType.Integer),  # Filters derps based on this primacy value
-        "fsa_index": ParameterSchema(
-            False, ParameterType.Integer
-        ),  # Filters derps that belong to the nth (0 based) FunctionSetAssignment index
-        "sub_id": ParameterSchema(
-            False, ParameterType.String
-        ),  # Filters derps to only those received via this named subscription
-    },
-    "der-control": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many controls to pass
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many controls to pass
-        "latest": ParameterSchema(False, ParameterType.Boolean),  # forces filter checks against the most recent control
-        "opModImpLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
-        "opModExpLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
-        "opModLoadLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
-        "opModGenLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
-        "opModEnergize": ParameterSchema(False, ParameterType.Boolean),  # Filters controls based on this value
-        "opModConnect": ParameterSchema(False, ParameterType.Boolean),  # Filters controls based on this value
-        "opModFixedW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
-        "rampTms": ParameterSchema(False, ParameterType.Integer),  # Filter on this val. 0 means negative assertion
-        "randomizeStart": ParameterSchema(False, ParameterType.Integer),  # Filter on this val (in seconds)
-        "event_status": ParameterSchema(False, ParameterType.Integer),  # Filter on Event.status value
-        "responseRequired": ParameterSchema(False, ParameterType.Integer),  # Filter on responseRequired value
-        "derp_primacy": ParameterSchema(
-            False, ParameterType.Integer
-        ),  # Filter to control's belonging to a DERProgram with this primacy value
-        "sub_id": ParameterSchema(
-            False, ParameterType.String
-        ),  # Filters control to only those received via this named subscription
-        "duration": ParameterSchema(False, ParameterType.Integer),  # Filter on duration value
-    },  # Matches many DERControls (specified by minimum_count) against additional other filter criteria
-    "default-der-control": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many default der controls
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many default der controls
-        "opModImpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModExpLimW": ParameterSchema(False, ParameterType.Float),
-        "opModGenLimW": ParameterSchema(False, ParameterType.Float),
-        "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
-        "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
-        "sub_id": ParameterSchema(
-            False, ParameterType.String
-        ),  # Filters default control to only those received via this named subscription
-        "derp_primacy": ParameterSchema(
-            False, ParameterType.Integer
-        ),  # Filter to control's belonging to a DERProgram with this primacy value
-    },  # matches any DefaultDERControl with the specified values
-    "mirror-usage-point": {
-        "matches": ParameterSchema(True, ParameterType.Boolean),  # True for positive assert, False for negative assert
-        "check_mup_mrid": ParameterSchema(False, ParameterType.String),
-        "location": ParameterSchema(False, ParameterType.CSIPAusReadingLocation),  # If not specified - match anything
-        "reading_types": ParameterSchema(False, ParameterType.ListCSIPAusReadingType),  # If not specified - match all
-        "mmr_mrids": ParameterSchema(
-            False, ParameterType.ListString
-        ),  # Must correspond 1-1 with reading_types. Used for forcing specific mrid values
-        "post_rate_seconds": ParameterSchema(False, ParameterType.Integer),  # Only asserted if specified
-    },  # True if the matches assertion finds a MirrorUsagePoint with the specified parameters (requires exact match)
-    "subscription": {
-        "matches": ParameterSchema(True, ParameterType.Boolean),  # True for positive assert, False for negative assert
-        "resource": ParameterSchema(True, ParameterType.CSIPAusResource),
-    },  # Matches the existence/nonexistence of a subscription for the specified resource
-    "poll-rate": {
-        "resource": ParameterSchema(True, ParameterType.CSIPAusResource),
-        "poll_rate_seconds": ParameterSchema(True, ParameterType.Integer),
-    },  # Asserts a specific poll rate value
-    "der-control-responses": {
-        "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many matches to pass
-        "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many matches to pass
-        "sent_response_type": ParameterSchema(
-            True, ParameterType.Integer
-        ),  # Filters for DERControls that have sent this response type
-    },  # Counts DERControls in context that have sent the specified ResponseType
-}
+CHECK_PARAMETER_SCHEMA: SchemaTable[str, dict[str, ParameterSchema]] = SchemaTable(
+    {
+        "discovered": {
+            "resources": ParameterSchema(False, ParameterType.ListCSIPAusResource),
+            "links": ParameterSchema(False, ParameterType.ListCSIPAusResource),
+        },
+        "time-synced": {},  # Passes if the current Time resource is synced with this client's date/time
+        "function-set-assignment": {
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many FSAs to pass
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many FSAs to pass
+            "matches_client_edev": ParameterSchema(
+                False, ParameterType.Boolean
+            ),  # If True - only FSAs assigned to the client's EndDevice will be counted
+            "sub_id": ParameterSchema(
+                False, ParameterType.String
+            ),  # If set - only FSAs received via this subscription will be counted
+        },
+        "end-device-list": {
+            "minimum_count": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Needs at least this many edev lists to pass
+            "maximum_count": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Needs at most this many edev lists to pass
+            "poll_rate": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # If set - will only count an EndDeviceList with this exact pollRate
+            "sub_id": ParameterSchema(
+                False, ParameterType.String
+            ),  # If set - only EndDeviceLists received via this subscription will be counted
+        },
+        "end-device": {
+            "matches_client": ParameterSchema(
+                True, ParameterType.Boolean
+            ),  # assert the existence / non existence of an EndDevice for the current client
+            # if set - The matches_client criteria will ALSO check the registration PIN for the EndDevice. Default False
+            "matches_pin": ParameterSchema(False, ParameterType.Boolean),
+        },
+        "der-program": {
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many derps to pass
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many derps to pass
+            "primacy": ParameterSchema(False, ParameterType.Integer),  # Filters derps based on this primacy value
+            "fsa_index": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Filters derps that belong to the nth (0 based) FunctionSetAssignment index
+            "sub_id": ParameterSchema(
+                False, ParameterType.String
+            ),  # Filters derps to only those received via this named subscription
+        },
+        "der-control": {
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many controls to pass
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many controls to pass
+            "latest": ParameterSchema(
+                False, ParameterType.Boolean
+            ),  # forces filter checks against the most recent control
+            "opModImpLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
+            "opModExpLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
+            "opModLoadLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
+            "opModGenLimW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
+            "opModEnergize": ParameterSchema(False, ParameterType.Boolean),  # Filters controls based on this value
+            "opModConnect": ParameterSchema(False, ParameterType.Boolean),  # Filters controls based on this value
+            "opModFixedW": ParameterSchema(False, ParameterType.Float),  # Filters controls based on this value
+            "rampTms": ParameterSchema(False, ParameterType.Integer),  # Filter on this val. 0 means negative assertion
+            "randomizeStart": ParameterSchema(False, ParameterType.Integer),  # Filter on this val (in seconds)
+            "event_status": ParameterSchema(False, ParameterType.Integer),  # Filter on Event.status value
+            "responseRequired": ParameterSchema(False, ParameterType.Integer),  # Filter on responseRequired value
+            "derp_primacy": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Filter to control's belonging to a DERProgram with this primacy value
+            "sub_id": ParameterSchema(
+                False, ParameterType.String
+            ),  # Filters control to only those received via this named subscription
+            "duration": ParameterSchema(False, ParameterType.Integer),  # Filter on duration value
+        },  # Matches many DERControls (specified by minimum_count) against additional other filter criteria
+        "default-der-control": {
+            "minimum_count": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Needs at least this many default der controls
+            "maximum_count": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Needs at most this many default der controls
+            "opModImpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModExpLimW": ParameterSchema(False, ParameterType.Float),
+            "opModGenLimW": ParameterSchema(False, ParameterType.Float),
+            "opModLoadLimW": ParameterSchema(False, ParameterType.Float),
+            "setGradW": ParameterSchema(False, ParameterType.Integer),  # Hundredths of a percent / second
+            "sub_id": ParameterSchema(
+                False, ParameterType.String
+            ),  # Filters default control to only those received via this named subscription
+            "derp_primacy": ParameterSchema(
+                False, ParameterType.Integer
+            ),  # Filter to control's belonging to a DERProgram with this primacy value
+        },  # matches any DefaultDERControl with the specified values
+        # True if the matches assertion finds a MirrorUsagePoint with the specified parameters (requires exact match)
+        "mirror-usage-point": {
+            "matches": ParameterSchema(
+                True, ParameterType.Boolean
+            ),  # True for positive assert, False for negative assert
+            "check_mup_mrid": ParameterSchema(False, ParameterType.String),
+            "location": ParameterSchema(
+                False, ParameterType.CSIPAusReadingLocation
+            ),  # If not specified - match anything
+            "reading_types": ParameterSchema(
+                False, ParameterType.ListCSIPAusReadingType
+            ),  # If not specified - match all
+            "mmr_mrids": ParameterSchema(
+                False, ParameterType.ListString
+            ),  # Must correspond 1-1 with reading_types. Used for forcing specific mrid values
+            "post_rate_seconds": ParameterSchema(False, ParameterType.Integer),  # Only asserted if specified
+        },
+        "subscription": {
+            "matches": ParameterSchema(
+                True, ParameterType.Boolean
+            ),  # True for positive assert, False for negative assert
+            "resource": ParameterSchema(True, ParameterType.CSIPAusResource),
+        },  # Matches the existence/nonexistence of a subscription for the specified resource
+        "poll-rate": {
+            "resource": ParameterSchema(True, ParameterType.CSIPAusResource),
+            "poll_rate_seconds": ParameterSchema(True, ParameterType.Integer),
+        },  # Asserts a specific poll rate value
+        "der-control-responses": {
+            "minimum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at least this many matches to pass
+            "maximum_count": ParameterSchema(False, ParameterType.Integer),  # Needs at most this many matches to pass
+            "sent_response_type": ParameterSchema(
+                True, ParameterType.Integer
+            ),  # Filters for DERControls that have sent this response type
+        },  # Counts DERControls in context that have sent the specified ResponseType
+    }
+)
 VALID_CHECK_NAMES: set[str] = set(CHECK_PARAMETER_SCHEMA.keys())
 
 
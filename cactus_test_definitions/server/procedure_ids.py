@@ -0,0 +1,72 @@
+from enum import StrEnum
+
+
+class TestProcedureId(StrEnum):
+    """The set of all available test ID's
+
+    This should be kept in sync with the current set of test procedures loaded from the procedures directory"""
+
+    __test__ = False  # Prevent pytest from picking up this class
+    S_ALL_01 = "S-ALL-01"
+    S_ALL_02 = "S-ALL-02"
+    S_ALL_03 = "S-ALL-03"
+    S_ALL_04 = "S-ALL-04"
+    S_ALL_05 = "S-ALL-05"
+    S_ALL_06 = "S-ALL-06"
+    S_ALL_07 = "S-ALL-07"
+    S_ALL_08 = "S-ALL-08"
+    S_ALL_09 = "S-ALL-09"
+    S_ALL_10 = "S-ALL-10"
+    S_ALL_11 = "S-ALL-11"
+    S_ALL_12 = "S-ALL-12"
+    S_ALL_13 = "S-ALL-13"
+    S_ALL_14 = "S-ALL-14"
+    S_ALL_15 = "S-ALL-15"
+    S_ALL_16 = "S-ALL-16"
+    S_ALL_17 = "S-ALL-17"
+    S_ALL_18 = "S-ALL-18"
+    S_ALL_19 = "S-ALL-19"
+    S_ALL_20 = "S-ALL-20"
+    S_ALL_21 = "S-ALL-21"
+    S_ALL_22 = "S-ALL-22"
+    S_ALL_23 = "S-ALL-23"
+    S_ALL_24 = "S-ALL-24"
+    S_ALL_25 = "S-ALL-25"
+    S_ALL_26 = "S-ALL-26"
+    S_ALL_27 = "S-ALL-27"
+    S_ALL_28 = "S-ALL-28"
+    S_ALL_29 = "S-ALL-29"
+    S_ALL_30 = "S-ALL-30"
+    S_ALL_31 = "S-ALL-31"
+    S_ALL_32 = "S-ALL-32"
+    S_ALL_33 = "S-ALL-33"
+    S_ALL_34 = "S-ALL-34"
+    S_ALL_35 = "S-ALL-35"
+    S_ALL_36 = "S-ALL-36"
+    S_ALL_37 = "S-ALL-37"
+    S_ALL_38 = "S-ALL-38"
+    S_ALL_39 = "S-ALL-39"
+    S_ALL_40 = "S-ALL-40"
+    S_ALL_41 = "S-ALL-41"
+    S_ALL_42 = "S-ALL-42"
+    S_ALL_43 = "S-ALL-43"
+    S_ALL_44 = "S-ALL-44"
+    S_ALL_45 = "S-ALL-45"
+    S_ALL_46 = "S-ALL-46"
+    S_ALL_47 = "S-ALL-47"
+    S_ALL_48 = "S-ALL-48"
+    S_ALL_49 = "S-ALL-49"
+    S_ALL_50 = "S-ALL-50"
+    S_ALL_51 = "S-ALL-51"
+    S_ALL_52 = "S-ALL-52"
+    S_ALL_53 = "S-ALL-53"
+    # S_ALL_54 = "S-ALL-54" # Removed as per CIRG 2026-05-21
+    S_ALL_55 = "S-ALL-55"
+    S_ALL_56 = "S-ALL-56"
+    S_ALL_57 = "S-ALL-57"
+    S_OPT_01 = "S-OPT-01"
+    S_OPT_02 = "S-OPT-02"
+    S_OPT_03 = "S-OPT-03"
+    S_OPT_04 = "S-OPT-04"
+    S_OPT_05 = "S-OPT-05"
+    # S-OPT-06 DRED
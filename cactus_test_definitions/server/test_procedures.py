@@ -1,86 +1,25 @@
 from dataclasses import dataclass
 from enum import StrEnum
-from importlib import resources
+from typing import TYPE_CHECKING
 
 import yaml
 from dataclass_wizard import LoadMeta, YAMLWizard
 
+from cactus_test_definitions.cache import cached_parse
+from cactus_test_definitions.catalog import LazyProcedureMapping, TestProcedureCatalog
 from cactus_test_definitions.csipaus import CSIPAusVersion
-from cactus_test_definitions.schema import UniqueKeyLoader
+from cactus_test_definitions.decoders import build_decoder
+from cactus_test_definitions.instrumentation import DECODE, SCAN, phase
+from cactus_test_definitions.schema import FastUniqueKeyLoader
 from cactus_test_definitions.server.actions import Action
 from cactus_test_definitions.server.admin_instructions import AdminInstruction
 from cactus_test_definitions.server.checks import Check
+from cactus_test_definitions.server.procedure_ids import TestProcedureId
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-class TestProcedureId(StrEnum):
-    """The set of all available test ID's
-
-    This should be kept in sync with the current set of test procedures loaded from the procedures directory"""
-
-    __test__ = False  # Prevent pytest from picking up this class
-    S_ALL_01 = "S-ALL-01"
-    S_ALL_02 = "S-ALL-02"
-    S_ALL_03 = "S-ALL-03"
-    S_ALL_04 = "S-ALL-04"
-    S_ALL_05 = "S-ALL-05"
-    S_ALL_06 = "S-ALL-06"
-    S_ALL_07 = "S-ALL-07"
-    S_ALL_08 = "S-ALL-08"
-    S_ALL_09 = "S-ALL-09"
-    S_ALL_10 = "S-ALL-10"
-    S_ALL_11 = "S-ALL-11"
-    S_ALL_12 = "S-ALL-12"
-    S_ALL_13 = "S-ALL-13"
-    S_ALL_14 = "S-ALL-14"
-    S_ALL_15 = "S-ALL-15"
-    S_ALL_16 = "S-ALL-16"
-    S_ALL_17 = "S-ALL-17"
-    S_ALL_18 = "S-ALL-18"
-    S_ALL_19 = "S-ALL-19"
-    S_ALL_20 = "S-ALL-20"
-    S_ALL_21 = "S-ALL-21"
-    S_ALL_22 = "S-ALL-22"
-    S_ALL_23 = "S-ALL-23"
-    S_ALL_24 = "S-ALL-24"
-    S_ALL_25 = "S-ALL-25"
-    S_ALL_26 = "S-ALL-26"
-    S_ALL_27 = "S-ALL-27"
-    S_ALL_28 = "S-ALL-28"
-    S_ALL_29 = "S-ALL-29"
-    S_ALL_30 = "S-ALL-30"
-    S_ALL_31 = "S-ALL-31"
-    S_ALL_32 = "S-ALL-32"
-    S_ALL_33 = "S-ALL-33"
-    S_ALL_34 = "S-ALL-34"
-    S_ALL_35 = "S-ALL-35"
-    S_ALL_36 = "S-ALL-36"
-    S_ALL_37 = "S-ALL-37"
-    S_ALL_38 = "S-ALL-38"
-    S_ALL_39 = "S-ALL-39"
-    S_ALL_40 = "S-ALL-40"
-    S_ALL_41 = "S-ALL-41"
-    S_ALL_42 = "S-ALL-42"
-    S_ALL_43 = "S-ALL-43"
-    S_ALL_44 = "S-ALL-44"
-    S_ALL_45 = "S-ALL-45"
-    S_ALL_46 = "S-ALL-46"
-    S_ALL_47 = "S-ALL-47"
-    S_ALL_48 = "S-ALL-48"
-    S_ALL_49 = "S-ALL-49"
-    S_ALL_50 = "S-ALL-50"
-    S_ALL_51 = "S-ALL-51"
-    S_ALL_52 = "S-ALL-52"
-    S_ALL_53 = "S-ALL-53"
-    # S_ALL_54 = "S-ALL-54" # Removed as per CIRG 2026-05-21
-    S_ALL_55 = "S-ALL-55"
-    S_ALL_56 = "S-ALL-56"
-    S_ALL_57 = "S-ALL-57"
-    S_OPT_01 = "S-OPT-01"
-    S_OPT_02 = "S-OPT-02"
-    S_OPT_03 = "S-OPT-03"
-    S_OPT_04 = "S-OPT-04"
-    S_OPT_05 = "S-OPT-05"
-    # S-OPT-06 DRED
+    from cactus_test_definitions.summary import ProcedureSummary  # Only needed for get_procedure_summaries
 
 
 class ClientType(StrEnum):
@@ -146,38 +85,86 @@ class TestProcedure(YAMLWizard):
 
 LoadMeta(raise_on_unknown_json_key=True).bind_to(TestProcedure)
 
+# Specialised equivalent of TestProcedure.from_dict (generated once at import) - see decoders.build_decoder
+decode_test_procedure = build_decoder(TestProcedure)
+
+
+def _parse_test_procedure(yaml_contents: str) -> TestProcedure:
+    """Uncached implementation of parse_test_procedure"""
+    with phase(SCAN):
+        raw = yaml.load(yaml_contents, Loader=FastUniqueKeyLoader)  # type: ignore # noqa: S506 # Loader is a SafeLoader
+    if isinstance(raw, list):
+        raise ValueError("Expected a singleton - not a list")
+
+    with phase(DECODE):
+        return decode_test_procedure(raw)
+
 
 def parse_test_procedure(yaml_contents: str) -> TestProcedure:
     """Given a YAML string - parse a TestProcedure.
 
-    This will ensure the YAML parser will use all the "strict" extensions to reduce the incidence of errors"""
-
-    tp = TestProcedure.from_yaml(
-        yaml_contents,
-        decoder=yaml.load,  # type: ignore
-        Loader=UniqueKeyLoader,
-    )
-    if isinstance(tp, list):
-        raise ValueError("Expected a singleton - not a list")
+    This will ensure the YAML parser will use all the "strict" extensions to reduce the incidence of errors
 
-    return tp
+    If a parse cache has been configured (see cactus_test_definitions.cache) a previous parse of the same YAML will
+    be loaded from the cache instead"""
+    return cached_parse(yaml_contents, TestProcedure, _parse_test_procedure)
 
 
 def get_yaml_contents(test_procedure_id: TestProcedureId) -> str:
     """Finds the YAML contents for the TestProcedure with the specified TestProcedureId"""
-    yaml_resource = resources.files("cactus_test_definitions.server.procedures") / f"{test_procedure_id}.yaml"
-    with resources.as_file(yaml_resource) as yaml_file:
-        with open(yaml_file) as f:
-            yaml_contents = f.read()
-            return yaml_contents
+    return TEST_PROCEDURE_CATALOG.read_yaml(test_procedure_id)
+
+
+def get_procedure_summaries() -> "dict[TestProcedureId, ProcedureSummary]":
+    """Gets the header metadata (description, category, classes, target versions and counts) of every TestProcedure
+    keyed by TestProcedureId. This is significantly cheaper than get_all_test_procedures as no Steps are parsed.
+
+    The returned dict is shared and MUST be treated as read only"""
+    return TEST_PROCEDURE_CATALOG.summaries()
+
+
+def get_all_yaml_contents(bundled: bool = False) -> dict[TestProcedureId, str]:
+    """Finds the YAML contents for every TestProcedure, keyed by TestProcedureId.
+
+    bundled: If True - read everything from the bundled archive of definitions in a single read (if it's available)"""
+    return TEST_PROCEDURE_CATALOG.read_all_yaml(bundled=bundled)
+
+
+def get_test_procedure(test_procedure_id: TestProcedureId, view: bool = False) -> TestProcedure:
+    """Gets the TestProcedure with the nominated ID. The definition is only loaded from disk on the first request, after
+    which the same (shared) instance is returned from TEST_PROCEDURE_CATALOG - it MUST be treated as read only.
+
+    view: If True - returns a copy on write view over the shared instance instead (see cactus_test_definitions.views).
+          The view can be modified without affecting any other caller (and is much cheaper than a deepcopy)"""
+    if view:
+        return TEST_PROCEDURE_CATALOG.view(test_procedure_id)
+    return TEST_PROCEDURE_CATALOG.get(test_procedure_id)
+
+
+def get_all_test_procedures(
+    parallel: bool = False, executor: "Executor | None" = None
+) -> LazyProcedureMapping[TestProcedureId, TestProcedure]:
+    """Gets a read only Mapping of every TestProcedure, keyed by their TestProcedureId. Each TestProcedure is only
+    loaded on first access - use materialize() on the result to load everything into a regular dict.
+
+    If parallel is True (or an executor is specified), every TestProcedure will be eagerly loaded with the YAML parsing
+    spread across multiple processes (see TestProcedureCatalog.load_all)"""
+    if parallel or executor is not None:
+        TEST_PROCEDURE_CATALOG.load_all(parallel=parallel, executor=executor)
+    return LazyProcedureMapping(TEST_PROCEDURE_CATALOG)
+
 
+def _validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
+    """Validates procedures picked up by TEST_PROCEDURE_CATALOG.reload"""
+    from cactus_test_definitions.server.validate import validate_test_procedure  # validate depends on this module
 
-def get_test_procedure(test_procedure_id: TestProcedureId) -> TestProcedure:
-    """Gets the TestProcedure with the nominated ID by loading its definition from disk"""
-    yaml_contents = get_yaml_contents(test_procedure_id)
-    return parse_test_procedure(yaml_contents)
+    validate_test_procedure(test_procedure, test_procedure_id)
 
 
-def get_all_test_procedures() -> dict[TestProcedureId, TestProcedure]:
-    """Gets every TestProcedure, keyed by their TestProcedureId"""
-    return {tp_id: get_test_procedure(tp_id) for tp_id in TestProcedureId}
+# The default catalog of every server TestProcedure - each definition is parsed at most once per process
+TEST_PROCEDURE_CATALOG: TestProcedureCatalog[TestProcedureId, TestProcedure] = TestProcedureCatalog(
+    "cactus_test_definitions.server.procedures",
+    TestProcedureId,
+    parse_test_procedure,
+    validate=_validate_test_procedure,
+)
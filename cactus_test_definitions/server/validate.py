@@ -1,41 +1,88 @@
+from collections.abc import Callable, Iterator
+from functools import partial
+
 from cactus_test_definitions.errors import TestProcedureDefinitionError
-from cactus_test_definitions.server.actions import validate_action_parameters
-from cactus_test_definitions.server.admin_instructions import validate_admin_instruction_parameters
-from cactus_test_definitions.server.checks import validate_check_parameters
+from cactus_test_definitions.instrumentation import VALIDATE, phase, procedure_scope
+from cactus_test_definitions.server.actions import ACTION_PARAMETER_SCHEMA, validate_action_parameters
+from cactus_test_definitions.server.admin_instructions import (
+    ADMIN_INSTRUCTION_PARAMETER_SCHEMA,
+    AdminInstruction,
+    validate_admin_instruction_parameters,
+)
+from cactus_test_definitions.server.checks import CHECK_PARAMETER_SCHEMA, validate_check_parameters
 from cactus_test_definitions.server.test_procedures import (
+    Step,
     TestProcedure,
     TestProcedureId,
 )
+from cactus_test_definitions.validation_cache import ValidationCache, ValidationStamp
+
+# Memoizes the successful results of validate_test_procedure
+VALIDATION_CACHE = ValidationCache(
+    [ACTION_PARAMETER_SCHEMA, CHECK_PARAMETER_SCHEMA, ADMIN_INSTRUCTION_PARAMETER_SCHEMA]
+)
+
+# A single validation of a procedure - (location, validate) where location identifies the validated element (eg
+# steps.DISCOVERY.action) and validate raises TestProcedureDefinitionError on failure
+Validation = tuple[str, Callable[[], None]]
+
 
+def validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> ValidationStamp:
+    """Validates test_procedure (eg action / check / admin instruction parameters and client references).
 
-def validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
-    # Check preconditions
+    Successful validations are memoized (see VALIDATION_CACHE) so revalidating an unchanged procedure is cheap.
+
+    raises TestProcedureDefinitionError on error"""
+    with procedure_scope(test_procedure_id), phase(VALIDATE):
+        return VALIDATION_CACHE.validate(
+            test_procedure, partial(_validate_test_procedure, test_procedure, test_procedure_id)
+        )
+
+
+def _validate_required_clients(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
     if not test_procedure.preconditions.required_clients:
         raise TestProcedureDefinitionError(
             f"{test_procedure_id} has no RequiredClients element. At least 1 entry required"
         )
-    required_clients_by_id = dict((rc.id, rc) for rc in test_procedure.preconditions.required_clients)
+
+
+def _validate_admin_instruction(
+    test_procedure_id: TestProcedureId, step: Step, instruction: AdminInstruction, required_client_ids: set[str]
+) -> None:
+    validate_admin_instruction_parameters(test_procedure_id, step.id, instruction)
+    if instruction.client is not None and instruction.client not in required_client_ids:
+        raise TestProcedureDefinitionError(
+            f"{test_procedure_id}.step[{step.id}].admin_instruction[{instruction.type}] "
+            f"references client '{instruction.client}' that isn't listed in RequiredClients."
+        )
+
+
+def _validate_step_client(test_procedure_id: TestProcedureId, step: Step, required_client_ids: set[str]) -> None:
+    if step.client is not None and step.client not in required_client_ids:
+        raise TestProcedureDefinitionError(
+            f"{test_procedure_id} reference client {step.client} that isn't listed in RequiredClients."
+        )
+
+
+def iter_validations(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> Iterator[Validation]:
+    """Yields every individual (location, validate) that makes up validate_test_procedure (in the order that it
+    applies them) - so that every failure of a procedure can be collected (see cactus_test_definitions.validation)"""
+    yield "preconditions.required_clients", partial(_validate_required_clients, test_procedure, test_procedure_id)
+    required_client_ids = {rc.id for rc in test_procedure.preconditions.required_clients or []}
 
     for step in test_procedure.steps:
-        validate_action_parameters(test_procedure_id, step.id, step.action)
-
-        # Validate step checks
-        if step.checks:
-            for check in step.checks:
-                validate_check_parameters(test_procedure_id, check)
-
-        # Validate admin instructions
-        if step.admin_instructions:
-            for instruction in step.admin_instructions:
-                validate_admin_instruction_parameters(test_procedure_id, step.id, instruction)
-                if instruction.client is not None and instruction.client not in required_clients_by_id:
-                    raise TestProcedureDefinitionError(
-                        f"{test_procedure_id}.step[{step.id}].admin_instruction[{instruction.type}] "
-                        f"references client '{instruction.client}' that isn't listed in RequiredClients."
-                    )
-
-        # Ensure client exists
-        if step.client is not None and step.client not in required_clients_by_id:
-            raise TestProcedureDefinitionError(
-                f"{test_procedure_id} reference client {step.client} that isn't listed in RequiredClients."
+        yield f"steps.{step.id}.action", partial(validate_action_parameters, test_procedure_id, step.id, step.action)
+        for i, check in enumerate(step.checks or []):
+            yield f"steps.{step.id}.checks[{i}]", partial(validate_check_parameters, test_procedure_id, check)
+        for i, instruction in enumerate(step.admin_instructions or []):
+            yield (
+                f"steps.{step.id}.admin_instructions[{i}]",
+                partial(_validate_admin_instruction, test_procedure_id, step, instruction, required_client_ids),
             )
+        yield f"steps.{step.id}.client", partial(_validate_step_client, test_procedure_id, step, required_client_ids)
+
+
+def _validate_test_procedure(test_procedure: TestProcedure, test_procedure_id: TestProcedureId) -> None:
+    """Uncached implementation of validate_test_procedure"""
+    for _, validate in iter_validations(test_procedure, test_procedure_id):
+        validate()
@@ -0,0 +1,135 @@
+import mmap
+import os
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Self
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.precompiled import PrecompiledCatalog, build_precompiled_artifact, load_precompiled_catalog
+
+
+class _UntrackedSharedMemory(SharedMemory):
+    """Attaches to an existing POSIX shared memory block WITHOUT registering it with this process's resource tracker
+    (i.e. SharedMemory(name, track=False) of python 3.13+).
+
+    Registering would have the tracker unlink the block (out from under every other process) when this process exits.
+    Unregistering afterwards isn't an option as spawned children share the tracker of their parent (i.e. it would also
+    unregister the creator's entry)"""
+
+    def __init__(self, name: str) -> None:
+        # Mirrors the attach (create=False) path of SharedMemory.__init__ - minus the resource_tracker.register
+        import _posixshmem
+
+        self._name = "/" + name if self._prepend_leading_slash else name
+        self._fd = _posixshmem.shm_open(self._name, self._flags, mode=self._mode)
+        try:
+            self._size = os.fstat(self._fd).st_size
+            self._mmap = mmap.mmap(self._fd, self._size)
+        except OSError:
+            self.close()
+            raise
+        self._buf = memoryview(self._mmap)
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        return (type(self), (self.name,))
+
+
+class SharedCatalog:
+    """A precompiled artifact (see cactus_test_definitions.precompiled) held in a multiprocessing.shared_memory block.
+
+    One process creates the block (see create) and any number of other processes can then attach to it by name (see
+    attach). Procedures are deserialised directly from the shared block on demand (nothing is copied into each process)
+    so N processes share a single copy of the serialised catalog. Intended for "spawn" based multiprocessing where
+    (unlike fork) nothing is inherited from the parent process.
+
+    Use via TestProcedureCatalog.use_precompiled(shared.precompiled) - or initialise_worker for the default catalogs"""
+
+    def __init__(self, shared_memory: SharedMemory, owner: bool) -> None:
+        self.shared_memory = shared_memory
+        self.owner = owner  # If True - this instance created the block (and is responsible for unlinking it)
+        self.precompiled = PrecompiledCatalog(shared_memory.buf)
+
+    @property
+    def name(self) -> str:
+        """The name that other processes can attach to this block with"""
+        return self.shared_memory.name
+
+    @classmethod
+    def create(cls, catalog: TestProcedureCatalog, name: str | None = None) -> Self:
+        """Writes the precompiled artifact of catalog into a new shared memory block. The artifact shipped with the
+        procedures package is used if it's up to date - otherwise it's built by parsing every YAML definition.
+
+        The creator MUST eventually call unlink (or use this as a context manager) to free the block"""
+        precompiled = load_precompiled_catalog(catalog.procedures_package)
+        artifact = build_precompiled_artifact(catalog) if precompiled is None else precompiled.buffer
+
+        shared_memory = SharedMemory(name=name, create=True, size=len(artifact))
+        shared_memory.buf[: len(artifact)] = artifact
+        return cls(shared_memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> Self:
+        """Attaches to an existing shared memory block (created via create) by name"""
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(name=name, track=False), owner=False)
+        if os.name == "nt":
+            return cls(SharedMemory(name=name), owner=False)  # Windows blocks aren't registered with a resource tracker
+
+        # Prior to 3.13 attaching would register the block with this process's resource tracker
+        return cls(_UntrackedSharedMemory(name), owner=False)
+
+    def close(self) -> None:
+        """Detaches this process from the block. Procedures can no longer be loaded from precompiled (catalogs using it
+        will fall back to parsing YAML)"""
+        self.precompiled.release()
+        self.shared_memory.close()
+
+    def unlink(self) -> None:
+        """Closes and then frees the underlying block. Only the creator should unlink"""
+        self.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.unlink()
+
+
+# SharedCatalog's attached via initialise_worker - retained for the lifetime of the process
+_worker_catalogs: list[SharedCatalog] = []
+
+
+def share_default_catalogs() -> tuple[SharedCatalog, SharedCatalog]:
+    """Creates a SharedCatalog for each of the default client and server catalogs. The names of the results should be
+    passed to initialise_worker in each worker process"""
+    from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+    from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+
+    client = SharedCatalog.create(CLIENT_CATALOG)
+    try:
+        return client, SharedCatalog.create(SERVER_CATALOG)
+    except BaseException:
+        client.unlink()
+        raise
+
+
+def initialise_worker(client_name: str | None, server_name: str | None) -> None:
+    """Attaches the default client and server catalogs to the SharedCatalog's with these names (None will leave that
+    catalog unchanged). Suitable for use as a ProcessPoolExecutor / multiprocessing.Pool initializer eg:
+
+    client, server = share_default_catalogs()
+    with ProcessPoolExecutor(
+        mp_context=get_context("spawn"), initializer=initialise_worker, initargs=(client.name, server.name)
+    ) as executor:
+        ...
+    """
+    from cactus_test_definitions.client.test_procedures import TEST_PROCEDURE_CATALOG as CLIENT_CATALOG
+    from cactus_test_definitions.server.test_procedures import TEST_PROCEDURE_CATALOG as SERVER_CATALOG
+
+    for catalog, name in [(CLIENT_CATALOG, client_name), (SERVER_CATALOG, server_name)]:
+        if name is not None:
+            shared = SharedCatalog.attach(name)
+            _worker_catalogs.append(shared)
+            catalog.use_precompiled(shared.precompiled)
@@ -0,0 +1,164 @@
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import yaml
+
+from cactus_test_definitions.csipaus import CSIPAusVersion
+from cactus_test_definitions.schema import FastUniqueKeyLoader
+
+
+@dataclass(frozen=True)
+class ProcedureSummary:
+    """The header metadata of a single test procedure (plus some cheap counts) - intended for listing / selecting
+    procedures without the expense of parsing every Step"""
+
+    description: str  # TestProcedure.description
+    category: str  # TestProcedure.category
+    classes: tuple[str, ...]  # TestProcedure.classes
+    target_versions: tuple[CSIPAusVersion, ...]  # TestProcedure.target_versions
+    step_count: int  # Number of entries in TestProcedure.steps
+    required_client_count: int | None  # Number of Preconditions.required_clients (None if not applicable / not set)
+
+
+def _skip_node(events: Iterator[yaml.Event], start: yaml.Event) -> None:
+    """Consumes every event belonging to the node that begins with start"""
+    if not isinstance(start, yaml.CollectionStartEvent):
+        return
+
+    depth = 1
+    while depth:
+        event = next(events)
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+
+def _scalar_values(events: Iterator[yaml.Event], start: yaml.Event) -> list[str]:
+    """Reads a scalar (or sequence of scalars) node that begins with start. Any nested collections are skipped"""
+    if isinstance(start, yaml.ScalarEvent):
+        return [start.value]
+    if not isinstance(start, yaml.SequenceStartEvent):
+        _skip_node(events, start)
+        return []
+
+    values: list[str] = []
+    for event in events:
+        if isinstance(event, yaml.SequenceEndEvent):
+            break
+        if isinstance(event, yaml.ScalarEvent):
+            values.append(event.value)
+        else:
+            _skip_node(events, event)
+    return values
+
+
+def _count_children(events: Iterator[yaml.Event], start: yaml.Event) -> int:
+    """Counts the entries in the mapping/sequence node that begins with start (consuming the entire node)"""
+    if not isinstance(start, yaml.CollectionStartEvent):
+        _skip_node(events, start)
+        return 0
+
+    is_mapping = isinstance(start, yaml.MappingStartEvent)
+    count = 0
+    for event in events:
+        if isinstance(event, yaml.CollectionEndEvent):
+            break
+        if is_mapping:
+            _skip_node(events, next(events))  # event is the key - skip the value
+        else:
+            _skip_node(events, event)
+        count += 1
+    return count
+
+
+_SNAKE_CASE_BOUNDARY = re.compile(r"((?!^)(?<!_)[A-Z][a-z]+|(?<=[a-z0-9])[A-Z])")
+_REPEATED_UNDERSCORES = re.compile(r"_{2,}")
+
+
+def _to_snake_case(key: str) -> str:
+    """Equivalent of dataclass_wizard's to_snake_case (which decides the field a YAML key is decoded into) - avoids
+    importing dataclass_wizard (slow) when only summaries are required"""
+    key = key.replace("-", "_").replace(" ", "_")
+    if not key.islower():
+        key = _SNAKE_CASE_BOUNDARY.sub(r"_\1", key).lower()
+    return _REPEATED_UNDERSCORES.sub("_", key)
+
+
+def _read_mapping(events: Iterator[yaml.Event]) -> Iterator[tuple[str, yaml.Event]]:
+    """Yields (normalised key, value start event) for each entry of a mapping node (whose start has been consumed).
+    The consumer MUST consume the value node before requesting the next entry. Keys are normalised to snake_case"""
+    for event in events:
+        if isinstance(event, yaml.MappingEndEvent):
+            return
+        if not isinstance(event, yaml.ScalarEvent):
+            raise ValueError("Only scalar keys are supported.")
+        yield _to_snake_case(event.value).lower(), next(events)
+
+
+def _required_client_count(events: Iterator[yaml.Event], start: yaml.Event) -> int | None:
+    """Reads the number of required_clients from the Preconditions node that begins with start"""
+    if not isinstance(start, yaml.MappingStartEvent):
+        _skip_node(events, start)
+        return None
+
+    required_client_count: int | None = None
+    for key, value in _read_mapping(events):
+        if key == "required_clients":
+            required_client_count = _count_children(events, value)
+        else:
+            _skip_node(events, value)
+    return required_client_count
+
+
+def summarise_procedure_yaml(yaml_contents: str) -> ProcedureSummary:
+    """Generates a ProcedureSummary by scanning the YAML definition of a test procedure. This is significantly cheaper
+    than a full parse as no Python objects are constructed for the steps. Minimal validation is performed - the
+    definition should ALSO be validated by a full parse.
+
+    Raises ValueError if the YAML isn't a mapping or is missing any of the header fields"""
+    events = yaml.parse(yaml_contents, Loader=FastUniqueKeyLoader)  # type: ignore # Loader implements the parser
+    start = next((e for e in events if isinstance(e, yaml.NodeEvent)), None)
+    if not isinstance(start, yaml.MappingStartEvent):
+        raise ValueError("Expected a test procedure mapping")
+
+    header: dict[str, list[str]] = {}
+    step_count = 0
+    required_client_count: int | None = None
+    for key, value in _read_mapping(events):
+        if key in ("description", "category", "classes", "target_versions"):
+            header[key] = _scalar_values(events, value)
+        elif key == "steps":
+            step_count = _count_children(events, value)
+        elif key == "preconditions":
+            required_client_count = _required_client_count(events, value)
+        else:
+            _skip_node(events, value)
+
+    missing = [key for key in ("description", "category", "classes", "target_versions") if key not in header]
+    if missing:
+        raise ValueError(f"Test procedure is missing {missing}")
+
+    return ProcedureSummary(
+        description="".join(header["description"]),
+        category="".join(header["category"]),
+        classes=tuple(header["classes"]),
+        target_versions=tuple(CSIPAusVersion(v) for v in header["target_versions"]),
+        step_count=step_count,
+        required_client_count=required_client_count,
+    )
+
+
+def summarise_procedure(procedure: Any) -> ProcedureSummary:  # noqa: ANN401
+    """Generates a ProcedureSummary from an already parsed (client or server) TestProcedure"""
+    required_clients = getattr(procedure.preconditions, "required_clients", None)
+    return ProcedureSummary(
+        description=procedure.description,
+        category=procedure.category,
+        classes=tuple(procedure.classes),
+        target_versions=tuple(procedure.target_versions),
+        step_count=len(procedure.steps),
+        required_client_count=None if required_clients is None else len(required_clients),
+    )
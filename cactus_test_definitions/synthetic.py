@@ -0,0 +1,163 @@
+"""Generates synthetic (but valid) client and server test procedure YAML of arbitrary size - for measuring how parsing
+and validation scale well beyond the size of any real definition (eg 10k+ steps). See benchmarks.suite"""
+
+from dataclasses import dataclass
+
+from cactus_test_definitions.procedure_ids import check_kind
+
+# Literal used for DateTime parameters that aren't variable expressions
+LITERAL_START = "2025-01-01T00:00:00+00:00"
+
+# Cycled through by the events of client steps
+CLIENT_ENDPOINTS = ("/dcap", "/edev", "/edev/1/der", "/edev/1/fsa", "/mup", "/tm")
+
+
+@dataclass(frozen=True)
+class SyntheticProcedureShape:
+    """The shape of a synthetic procedure"""
+
+    steps: int = 100
+    actions_per_step: int = 2  # Client only (excluding any fan_out actions) - server steps have a single action
+    fan_out: int = 1  # Client only - each step enables the next fan_out steps (and removes itself). 0 for neither
+    expression_density: float = 0.5  # Fraction (0 - 1) of actions / admin instructions using a variable expression
+    admin_instructions_per_step: int = 0  # Server AdminInstructions / client (out of band) step instructions
+
+    def __post_init__(self) -> None:
+        if self.steps < 1:
+            raise ValueError(f"steps must be at least 1 not {self.steps}")
+        if self.actions_per_step < 0 or self.fan_out < 0 or self.admin_instructions_per_step < 0:
+            raise ValueError("actions_per_step, fan_out and admin_instructions_per_step can't be negative")
+        if not 0 <= self.expression_density <= 1:
+            raise ValueError(f"expression_density must be between 0 and 1 not {self.expression_density}")
+
+
+def step_name(index: int) -> str:
+    return f"STEP-{index:06d}"
+
+
+def _uses_expression(index: int, density: float) -> bool:
+    """Deterministically spreads expressions so that (on average) density of indexes use one"""
+    return int((index + 1) * density) > int(index * density)
+
+
+def _header(category: str) -> list[str]:
+    return [
+        f"Description: Synthetic {category} procedure",
+        f"Category: Synthetic {category}",
+        "Classes:",
+        "  - A",
+        "TargetVersions:",
+        "  - v1.2",
+        "  - v1.3",
+    ]
+
+
+def _client_actions(shape: SyntheticProcedureShape, index: int, first_action_index: int) -> list[str]:
+    """The YAML list items for the actions of the client step at index"""
+    lines = []
+    enabled = [step_name(j) for j in range(index + 1, min(index + 1 + shape.fan_out, shape.steps))]
+    if enabled:
+        lines += ["      - type: enable-steps", "        parameters:", "          steps:"]
+        lines += [f"            - {name}" for name in enabled]
+    if shape.fan_out:
+        lines += [
+            "      - type: remove-steps",
+            "        parameters:",
+            "          steps:",
+            f"            - {step_name(index)}",
+        ]
+
+    for action_index in range(first_action_index, first_action_index + shape.actions_per_step):
+        minutes = action_index % 60 + 1
+        start = f"$(now + '{minutes} minutes')" if _uses_expression(action_index, shape.expression_density) else None
+        lines += [
+            "      - type: create-der-control",
+            "        parameters:",
+            f"          start: {start or LITERAL_START}",
+            "          duration_seconds: 300",
+            f"          opModExpLimW: {minutes * 100}",
+        ]
+    return lines
+
+
+def synthetic_client_yaml(shape: SyntheticProcedureShape) -> str:
+    """YAML for a valid client TestProcedure with the specified shape. Each step (triggered by a GET request) runs
+    create-der-control actions and enables the following shape.fan_out steps"""
+    lines = _header("client")
+    lines += [
+        "Criteria:",
+        "  checks:",
+        "    - type: all-steps-complete",
+        "      parameters: {}",
+        "Steps:",
+    ]
+    for i in range(shape.steps):
+        actions = _client_actions(shape, i, i * shape.actions_per_step)
+        lines += [
+            f"  {step_name(i)}:",
+            "    event:",
+            "      type: GET-request-received",
+            "      parameters:",
+            f"        endpoint: {CLIENT_ENDPOINTS[i % len(CLIENT_ENDPOINTS)]}",
+            "    actions:" if actions else "    actions: []",
+            *actions,
+        ]
+        if shape.admin_instructions_per_step:
+            lines += ["    instructions:"]
+            lines += [
+                f"      - Synthetic instruction {n} for {step_name(i)}"
+                for n in range(shape.admin_instructions_per_step)
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_server_yaml(shape: SyntheticProcedureShape) -> str:
+    """YAML for a valid server TestProcedure with the specified shape. Each step waits (after the admin instructions
+    have created DERControls) and then checks the client's EndDevice. Variable expressions are only used by the admin
+    instructions (server step actions have no parameters that suit an expression)"""
+    lines = _header("server")
+    lines += [
+        "Preconditions:",
+        "  required_clients:",
+        "    - id: client",
+        "Steps:",
+    ]
+    for i in range(shape.steps):
+        lines += [f"  - id: {step_name(i)}", "    client: client"]
+        if shape.admin_instructions_per_step:
+            lines += ["    admin_instructions:"]
+        first_instruction_index = i * shape.admin_instructions_per_step
+        for instruction_index in range(
+            first_instruction_index, first_instruction_index + shape.admin_instructions_per_step
+        ):
+            fraction = (instruction_index % 9 + 1) / 10
+            limit = (
+                f"$(setMaxW * {fraction})" if _uses_expression(instruction_index, shape.expression_density) else None
+            )
+            lines += [
+                "      - type: create-der-control",
+                "        parameters:",
+                "          status: scheduled",
+                "          duration_seconds: 60",
+                f"          opModExpLimW: {limit or fraction * 1000}",
+                f"          start_offset_seconds: {instruction_index % 600}",
+            ]
+        lines += [
+            "    action:",
+            "      type: wait",
+            "      parameters:",
+            "        duration_seconds: 1",
+            "    checks:",
+            "      - type: end-device",
+            "        parameters:",
+            "          matches_client: true",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_yaml(kind: str, shape: SyntheticProcedureShape) -> str:
+    """YAML for a valid synthetic procedure of kind (client or server)"""
+    check_kind(kind)
+    if kind == "client":
+        return synthetic_client_yaml(shape)
+    return synthetic_server_yaml(shape)
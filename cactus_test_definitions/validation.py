@@ -0,0 +1,112 @@
+"""Validates entire catalogs of test procedures (optionally in parallel) - collecting every failure into a structured
+ValidationReport rather than raising on the first problem (see client.validate / server.validate)"""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any
+
+from cactus_test_definitions.procedure_ids import check_kind, kind_module, test_procedures_module
+from cactus_test_definitions.procedure_ids import procedure_ids as kind_procedure_ids
+
+# The location of failures raised while loading / parsing a procedure (i.e. before any validation could run)
+PARSE_LOCATION = "parse"
+
+
+@dataclass(frozen=True)
+class ValidationFailure:
+    """A single problem found with a test procedure definition"""
+
+    procedure_id: str
+    location: str  # Where in the procedure the problem was found (eg steps.GET-DER.actions[0]) - see PARSE_LOCATION
+    message: str
+    error_type: str  # The name of the raised exception type (eg TestProcedureDefinitionError)
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """The outcome of validating a set of test procedures (see validate_all)"""
+
+    kind: str  # client or server
+    procedure_ids: tuple[str, ...]  # Every procedure that was validated
+    failures: tuple[ValidationFailure, ...]
+    duration_seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def failed_procedure_ids(self) -> list[str]:
+        """The procedure id's with at least one failure (in validation order)"""
+        return list(dict.fromkeys(f.procedure_id for f in self.failures))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "ok": self.ok,
+            "checked": len(self.procedure_ids),
+            "failed": len(self.failed_procedure_ids()),
+            "duration_seconds": self.duration_seconds,
+            "procedure_ids": list(self.procedure_ids),
+            "failures": [asdict(f) for f in self.failures],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def _failure(procedure_id: str, location: str, exc: Exception) -> ValidationFailure:
+    return ValidationFailure(str(procedure_id), location, str(exc), type(exc).__name__)
+
+
+def validate_procedure(kind: str, procedure_id: str) -> list[ValidationFailure]:
+    """Loads and validates a single procedure - returning every failure found (empty if valid).
+
+    Each of the validations that make up validate_test_procedure (see iter_validations of client.validate /
+    server.validate) is run separately so that a single procedure can report multiple failures (including "procedure
+    level" failures like server steps referencing undefined clients)."""
+    module = test_procedures_module(kind)
+    iter_validations = kind_module(kind, "validate").iter_validations
+
+    try:
+        procedure_id = module.TestProcedureId(procedure_id)
+        procedure = module.get_test_procedure(procedure_id)
+    except Exception as exc:
+        return [_failure(procedure_id, PARSE_LOCATION, exc)]
+
+    failures = []
+    for location, validate in iter_validations(procedure, procedure_id):
+        try:
+            validate()
+        except Exception as exc:
+            failures.append(_failure(procedure_id, location, exc))
+    return failures
+
+
+def validate_all(kind: str, workers: int | None = None, procedure_ids: Iterable[str] | None = None) -> ValidationReport:
+    """Validates every procedure of kind (client or server) - returning a ValidationReport of every failure found
+    (nothing is raised for invalid procedures).
+
+    workers: The number of processes to validate across (None will use os.cpu_count()). 1 validates sequentially in
+             this process.
+    procedure_ids: If specified - only these procedures are validated (defaults to every procedure of kind)"""
+    check_kind(kind)
+    if procedure_ids is None:
+        procedure_ids = kind_procedure_ids(kind)
+    ids = tuple(str(procedure_id) for procedure_id in procedure_ids)
+    workers = min(workers or os.cpu_count() or 1, len(ids))
+
+    start = time.perf_counter()
+    if workers < 2:
+        results = [validate_procedure(kind, procedure_id) for procedure_id in ids]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(ids) // (workers * 4))
+            results = list(executor.map(partial(validate_procedure, kind), ids, chunksize=chunksize))
+
+    failures = tuple(failure for result in results for failure in result)
+    return ValidationReport(kind, ids, failures, time.perf_counter() - start)
@@ -0,0 +1,195 @@
+import hashlib
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from cactus_test_definitions.compact import is_compact
+from cactus_test_definitions.parameters import SchemaTable, schema_generation
+from cactus_test_definitions.views import ProcedureView, materialize
+
+DEFAULT_MAX_FINGERPRINTS = 1024
+
+_COMPACT_TOKEN = 0  # The read_only_token of every compact procedure (they can never be modified)
+_read_only: dict[int, tuple[weakref.ref, int]] = {}  # id() -> (procedure, token) of every mark_read_only procedure
+_read_only_tokens = itertools.count(_COMPACT_TOKEN + 1)
+_read_only_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ValidationStamp:
+    """Records that a procedure passed validation"""
+
+    fingerprint: str  # procedure_fingerprint of the validated procedure
+    schema_version: str  # The schema_version of the schema tables that the procedure was validated against
+
+
+@dataclass(frozen=True)
+class ValidationCacheInfo:
+    hits: int
+    misses: int
+    size: int  # Number of procedure fingerprints currently holding a ValidationStamp
+
+
+def procedure_fingerprint(procedure: Any) -> str:  # noqa: ANN401
+    """A digest of the content of procedure (equal procedures of the same type share a fingerprint)"""
+    if isinstance(procedure, ProcedureView):
+        procedure = materialize(procedure)
+    return hashlib.sha256(repr(procedure).encode()).hexdigest()
+
+
+def mark_read_only(procedure: Any) -> None:  # noqa: ANN401
+    """Declares that procedure won't be modified (eg it's cached by a TestProcedureCatalog) - so every ValidationCache
+    can match it by identity rather than fingerprinting its content. Marking it again issues a new token (invalidating
+    any stamps matched by identity) - eg after an in place modification"""
+    if is_compact(procedure):
+        return  # Always matched by identity
+
+    key = id(procedure)
+
+    def forget(ref: weakref.ref) -> None:
+        with _read_only_lock:
+            if _read_only.get(key, (None,))[0] is ref:
+                del _read_only[key]
+
+    try:
+        ref = weakref.ref(procedure, forget)
+    except TypeError:
+        return  # Can't be weakly referenced (eg slots) - will be fingerprinted instead
+    with _read_only_lock:
+        _read_only[key] = (ref, next(_read_only_tokens))
+
+
+def read_only_token(procedure: Any) -> int | None:  # noqa: ANN401
+    """A token identifying the current (unmodifiable) version of procedure - or None if procedure could be modified
+    (see mark_read_only) and must be fingerprinted"""
+    if is_compact(procedure):
+        return _COMPACT_TOKEN
+    entry = _read_only.get(id(procedure), None)
+    if entry is None or entry[0]() is not procedure:
+        return None
+    return entry[1]
+
+
+def _resolve(procedure: Any) -> Any:  # noqa: ANN401
+    """An unmodified view is validated as the procedure it views"""
+    if isinstance(procedure, ProcedureView) and not procedure.is_modified():
+        return procedure._target
+    return procedure
+
+
+def schema_version(schema_tables: Sequence[SchemaTable]) -> str:
+    """A digest of the current contents of schema_tables"""
+    return hashlib.sha256(repr(list(schema_tables)).encode()).hexdigest()
+
+
+class ValidationCache:
+    """Memoizes successful validations of procedures against a set of schema tables (eg ACTION_PARAMETER_SCHEMA).
+
+    Read only procedures - compact procedures and those cached by a TestProcedureCatalog (see mark_read_only), or
+    unmodified views of them - are matched by identity + read_only_token, so revalidating them is an O(1) lookup. Every
+    other procedure (eg one parsed by the caller, or a modified view) is matched by its procedure_fingerprint (a digest
+    of its content) - which costs O(procedure size) on every call but means a procedure modified since it was validated
+    is revalidated. Any modification of the schema tables invalidates every stamp."""
+
+    def __init__(self, schema_tables: Sequence[SchemaTable], max_fingerprints: int = DEFAULT_MAX_FINGERPRINTS) -> None:
+        self.schema_tables = schema_tables
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._fingerprints: OrderedDict[str, ValidationStamp] = OrderedDict()  # LRU ordered
+        # Stamps of read only procedures keyed by id() - (procedure, read_only_token, stamp). Holds the procedure so its
+        # id can't be reused. LRU ordered
+        self._identity_stamps: OrderedDict[int, tuple[Any, int, ValidationStamp]] = OrderedDict()
+        self._schema_version: tuple[int, str] | None = None  # (schema_generation, schema_version) when calculated
+        self._hits = 0
+        self._misses = 0
+
+    def schema_version(self) -> str:
+        """The schema_version of schema_tables (only recalculated after the tables are modified)"""
+        generation = schema_generation()
+        cached = self._schema_version
+        if cached is None or cached[0] != generation:
+            cached = (generation, schema_version(self.schema_tables))
+            self._schema_version = cached
+        return cached[1]
+
+    def _identity_stamp(self, procedure: Any, token: int, version: str) -> ValidationStamp | None:  # noqa: ANN401
+        entry = self._identity_stamps.get(id(procedure), None)
+        if entry is None or entry[0] is not procedure or entry[1] != token or entry[2].schema_version != version:
+            return None
+        return entry[2]
+
+    def _fingerprint_stamp(self, fingerprint: str, version: str) -> ValidationStamp | None:
+        stamp = self._fingerprints.get(fingerprint, None)
+        if stamp is None or stamp.schema_version != version:
+            return None
+        return stamp
+
+    def stamp(self, procedure: Any) -> ValidationStamp | None:  # noqa: ANN401
+        """The ValidationStamp of procedure (in its current state) - or None if it hasn't been validated against the
+        current schema tables"""
+        version = self.schema_version()
+        procedure = _resolve(procedure)
+        token = read_only_token(procedure)
+        if token is not None:
+            stamp = self._identity_stamp(procedure, token, version)
+            if stamp is not None:
+                return stamp
+        return self._fingerprint_stamp(procedure_fingerprint(procedure), version)
+
+    def validate(self, procedure: Any, validate: Callable[[], None]) -> ValidationStamp:  # noqa: ANN401
+        """Returns the ValidationStamp of procedure - running validate (which should raise if procedure is invalid)
+        only if procedure (in its current state) hasn't already passed validation against the current schema tables"""
+        version = self.schema_version()
+        procedure = _resolve(procedure)
+        token = read_only_token(procedure)
+        if token is not None:
+            with self._lock:
+                stamp = self._identity_stamp(procedure, token, version)
+                if stamp is not None:
+                    self._hits += 1
+                    self._identity_stamps.move_to_end(id(procedure))
+                    return stamp
+
+        fingerprint = procedure_fingerprint(procedure)
+        with self._lock:
+            stamp = self._fingerprint_stamp(fingerprint, version)
+            if stamp is not None:
+                self._hits += 1
+                self._record(fingerprint, stamp, procedure, token)
+                return stamp
+            self._misses += 1
+
+        validate()  # Failures aren't cached - they will be revalidated every time
+
+        stamp = ValidationStamp(fingerprint, version)
+        with self._lock:
+            self._record(fingerprint, stamp, procedure, token)
+        return stamp
+
+    def _record(self, fingerprint: str, stamp: ValidationStamp, procedure: Any, token: int | None) -> None:  # noqa: ANN401
+        """Records stamp against fingerprint (and procedure if it's read only - token isn't None). Must be called with
+        _lock held"""
+        self._fingerprints[fingerprint] = stamp
+        self._fingerprints.move_to_end(fingerprint)
+        while len(self._fingerprints) > self.max_fingerprints:
+            self._fingerprints.popitem(last=False)
+
+        if token is not None:
+            self._identity_stamps[id(procedure)] = (procedure, token, stamp)
+            self._identity_stamps.move_to_end(id(procedure))
+            while len(self._identity_stamps) > self.max_fingerprints:
+                self._identity_stamps.popitem(last=False)
+
+    def cache_info(self) -> ValidationCacheInfo:
+        return ValidationCacheInfo(self._hits, self._misses, len(self._fingerprints))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fingerprints.clear()
+            self._identity_stamps.clear()
+            self._hits = 0
+            self._misses = 0
@@ -8,6 +8,7 @@ from re import match, search
 from typing import Any
 
 from cactus_test_definitions.errors import UnparseableVariableExpressionError
+from cactus_test_definitions.instrumentation import EXPRESSIONS, instrumented
 
 ConstantType = timedelta | int | float
 
@@ -366,6 +367,7 @@ def parse_binary_expression(lhs_token: Token, operation: Token, rhs_token: Token
     return Expression(operation=operation_type, lhs_operand=lhs, rhs_operand=rhs)
 
 
+@instrumented(EXPRESSIONS)
 def parse_variable_expression_body(var_body: str, param_key: str | None) -> NamedVariable | Expression | Constant:
     """Given a variable definition: $(now - '5 seconds') - this function should be passed contents of that variable
     definition (the string within the parentheses) eg: "now - '5 seconds'
@@ -0,0 +1,147 @@
+import dataclasses
+import threading
+from typing import Any
+
+from cactus_test_definitions.variable_expressions import BaseExpression
+
+
+class ProcedureView:
+    """Copy on write view over a (shared, read only) dataclass instance - typically a cached TestProcedure.
+
+    Reading a field returns the underlying value - except that dataclass values are wrapped in their own view and
+    lists / tuples / dicts are replaced with a shallow copy (as a list / dict) whose dataclass items are wrapped in
+    views. This happens lazily (on first read of each field) and the result is retained in a per view overlay, so only
+    the parts of the tree that are actually accessed are ever copied. Writing a field only updates the overlay.
+
+    The net result is that a view can be mutated like the original object model (eg updating Action.parameters or
+    removing steps) without ever affecting the underlying instance.
+
+    Views report the class of the underlying instance via __class__ (so isinstance checks and dataclass equality
+    continue to work) and pickle / deepcopy as a plain (non view) copy - see materialize"""
+
+    __slots__ = ("_target", "_overlay")
+
+    def __init__(self, target: Any) -> None:  # noqa: ANN401
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_overlay", {})
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:  # type: ignore[override]
+        return type(self._target)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        # Only called for attributes NOT found via the normal lookup (i.e. the fields / methods of the underlying class)
+        overlay = self._overlay
+        if name in overlay:
+            return overlay[name]
+
+        if name not in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            # Methods / properties are bound to this view (rather than the target) so they see any writes to the view
+            cls = type(self._target)
+            attr = getattr(cls, name, None)
+            if hasattr(attr, "__get__"):
+                return attr.__get__(self, cls)  # type: ignore[union-attr]
+
+        value = getattr(self._target, name)
+        if name in self.__dataclass_fields__ and (viewed := view(value)) is not value:  # type: ignore[attr-defined]
+            value = overlay.setdefault(name, viewed)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        if name not in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            raise AttributeError(f"{type(self._target).__name__} has no field {name!r}")
+        self._overlay[name] = value
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Fields of {type(self._target).__name__} can't be deleted")
+
+    def _field_values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__dataclass_fields__)  # type: ignore[attr-defined]
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._field_values() == tuple(getattr(other, name) for name in self.__dataclass_fields__)  # type: ignore
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__dataclass_fields__)  # type: ignore
+        return f"{type(self._target).__qualname__}View({fields})"
+
+    def __reduce_ex__(self, protocol: Any) -> Any:  # noqa: ANN401
+        return materialize(self).__reduce_ex__(protocol)
+
+    def is_modified(self) -> bool:
+        """True if any field of this view (or any view / copy nested beneath it) no longer refers to the same value as
+        the underlying instance"""
+        target = self._target
+        return not all(_is_unmodified_copy(value, getattr(target, name)) for name, value in self._overlay.items())
+
+
+def _is_unmodified_copy(value: Any, original: Any) -> bool:  # noqa: ANN401
+    """True if value is the (unmodified) copy that view(original) would have produced"""
+    if isinstance(value, ProcedureView):
+        return value._target is original and not value.is_modified()
+    if isinstance(value, list) and isinstance(original, list | tuple):
+        if len(value) != len(original):
+            return False
+        return all(_is_unmodified_copy(v, o) for v, o in zip(value, original, strict=True))
+    if isinstance(value, dict) and isinstance(original, dict):
+        if value.keys() != original.keys():
+            return False
+        return all(_is_unmodified_copy(v, original[k]) for k, v in value.items())
+    return value is original
+
+
+_view_classes: dict[type, type[ProcedureView]] = {}
+_view_classes_lock = threading.Lock()
+
+
+def view_class(cls: type) -> type[ProcedureView]:
+    """Gets the ProcedureView subclass for viewing instances of the dataclass cls. These share the __dataclass_fields__
+    of cls (so dataclasses.fields / asdict work on views). Generated on first request and then shared"""
+    v_cls = _view_classes.get(cls, None)
+    if v_cls is not None:
+        return v_cls
+
+    with _view_classes_lock:
+        v_cls = _view_classes.get(cls, None)
+        if v_cls is None:
+            v_cls = type(
+                f"{cls.__name__}View",
+                (ProcedureView,),
+                {"__slots__": (), "__dataclass_fields__": cls.__dataclass_fields__, "__module__": __name__},
+            )
+            _view_classes[cls] = v_cls
+        return v_cls
+
+
+def view(value: Any) -> Any:  # noqa: ANN401
+    """Creates a copy on write view of value (see ProcedureView). Lists / tuples and dicts are shallow copied (to a list
+    / dict) with any dataclasses wrapped in views. Variable expressions (and any other values) are returned unchanged"""
+    if isinstance(value, list | tuple):
+        return [view(item) for item in value]
+    if isinstance(value, dict):
+        return {key: view(item) for key, item in value.items()}
+    if isinstance(value, ProcedureView | BaseExpression | type) or not dataclasses.is_dataclass(value):
+        return value
+    return view_class(type(value))(value)
+
+
+def materialize(value: Any) -> Any:  # noqa: ANN401
+    """Converts a view (or a list / dict of views) into a standalone copy of the underlying object model with every
+    change applied. Nothing in the result is shared with the viewed instance (other than variable expressions)"""
+    if isinstance(value, list | tuple):
+        return [materialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, ProcedureView):
+        materialized = object.__new__(value.__class__)
+        for name in value.__dataclass_fields__:  # type: ignore[attr-defined]
+            # Bypasses __init__ / __post_init__ (the values have already been validated) and any frozen=True
+            object.__setattr__(materialized, name, materialize(getattr(value, name)))
+        return materialized
+    if isinstance(value, BaseExpression | type) or not dataclasses.is_dataclass(value):
+        return value
+    return materialize(view(value))
@@ -0,0 +1,82 @@
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any, Self
+
+from cactus_test_definitions.catalog import ReloadResult, TestProcedureCatalog
+
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+
+
+class CatalogWatcher:
+    """Polls the YAML definitions of catalogs for changes (on a background thread) - reloading each catalog (see
+    TestProcedureCatalog.reload) so edited definitions are picked up without a restart. Eg:
+
+    with CatalogWatcher([CLIENT_CATALOG, SERVER_CATALOG], on_reload=print):
+        ...  # New sessions use catalog.snapshot() - running sessions keep the snapshot they started with
+    """
+
+    def __init__(
+        self,
+        catalogs: Sequence[TestProcedureCatalog],
+        interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        on_reload: Callable[[TestProcedureCatalog, ReloadResult], Any] | None = None,
+        on_error: Callable[[TestProcedureCatalog, Exception], Any] | None = None,
+    ) -> None:
+        """catalogs: The catalogs to watch
+        interval_seconds: The delay between polls
+        on_reload: Called (from the watcher thread) after any reload that changed / failed to change something
+        on_error: Called (from the watcher thread) if reloading raises. Polling continues regardless"""
+        self.catalogs = catalogs
+        self.interval_seconds = interval_seconds
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _reload(self, catalog: TestProcedureCatalog) -> ReloadResult:
+        result = catalog.reload()
+        if self.on_reload is not None and (result.changed or result.failed):
+            self.on_reload(catalog, result)
+        return result
+
+    def poll(self) -> list[ReloadResult]:
+        """Reloads every catalog once (on the calling thread) - returning the result for each catalog"""
+        return [self._reload(catalog) for catalog in self.catalogs]
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            for catalog in self.catalogs:
+                try:
+                    self._reload(catalog)
+                except Exception as exc:
+                    if self.on_error is not None:
+                        self.on_error(catalog, exc)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> Self:
+        """Takes a snapshot of each catalog (so subsequent changes can be detected) and then starts polling"""
+        if self.running:
+            raise RuntimeError("CatalogWatcher is already running")
+        for catalog in self.catalogs:
+            catalog.snapshot()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="CatalogWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops polling - waiting (up to timeout seconds) for any in progress reload to finish"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
@@ -10,6 +10,7 @@ from cactus_test_definitions.client.test_procedures import (
     TestProcedure,
     TestProcedureId,
     get_all_test_procedures,
+    get_test_procedure,
     parse_test_procedure,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -44,11 +45,19 @@ def test_TestProcedureId_synchronised():
 def test_available_tests_populated():
     """Force test procedures to load and ensure they all validate (and we at least have a few)"""
 
-    all_tps = get_all_test_procedures()
+    all_tps = get_all_test_procedures().materialize()
     assert_dict_type(TestProcedureId, TestProcedure, all_tps, count=len(TestProcedureId))
     assert all_tps[TestProcedureId.ALL_01] != all_tps[TestProcedureId.ALL_02], "Sanity check on uniqueness"
 
 
+def test_get_test_procedure_shared():
+    """Repeated requests for the same TestProcedure should be served from the catalog cache"""
+    tp = get_test_procedure(TestProcedureId.ALL_01)
+    assert isinstance(tp, TestProcedure)
+    assert get_test_procedure(TestProcedureId.ALL_01) is tp
+    assert get_test_procedure(TestProcedureId.ALL_02) is not tp
+
+
 def test_error_on_duplicate_key():
     """Force test procedures to load and ensure they all validate (and we at least have a few)"""
 
@@ -0,0 +1,125 @@
+import importlib
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions import __version__
+from cactus_test_definitions.bundle import (
+    BUNDLE_RESOURCE,
+    build_procedure_bundle,
+    read_procedure_bundle,
+    write_procedure_bundle,
+)
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client.test_procedures import (
+    TestProcedureId,
+    get_all_yaml_contents,
+    get_yaml_contents,
+    parse_test_procedure,
+)
+
+
+@pytest.fixture
+def bundle_package(tmp_path, monkeypatch) -> str:
+    """Creates an (empty) importable package for holding a bundle - returns the package name"""
+    package_dir = tmp_path / "bundle_test_procedures"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "bundle_test_procedures", raising=False)  # Don't reuse another test's package
+    importlib.invalidate_caches()
+    return "bundle_test_procedures"
+
+
+def test_build_procedure_bundle_deterministic():
+    yaml_contents = {"B-01": "description: b\n", "A-01": "description: ü\n"}
+    assert build_procedure_bundle(yaml_contents) == build_procedure_bundle(dict(reversed(yaml_contents.items())))
+
+
+def test_read_procedure_bundle_roundtrip(bundle_package):
+    assert read_procedure_bundle(bundle_package) is None, "No bundle exists yet"
+
+    yaml_contents = {"A-01": "description: ü\n", "B-01": "description: b\n"}
+    bundle_path = write_procedure_bundle(bundle_package, yaml_contents)
+    assert bundle_path.name == BUNDLE_RESOURCE
+    assert read_procedure_bundle(bundle_package) == yaml_contents
+
+
+def test_read_procedure_bundle_invalid(bundle_package, monkeypatch):
+    write_procedure_bundle(bundle_package, {"A-01": "description: a\n"})
+    monkeypatch.setattr("cactus_test_definitions.__version__", __version__ + ".other")
+    assert read_procedure_bundle(bundle_package) is None, "Built by another version"
+
+
+def test_read_procedure_bundle_stale(bundle_package, tmp_path):
+    write_procedure_bundle(bundle_package, {})
+    assert read_procedure_bundle(bundle_package) == {}
+
+    (tmp_path / bundle_package / "A-01.yaml").write_text("description: a\n")
+    assert read_procedure_bundle(bundle_package) is None, "Definitions added since the bundle was built"
+
+    write_procedure_bundle(bundle_package, {"A-01": "description: a\n"})
+    assert read_procedure_bundle(bundle_package) == {"A-01": "description: a\n"}
+
+    (tmp_path / bundle_package / "A-01.yaml").write_text("description: edited\n")
+    assert read_procedure_bundle(bundle_package) is None, "Definition edited since the bundle was built"
+
+
+def test_read_procedure_bundle_unread_sources(bundle_package, tmp_path, monkeypatch):
+    """Unchanged definitions should be detected from their size / mtime - without reading them"""
+    monkeypatch.setattr("cactus_test_definitions.precompiled._RACY_SOURCE_NS", 0)  # eg library sources just checked out
+    yaml_path = tmp_path / bundle_package / "A-01.yaml"
+    yaml_path.write_text("description: a\n")
+    os.utime(yaml_path, ns=(0, time.time_ns() - 60_000_000_000))
+    write_procedure_bundle(bundle_package, {"A-01": "description: a\n"})
+
+    monkeypatch.setattr("cactus_test_definitions.precompiled.sources_digest", Mock(side_effect=AssertionError))
+    assert read_procedure_bundle(bundle_package) == {"A-01": "description: a\n"}
+
+
+def test_read_procedure_bundle_release(bundle_package, tmp_path):
+    write_procedure_bundle(bundle_package, {}, release=True)
+    (tmp_path / bundle_package / "A-01.yaml").write_text("description: a\n")
+    assert read_procedure_bundle(bundle_package) == {}, "Release bundles are current for the installed version"
+
+
+def test_read_procedure_bundle_export(bundle_package, tmp_path):
+    """Bundles not built from the procedures package (eg cactus-defs export) are never current"""
+    (tmp_path / bundle_package / BUNDLE_RESOURCE).write_bytes(build_procedure_bundle({}))
+    assert read_procedure_bundle(bundle_package) is None
+
+
+def test_read_procedure_bundle_corrupt(bundle_package, tmp_path):
+    (tmp_path / bundle_package / BUNDLE_RESOURCE).write_bytes(b"not a zip file")
+    assert read_procedure_bundle(bundle_package) is None
+
+
+def test_get_all_yaml_contents():
+    all_yaml = get_all_yaml_contents()
+    assert list(all_yaml.keys()) == list(TestProcedureId)
+    assert all_yaml[TestProcedureId.ALL_01] == get_yaml_contents(TestProcedureId.ALL_01)
+
+    # Whether or not a bundle has been built - the results should be identical
+    assert get_all_yaml_contents(bundled=True) == all_yaml
+
+
+def test_TestProcedureCatalog_read_all_yaml_bundled(bundle_package):
+    """The bundle is used in preference to individual files (which don't exist in this package)"""
+    write_procedure_bundle(bundle_package, {tp_id: get_yaml_contents(tp_id) for tp_id in TestProcedureId})
+    catalog = TestProcedureCatalog(bundle_package, TestProcedureId, parse_test_procedure)
+
+    assert catalog.read_all_yaml(bundled=True) == get_all_yaml_contents()
+    with pytest.raises(FileNotFoundError):
+        catalog.read_all_yaml(bundled=False)
+
+
+def test_TestProcedureCatalog_read_all_yaml_incomplete_bundle(bundle_package):
+    """A bundle missing some procedures shouldn't be used"""
+    write_procedure_bundle(bundle_package, {TestProcedureId.ALL_01: get_yaml_contents(TestProcedureId.ALL_01)})
+    catalog = TestProcedureCatalog(bundle_package, TestProcedureId, parse_test_procedure)
+
+    with pytest.raises(FileNotFoundError):
+        catalog.read_all_yaml(bundled=True)
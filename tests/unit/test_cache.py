@@ -0,0 +1,190 @@
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cactus_test_definitions import cache as cache_module
+from cactus_test_definitions.cache import (
+    PARSE_CACHE_DIR_ENV,
+    PARSE_CACHE_DISABLE_ENV,
+    ParseCache,
+    cached_parse,
+    configure_parse_cache,
+    get_parse_cache,
+    reset_parse_cache_configuration,
+)
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client.test_procedures import TestProcedure, TestProcedureId, get_yaml_contents
+
+
+@pytest.fixture(autouse=True)
+def clean_cache_configuration(monkeypatch):
+    monkeypatch.delenv(PARSE_CACHE_DIR_ENV, raising=False)
+    monkeypatch.delenv(PARSE_CACHE_DISABLE_ENV, raising=False)
+    reset_parse_cache_configuration()
+    yield
+    reset_parse_cache_configuration()
+
+
+def test_ParseCache_key():
+    cache = ParseCache("/does/not/matter")
+    key = cache.key("abc", "ns1")
+    assert key == cache.key("abc", "ns1")
+    assert key != cache.key("abd", "ns1")
+    assert key != cache.key("abc", "ns2")
+
+
+def test_ParseCache_roundtrip(tmp_path):
+    cache = ParseCache(tmp_path / "new_dir")
+    assert cache.get("my-key") is None
+
+    cache.put("my-key", {"a": [1, 2, 3]})
+    assert cache.get("my-key") == {"a": [1, 2, 3]}
+    assert cache.get("other-key") is None
+    assert [p.name for p, _ in cache.entries()] == ["my-key.pickle"]
+
+    cache.put("my-key", "replaced")
+    assert cache.get("my-key") == "replaced"
+
+    cache.clear()
+    assert cache.get("my-key") is None
+    assert cache.entries() == []
+
+
+def test_ParseCache_corrupt_entry(tmp_path):
+    cache = ParseCache(tmp_path)
+    (tmp_path / "my-key.pickle").write_bytes(b"not a pickle")
+    assert cache.get("my-key") is None
+    assert cache.entries() == [], "Corrupt entries should be removed"
+
+
+def test_ParseCache_new_directory_private(tmp_path):
+    cache = ParseCache(tmp_path / "new_dir")
+    cache.put("my-key", "value")
+    assert (tmp_path / "new_dir").stat().st_mode & 0o077 == 0
+    assert (tmp_path / "new_dir" / "my-key.pickle").stat().st_mode & 0o077 == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid"), reason="Ownership checks require POSIX")
+@pytest.mark.parametrize("writable", ["directory", "entry"])
+def test_ParseCache_writable_by_others(tmp_path, writable: str):
+    cache = ParseCache(tmp_path / "cache_dir")
+    cache.put("my-key", "value")
+    path = cache.directory if writable == "directory" else cache.directory / "my-key.pickle"
+
+    for mode in [0o020, 0o002]:  # Group / other writable
+        path.chmod(path.stat().st_mode | mode)
+        assert cache.get("my-key") is None
+        path.chmod(path.stat().st_mode & ~mode)
+        assert cache.get("my-key") == "value"
+    assert [p.name for p, _ in cache.entries()] == ["my-key.pickle"], "Entry belongs to someone else - don't remove"
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid"), reason="Ownership checks require POSIX")
+def test_ParseCache_owned_by_other_user(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    cache.put("my-key", "value")
+    monkeypatch.setattr(os, "geteuid", lambda: (tmp_path / "my-key.pickle").stat().st_uid + 1)
+    assert cache.get("my-key") is None
+
+
+def test_ParseCache_lru_eviction(tmp_path):
+    value = "x" * 1000
+    entry_size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ParseCache(tmp_path, max_bytes=entry_size * 3)
+
+    for i, key in enumerate(["k1", "k2", "k3"]):
+        cache.put(key, value)
+        os.utime(tmp_path / f"{key}.pickle", ns=(i * 1_000_000_000, i * 1_000_000_000))  # k1 is oldest
+
+    # Reading k1 should make it the most recently used - so k2 is evicted instead
+    assert cache.get("k1") == value
+    cache.put("k4", value)
+    assert [p.name for p, _ in cache.entries()] == ["k3.pickle", "k1.pickle", "k4.pickle"]
+    assert cache.get("k2") is None
+
+
+def test_ParseCache_concurrent_writers(tmp_path):
+    cache = ParseCache(tmp_path)
+
+    def write(i: int):
+        cache.put("shared-key", [i] * 100)
+        return cache.get("shared-key")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(write, range(32)))
+
+    assert all(r is not None and len(r) == 100 for r in results), "Readers should never see a partial write"
+    assert [p.name for p in tmp_path.iterdir()] == ["shared-key.pickle"], "No temporary files left behind"
+
+
+def test_get_parse_cache_configuration(tmp_path, monkeypatch):
+    assert get_parse_cache() is None, "Disabled by default"
+
+    monkeypatch.setenv(PARSE_CACHE_DIR_ENV, str(tmp_path / "env"))
+    assert get_parse_cache().directory == tmp_path / "env"
+
+    configure_parse_cache(tmp_path / "arg")
+    assert get_parse_cache().directory == tmp_path / "arg", "Argument overrides environment"
+
+    monkeypatch.setenv(PARSE_CACHE_DISABLE_ENV, "1")
+    assert get_parse_cache() is None
+    monkeypatch.delenv(PARSE_CACHE_DISABLE_ENV)
+
+    configure_parse_cache(None)
+    assert get_parse_cache() is None
+
+    reset_parse_cache_configuration()
+    assert get_parse_cache().directory == tmp_path / "env"
+
+
+def test_cached_parse(tmp_path):
+    configure_parse_cache(tmp_path)
+    calls = []
+
+    def parse(contents: str) -> str:
+        calls.append(contents)
+        return contents.upper()
+
+    assert cached_parse("abc", str, parse) == "ABC"
+    assert cached_parse("abc", str, parse) == "ABC"
+    assert cached_parse("def", str, parse) == "DEF"
+    assert calls == ["abc", "def"]
+
+    with pytest.raises(ValueError):
+        cached_parse("bad", str, lambda c: int(c))
+    assert len(get_parse_cache().entries()) == 2, "Failures aren't cached"
+
+
+def test_parse_test_procedure_cached(tmp_path, monkeypatch):
+    yaml_contents = get_yaml_contents(TestProcedureId.ALL_01)
+    expected = client_test_procedures.parse_test_procedure(yaml_contents)
+    assert not tmp_path.exists() or not any(tmp_path.iterdir()), "Cache isn't enabled yet"
+
+    configure_parse_cache(tmp_path)
+    assert client_test_procedures.parse_test_procedure(yaml_contents) == expected
+    assert len(get_parse_cache().entries()) == 1
+
+    def raise_on_decode(raw):
+        raise AssertionError("Should have been loaded from the cache")
+
+    monkeypatch.setattr(client_test_procedures, "decode_test_procedure", raise_on_decode)
+    tp = client_test_procedures.parse_test_procedure(yaml_contents)
+    assert isinstance(tp, TestProcedure)
+    assert tp == expected
+
+    # Cache shouldn't be used if disabled
+    monkeypatch.setenv(PARSE_CACHE_DISABLE_ENV, "true")
+    with pytest.raises(AssertionError):
+        client_test_procedures.parse_test_procedure(yaml_contents)
+
+
+def test_cached_parse_unwritable(tmp_path, monkeypatch):
+    configure_parse_cache(tmp_path)
+
+    def raise_os_error(*args, **kwargs):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(cache_module.ParseCache, "put", raise_os_error)
+    assert cached_parse("abc", str, lambda c: c.upper()) == "ABC"
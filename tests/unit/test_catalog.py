@@ -0,0 +1,353 @@
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions.catalog import (
+    MIN_PARALLEL_LOAD_COUNT,
+    CatalogCacheInfo,
+    CatalogSnapshot,
+    LazyProcedureMapping,
+    ReloadResult,
+    TestProcedureCatalog,
+)
+from cactus_test_definitions.client.test_procedures import TestProcedureId, parse_test_procedure
+from cactus_test_definitions.client.validate import validate_test_procedure
+from cactus_test_definitions.server.test_procedures import TestProcedureId as ServerTestProcedureId
+from cactus_test_definitions.server.test_procedures import parse_test_procedure as parse_server_test_procedure
+from cactus_test_definitions.watch import CatalogWatcher
+
+
+class NoSubmitExecutor(Executor):
+    def submit(self, *args, **kwargs):
+        raise AssertionError("Work should not have been submitted to this executor")
+
+
+class CountingParser:
+    """Wraps parse_test_procedure - recording how many times it was called"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, yaml_contents: str):
+        self.count += 1
+        return parse_test_procedure(yaml_contents)
+
+
+@pytest.fixture
+def catalog_and_parser() -> tuple[TestProcedureCatalog, CountingParser]:
+    parser = CountingParser()
+    catalog = TestProcedureCatalog("cactus_test_definitions.client.procedures", TestProcedureId, parser)
+    catalog.use_precompiled(None)  # Ensure every load goes via parser
+    return catalog, parser
+
+
+def test_TestProcedureCatalog_get_memoized(catalog_and_parser):
+    catalog, parser = catalog_and_parser
+    assert catalog.cache_info() == CatalogCacheInfo(hits=0, misses=0, size=0)
+
+    tp1 = catalog.get(TestProcedureId.ALL_01)
+    assert catalog.cache_info() == CatalogCacheInfo(hits=0, misses=1, size=1)
+
+    assert catalog.get(TestProcedureId.ALL_01) is tp1
+    assert catalog.get(TestProcedureId.ALL_01) is tp1
+    assert catalog.cache_info() == CatalogCacheInfo(hits=2, misses=1, size=1)
+
+    tp2 = catalog.get(TestProcedureId.ALL_02)
+    assert tp2 is not tp1
+    assert catalog.cache_info() == CatalogCacheInfo(hits=2, misses=2, size=2)
+    assert parser.count == 2
+
+    catalog.clear()
+    assert catalog.cache_info() == CatalogCacheInfo(hits=0, misses=0, size=0)
+    assert catalog.get(TestProcedureId.ALL_01) is not tp1
+    assert parser.count == 3
+
+
+def test_TestProcedureCatalog_get_concurrent(catalog_and_parser):
+    """Many threads requesting the same procedure simultaneously should only result in a single parse"""
+    catalog, parser = catalog_and_parser
+    thread_count = 8
+    barrier = Barrier(thread_count)
+
+    def fetch(_: int):
+        barrier.wait()
+        return catalog.get(TestProcedureId.GEN_10)
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        results = list(executor.map(fetch, range(thread_count)))
+
+    assert parser.count == 1
+    assert all(r is results[0] for r in results)
+    assert catalog.cache_info() == CatalogCacheInfo(hits=thread_count - 1, misses=1, size=1)
+
+
+def test_LazyProcedureMapping(catalog_and_parser):
+    catalog, parser = catalog_and_parser
+    mapping = LazyProcedureMapping(catalog)
+
+    # Nothing here should trigger a parse
+    assert len(mapping) == len(TestProcedureId)
+    assert list(mapping) == list(TestProcedureId)
+    assert TestProcedureId.ALL_01 in mapping
+    assert "ALL-01" in mapping
+    assert "ALL-999" not in mapping
+    assert parser.count == 0
+
+    tp = mapping[TestProcedureId.ALL_01]
+    assert parser.count == 1
+    assert mapping["ALL-01"] is tp
+    assert mapping.get(TestProcedureId.ALL_01) is tp
+    assert parser.count == 1
+
+    with pytest.raises(KeyError):
+        mapping["ALL-999"]
+    assert mapping.get("ALL-999") is None
+
+    with pytest.raises(TypeError):
+        mapping[TestProcedureId.ALL_01] = tp  # Read only
+
+    everything = mapping.materialize()
+    assert isinstance(everything, dict)
+    assert list(everything.keys()) == list(TestProcedureId)
+    assert everything[TestProcedureId.ALL_01] is tp
+    assert parser.count == len(TestProcedureId)
+
+
+def test_TestProcedureCatalog_load_all_sequential(catalog_and_parser):
+    catalog, parser = catalog_and_parser
+    catalog.load_all()
+    assert parser.count == len(TestProcedureId)
+    assert catalog.cache_info() == CatalogCacheInfo(hits=0, misses=len(TestProcedureId), size=len(TestProcedureId))
+
+    # Everything is cached - there should be no more parsing
+    catalog.load_all(executor=NoSubmitExecutor())
+    assert parser.count == len(TestProcedureId)
+
+
+def test_TestProcedureCatalog_load_all_executor(catalog_and_parser):
+    catalog, parser = catalog_and_parser
+    existing = catalog.get(TestProcedureId.ALL_01)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        catalog.load_all(executor=executor)
+
+    assert parser.count == len(TestProcedureId)
+    assert catalog.cache_info().size == len(TestProcedureId)
+    assert catalog.get(TestProcedureId.ALL_01) is existing, "Already cached procedures should not be replaced"
+
+
+def test_TestProcedureCatalog_load_all_too_small_for_parallel(catalog_and_parser):
+    """When there is only a handful of procedures left to load - don't bother with the executor"""
+    catalog, parser = catalog_and_parser
+    for tp_id in list(TestProcedureId)[: len(TestProcedureId) - MIN_PARALLEL_LOAD_COUNT + 1]:
+        catalog.get(tp_id)
+
+    catalog.load_all(executor=NoSubmitExecutor())
+    assert catalog.cache_info().size == len(TestProcedureId)
+
+
+def test_TestProcedureCatalog_load_all_parallel():
+    """Parsing in other processes should produce identical results to parsing locally"""
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.server.procedures", ServerTestProcedureId, parse_server_test_procedure
+    )
+    catalog.use_precompiled(None)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        catalog.load_all(executor=executor)
+    assert catalog.cache_info().size == len(ServerTestProcedureId)
+
+    for tp_id in ServerTestProcedureId:
+        assert catalog.get(tp_id) == parse_server_test_procedure(catalog.read_yaml(tp_id))
+
+
+@pytest.fixture
+def editable_catalog(tmp_path, monkeypatch) -> tuple[TestProcedureCatalog, Path]:
+    """A catalog over a (writable) copy of the client procedures package - returns (catalog, procedures_dir)"""
+    package = f"editable_procedures_{uuid.uuid4().hex}"
+    procedures_dir = tmp_path / package
+    shutil.copytree(Path("cactus_test_definitions/client/procedures"), procedures_dir)
+    (procedures_dir / "__init__.py").touch()
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    catalog = TestProcedureCatalog(package, TestProcedureId, parse_test_procedure, validate=validate_test_procedure)
+    catalog.use_precompiled(None)
+    return catalog, procedures_dir
+
+
+def edit_yaml(procedures_dir: Path, procedure_id: str, old: str, new: str) -> None:
+    """Replaces old with new in the YAML definition (ensuring the mtime changes)"""
+    path = procedures_dir / f"{procedure_id}.yaml"
+    stat = path.stat()
+    contents = path.read_text()
+    assert old in contents
+    path.write_text(contents.replace(old, new))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_TestProcedureCatalog_snapshot(editable_catalog):
+    catalog, _ = editable_catalog
+    snapshot = catalog.snapshot()
+    assert isinstance(snapshot, CatalogSnapshot)
+    assert snapshot.version == 1
+    assert catalog.snapshot() is snapshot
+    assert list(snapshot) == list(TestProcedureId)
+    assert len(snapshot) == len(TestProcedureId)
+    assert TestProcedureId.ALL_01 in snapshot and "not-a-procedure" not in snapshot
+    for tp_id in TestProcedureId:
+        assert snapshot[tp_id] is catalog.get(tp_id)
+
+    with pytest.raises(TypeError):
+        snapshot[TestProcedureId.ALL_01] = None  # type: ignore
+
+    catalog.clear()
+    assert catalog.snapshot() is not snapshot
+
+
+def test_TestProcedureCatalog_reload_unchanged(editable_catalog):
+    catalog, procedures_dir = editable_catalog
+    snapshot = catalog.snapshot()
+
+    assert catalog.reload() == ReloadResult(snapshot.version, tuple(), {})
+    os.utime(procedures_dir / "ALL-01.yaml")  # Touched - but the contents are unchanged
+    assert catalog.reload() == ReloadResult(snapshot.version, tuple(), {})
+    assert catalog.snapshot() is snapshot
+
+
+def test_TestProcedureCatalog_reload_changed(editable_catalog):
+    catalog, procedures_dir = editable_catalog
+    old_snapshot = catalog.snapshot()
+    old_summary = catalog.summaries()[TestProcedureId.ALL_01]
+
+    edit_yaml(procedures_dir, "ALL-01", "Description: Discovery", "Description: Edited Discovery")
+    result = catalog.reload()
+    assert result.changed == (TestProcedureId.ALL_01,)
+    assert not result.failed
+
+    new_snapshot = catalog.snapshot()
+    assert new_snapshot is not old_snapshot
+    assert new_snapshot.version == result.version == old_snapshot.version + 1
+    assert new_snapshot[TestProcedureId.ALL_01].description.startswith("Edited Discovery")
+    assert catalog.get(TestProcedureId.ALL_01) is new_snapshot[TestProcedureId.ALL_01]
+    assert catalog.summaries()[TestProcedureId.ALL_01].description.startswith("Edited Discovery")
+
+    # Existing snapshots (eg running sessions) are unaffected
+    assert old_snapshot[TestProcedureId.ALL_01].description.startswith("Discovery")
+    assert old_summary.description.startswith("Discovery")
+
+    # Unchanged procedures are shared between versions
+    assert new_snapshot[TestProcedureId.ALL_02] is old_snapshot[TestProcedureId.ALL_02]
+
+    assert catalog.reload().changed == tuple()
+
+
+def test_TestProcedureCatalog_reload_changed_rechecks_precompiled(editable_catalog, monkeypatch):
+    catalog, procedures_dir = editable_catalog
+    catalog.snapshot()
+    load_precompiled = Mock(return_value=None)
+    monkeypatch.setattr("cactus_test_definitions.precompiled.load_precompiled_catalog", load_precompiled)
+
+    assert catalog.reload().changed == tuple()
+    catalog.load(TestProcedureId.ALL_02)
+    load_precompiled.assert_not_called()
+
+    edit_yaml(procedures_dir, "ALL-01", "Description: Discovery", "Description: Edited Discovery")
+    assert catalog.reload().changed == (TestProcedureId.ALL_01,)
+    catalog.load(TestProcedureId.ALL_02)
+    load_precompiled.assert_called_once_with(catalog.procedures_package)
+
+
+def test_TestProcedureCatalog_reload_before_snapshot(editable_catalog):
+    catalog, _ = editable_catalog
+    result = catalog.reload()
+    assert result == ReloadResult(1, tuple(), {})
+    assert catalog.cache_info().size == len(TestProcedureId)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("Description: Discovery", "Description: [Discovery"),  # Invalid YAML
+        ("Description: Discovery", "Unknown: value\nDescription: Discovery"),  # Invalid model
+        ("type: ", "type: not-a-valid-"),  # Fails validation
+    ],
+)
+def test_TestProcedureCatalog_reload_failure(editable_catalog, old: str, new: str):
+    catalog, procedures_dir = editable_catalog
+    snapshot = catalog.snapshot()
+    original = snapshot[TestProcedureId.ALL_01]
+
+    edit_yaml(procedures_dir, "ALL-01", old, new)
+    result = catalog.reload()
+    assert result.changed == tuple()
+    assert list(result.failed) == [TestProcedureId.ALL_01]
+    assert catalog.snapshot() is snapshot
+    assert catalog.get(TestProcedureId.ALL_01) is original
+
+    # Failures are retried until fixed
+    assert list(catalog.reload().failed) == [TestProcedureId.ALL_01]
+    edit_yaml(procedures_dir, "ALL-01", new, old)
+    assert catalog.reload() == ReloadResult(snapshot.version, tuple(), {})  # Back to the original definition
+
+
+def test_catalog_watcher_poll(editable_catalog):
+    catalog, procedures_dir = editable_catalog
+    on_reload = Mock()
+    watcher = CatalogWatcher([catalog], on_reload=on_reload)
+
+    assert watcher.poll() == [ReloadResult(1, tuple(), {})]
+    on_reload.assert_not_called()
+
+    edit_yaml(procedures_dir, "ALL-01", "Description: Discovery", "Description: Edited Discovery")
+    assert watcher.poll() == [ReloadResult(2, (TestProcedureId.ALL_01,), {})]
+    on_reload.assert_called_once_with(catalog, ReloadResult(2, (TestProcedureId.ALL_01,), {}))
+
+
+def test_catalog_watcher_background(editable_catalog):
+    catalog, procedures_dir = editable_catalog
+    reloaded = threading.Event()
+    results = []
+
+    def on_reload(reloaded_catalog, result):
+        results.append(result)
+        reloaded.set()
+
+    with CatalogWatcher([catalog], interval_seconds=0.01, on_reload=on_reload) as watcher:
+        assert watcher.running
+        snapshot = catalog.snapshot()  # Taken by start()
+        assert snapshot.version == 1
+
+        edit_yaml(procedures_dir, "ALL-01", "Description: Discovery", "Description: Edited Discovery")
+        assert reloaded.wait(timeout=30)
+
+        with pytest.raises(RuntimeError):
+            watcher.start()
+
+    assert not watcher.running
+    assert results == [ReloadResult(2, (TestProcedureId.ALL_01,), {})]
+    assert catalog.snapshot().version == 2
+    assert snapshot[TestProcedureId.ALL_01].description.startswith("Discovery")
+
+
+def test_catalog_watcher_error():
+    catalog = Mock()
+    catalog.reload.side_effect = OSError("my-error")
+    errored = threading.Event()
+    on_error = Mock(side_effect=lambda *args: errored.set())
+
+    watcher = CatalogWatcher([catalog], interval_seconds=0.01, on_error=on_error).start()
+    try:
+        assert errored.wait(timeout=30)
+        assert watcher.running, "Polling should continue after an error"
+    finally:
+        watcher.stop()
+
+    assert on_error.call_args.args[0] is catalog
+    assert isinstance(on_error.call_args.args[1], OSError)
@@ -0,0 +1,125 @@
+import io
+import json
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from cactus_test_definitions.cli import find_procedure, main
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+
+def test_find_procedure():
+    assert find_procedure("ALL-01") == ("client", client_test_procedures.TestProcedureId.ALL_01)
+    assert find_procedure("S-ALL-01") == ("server", server_test_procedures.TestProcedureId.S_ALL_01)
+    assert find_procedure("S-ALL-01", ["client"]) is None
+    assert find_procedure("not-a-procedure") is None
+
+
+def test_list(capsys):
+    assert main(["list", "--json"]) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert [r["id"] for r in rows] == list(client_test_procedures.TestProcedureId) + list(
+        server_test_procedures.TestProcedureId
+    )
+    assert {r["kind"] for r in rows} == {"client", "server"}
+
+    assert main(["list", "--kind", "server", "--classes", "A", "--target-version", "v1.2"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    expected = [
+        tp_id
+        for tp_id, s in server_test_procedures.get_procedure_summaries().items()
+        if "A" in s.classes and "v1.2" in s.target_versions
+    ]
+    assert lines and [line.split()[0] for line in lines] == expected
+
+
+def test_list_does_not_parse():
+    """list should be answerable from the metadata alone (i.e. the procedure model is never imported)"""
+    code = (
+        "import sys; from cactus_test_definitions.cli import main; main(['list']); "
+        "assert 'dataclass_wizard' not in sys.modules, 'procedure model was imported'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, timeout=60)
+
+
+def test_show(capsys):
+    assert main(["show", "ALL-01"]) == 0
+    assert capsys.readouterr().out == client_test_procedures.get_yaml_contents(
+        client_test_procedures.TestProcedureId.ALL_01
+    )
+
+    assert main(["show", "S-ALL-01", "--json"]) == 0
+    shown = json.loads(capsys.readouterr().out)
+    procedure = server_test_procedures.get_test_procedure(server_test_procedures.TestProcedureId.S_ALL_01)
+    assert shown["description"] == procedure.description
+    assert len(shown["steps"]) == len(procedure.steps)
+
+    assert main(["show", "not-a-procedure"]) == 2
+    assert "not-a-procedure" in capsys.readouterr().err
+
+
+def test_validate(capsys, monkeypatch):
+    assert main(["validate", "--kind", "server"]) == 0
+    assert capsys.readouterr().out.strip() == f"{len(server_test_procedures.TestProcedureId)}/61 procedures valid"
+
+    assert main(["validate", "-v", "ALL-01", "S-ALL-02"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["OK   ALL-01", "OK   S-ALL-02", "2/2 procedures valid"]
+
+    def raise_error():
+        raise ValueError("my-error")
+
+    def iter_validations(test_procedure, test_procedure_id):
+        yield "my-location", raise_error
+
+    monkeypatch.setattr("cactus_test_definitions.client.validate.iter_validations", iter_validations)
+    assert main(["validate", "ALL-01", "S-ALL-02"]) == 1
+    assert capsys.readouterr().out.splitlines() == ["FAIL ALL-01 [my-location]: my-error", "1/2 procedures valid"]
+
+    assert main(["validate", "--json", "--workers", "2", "ALL-01"]) == 1
+    reports = json.loads(capsys.readouterr().out)
+    assert [(r["kind"], r["checked"], r["failed"]) for r in reports] == [("client", 1, 1)]
+
+    assert main(["validate", "ALL-01", "not-a-procedure"]) == 2
+
+
+@pytest.mark.parametrize("kind", ["client", "server"])
+def test_export_json(tmp_path, kind: str):
+    output = tmp_path / "export.json"
+    assert main(["export", "--kind", kind, "-o", str(output)]) == 0
+    exported = json.loads(output.read_text())
+    module = client_test_procedures if kind == "client" else server_test_procedures
+    assert list(exported.keys()) == [kind]
+    assert list(exported[kind].keys()) == list(module.TestProcedureId)
+
+
+def test_export_zip(capsysbinary):
+    assert main(["export", "--format", "zip"]) == 0
+    with zipfile.ZipFile(io.BytesIO(capsysbinary.readouterr().out)) as bundle:
+        names = bundle.namelist()
+    assert len(names) == len(client_test_procedures.TestProcedureId) + len(server_test_procedures.TestProcedureId)
+    assert "ALL-01.yaml" in names
+
+
+def test_bench(capsys):
+    assert main(["bench", "--kind", "server", "--repeat", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "scan summaries" in out
+    assert "parse" in out
+
+
+def test_memory(capsys):
+    assert main(["memory", "GEN-10", "S-ALL-01", "--top", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "GEN-10" in out
+    assert "S-ALL-01" not in out  # Only the top 1 is listed
+    assert "retained by 2 procedures" in out
+
+    assert main(["memory", "S-ALL-01", "--kind", "server", "--compact", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["compact"] is True
+    assert [f["procedure_id"] for f in report["footprints"]] == ["S-ALL-01"]
+
+    assert main(["memory", "S-ALL-01", "--kind", "client"]) == 2
@@ -0,0 +1,240 @@
+import dataclasses
+import math
+import pickle
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_test_procedure
+from cactus_test_definitions.compact import HashConsInfo, HashConsPool, ReadOnlyDict, compact, compact_class
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.server.validate import validate_test_procedure as validate_server_test_procedure
+from cactus_test_definitions.variable_expressions import BaseExpression, Constant
+
+
+def assert_compact_equivalent(original, compacted, shared: bool = True):
+    """Recursively asserts that compacted is the compact equivalent of original. If shared - leaf values (and
+    expressions) must be the same instances"""
+    if isinstance(original, list):
+        assert isinstance(compacted, tuple)
+        assert len(original) == len(compacted)
+        for o, c in zip(original, compacted, strict=True):
+            assert_compact_equivalent(o, c, shared)
+    elif isinstance(original, dict):
+        assert isinstance(compacted, ReadOnlyDict)
+        assert list(original.keys()) == list(compacted.keys())
+        for key, o in original.items():
+            assert_compact_equivalent(o, compacted[key], shared)
+    elif isinstance(original, BaseExpression):
+        assert (compacted is original) if shared else (compacted == original), "Expressions should be unchanged"
+    elif dataclasses.is_dataclass(original):
+        assert type(compacted) is compact_class(type(original))
+        assert not hasattr(compacted, "__dict__")
+        for field in dataclasses.fields(original):
+            assert_compact_equivalent(getattr(original, field.name), getattr(compacted, field.name), shared)
+    else:
+        assert (compacted is original) if shared else (compacted == original)
+
+
+@pytest.mark.parametrize(
+    "module, tp_id",
+    [
+        pytest.param(client_test_procedures, tp_id, id=f"client-{tp_id}")
+        for tp_id in client_test_procedures.TestProcedureId
+    ]
+    + [
+        pytest.param(server_test_procedures, tp_id, id=f"server-{tp_id}")
+        for tp_id in server_test_procedures.TestProcedureId
+    ],
+)
+def test_compact_procedure(module, tp_id):
+    original = module.get_test_procedure(tp_id)
+    compacted = compact(original)
+    assert_compact_equivalent(original, compacted)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        compacted.description = "changed"
+
+
+def test_compact_class():
+    cls = compact_class(client_test_procedures.Step)
+    assert cls is compact_class(client_test_procedures.Step), "Should be shared"
+    assert cls.__name__ == "Step"
+    assert [f.name for f in dataclasses.fields(cls)] == [
+        f.name for f in dataclasses.fields(client_test_procedures.Step)
+    ]
+    assert "__slots__" in cls.__dict__
+
+
+def test_ReadOnlyDict():
+    d = ReadOnlyDict({"a": 1, "b": [2]})
+    assert isinstance(d, dict)
+    assert d == {"a": 1, "b": [2]}
+    assert d | {"c": 3} == {"a": 1, "b": [2], "c": 3}
+
+    for modify in [
+        lambda: d.__setitem__("a", 2),
+        lambda: d.__delitem__("a"),
+        lambda: d.update({"a": 2}),
+        lambda: d.pop("a"),
+        lambda: d.popitem(),
+        lambda: d.setdefault("c", 3),
+        lambda: d.clear(),
+    ]:
+        with pytest.raises(TypeError):
+            modify()
+
+    with pytest.raises(TypeError):
+        d |= {"c": 3}
+    assert d == {"a": 1, "b": [2]}
+
+    roundtrip = pickle.loads(pickle.dumps(d))
+    assert isinstance(roundtrip, ReadOnlyDict)
+    assert roundtrip == d
+
+
+def test_TestProcedureCatalog_compact():
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.server.procedures",
+        server_test_procedures.TestProcedureId,
+        server_test_procedures.parse_test_procedure,
+        compact=True,
+    )
+    tp = catalog.get(server_test_procedures.TestProcedureId.S_ALL_01)
+    assert type(tp) is compact_class(server_test_procedures.TestProcedure)
+    assert catalog.get(server_test_procedures.TestProcedureId.S_ALL_01) is tp
+    assert_compact_equivalent(
+        server_test_procedures.get_test_procedure(server_test_procedures.TestProcedureId.S_ALL_01), tp, shared=False
+    )
+
+
+@dataclasses.dataclass
+class MyNode:
+    name: str
+    values: list
+    parameters: dict
+
+
+def test_compact_HashConsPool():
+    pool = HashConsPool()
+    expression = Constant(1)
+    n1 = compact(MyNode("a", [1, "b", expression], {"k": [True]}), pool)
+    n2 = compact(MyNode("a", [1, "b", expression], {"k": [True]}), pool)
+    n3 = compact(MyNode("a", [1, "b", expression], {"k": [1]}), pool)  # True == 1 but shouldn't be treated as equal
+    n4 = compact(MyNode("a", [1, "b", Constant(1)], {"k": [True]}), pool)  # Expressions aren't deduplicated
+
+    assert n1 is n2
+    assert n3 is not n1
+    assert n3.parameters["k"][0] is 1  # noqa: F632
+    assert n3.values is n1.values
+    assert n4 is not n1
+    assert n4.parameters is n1.parameters
+    assert n1.values[2] is expression
+
+    # n2 is entirely deduplicated (4 nodes: tuple, list, dict and the node), n3 shares values, n4 shares parameters
+    assert pool.info() == HashConsInfo(nodes=16, deduplicated=7, unique=pool.info().unique)
+
+
+def test_HashConsPool_share_leaf():
+    pool = HashConsPool()
+    assert pool.share_leaf(0.0) is pool.share_leaf(float("0"))
+    assert math.copysign(1.0, pool.share_leaf(-0.0)) == -1.0, "-0.0 == 0.0 but shouldn't be treated as equal"
+    assert pool.share_leaf(1.5) is pool.share_leaf(float("1.5"))
+    assert pool.share_leaf(1) is not pool.share_leaf(1.0)
+
+    nan = float("nan")
+    assert pool.share_leaf(nan) is nan
+    assert pool.share_leaf(-nan) is not nan
+
+    utc = datetime(2025, 1, 1, 10, tzinfo=UTC)
+    aest = datetime(2025, 1, 1, 20, tzinfo=timezone(timedelta(hours=10)))
+    assert utc == aest
+    assert pool.share_leaf(utc) is utc
+    assert pool.share_leaf(aest) is aest, "Equal instants in different time zones shouldn't be merged"
+    assert pool.share_leaf(datetime(2025, 1, 1, 10, tzinfo=UTC)) is utc
+
+    unhashable = [1]
+    assert pool.share_leaf(unhashable) is unhashable
+
+
+@pytest.mark.parametrize("module", [client_test_procedures, server_test_procedures])
+def test_compact_pool_equivalent(module):
+    pool = HashConsPool()
+    for tp_id in module.TestProcedureId:
+        original = module.get_test_procedure(tp_id)
+        assert_compact_equivalent(original, compact(original, pool), shared=False)
+    assert pool.info().deduplicated > 0
+
+
+def test_TestProcedureCatalog_compact_hash_consing():
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.client.procedures",
+        client_test_procedures.TestProcedureId,
+        client_test_procedures.parse_test_procedure,
+        compact=True,
+    )
+    catalog.use_precompiled(None)
+    tp1 = catalog.get(client_test_procedures.TestProcedureId.ALL_01)
+    tp2 = catalog.get(client_test_procedures.TestProcedureId.ALL_02)
+    assert tp1.target_versions is tp2.target_versions
+    assert catalog.hash_cons_info().deduplicated > 0
+
+    catalog.load_all()
+    info = catalog.hash_cons_info()
+    assert info.nodes > info.deduplicated > 0
+    assert catalog._pool is None, "Pool should be released once everything is loaded"
+
+    catalog.clear()
+    assert catalog.hash_cons_info() == HashConsInfo(nodes=0, deduplicated=0, unique=0)
+
+
+def test_TestProcedureCatalog_not_compact_hash_cons_info():
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.client.procedures",
+        client_test_procedures.TestProcedureId,
+        client_test_procedures.parse_test_procedure,
+    )
+    assert catalog.hash_cons_info() is None
+
+
+@pytest.mark.parametrize(
+    "module, validate_test_procedure",
+    [
+        (client_test_procedures, validate_client_test_procedure),
+        (server_test_procedures, validate_server_test_procedure),
+    ],
+)
+def test_TestProcedureCatalog_compact_validate(module, validate_test_procedure):
+    catalog = TestProcedureCatalog(
+        module.TEST_PROCEDURE_CATALOG.procedures_package,
+        module.TestProcedureId,
+        module.parse_test_procedure,
+        compact=True,
+    )
+    for tp_id in module.TestProcedureId:
+        validate_test_procedure(catalog.get(tp_id), tp_id)
+
+
+@pytest.mark.parametrize(
+    "module, criteria",
+    [
+        (client_test_procedures, {"uses_action": "create-der-control"}),
+        (client_test_procedures, {"uses_check": "all-steps-complete"}),
+        (client_test_procedures, {"uses_event": "POST-request-received"}),
+        (server_test_procedures, {"uses_action": "discovery", "uses_check": "discovered"}),
+        (server_test_procedures, {"client_type": "aggregator"}),
+    ],
+)
+def test_TestProcedureCatalog_compact_find(module, criteria: dict):
+    catalog = TestProcedureCatalog(
+        module.TEST_PROCEDURE_CATALOG.procedures_package,
+        module.TestProcedureId,
+        module.parse_test_procedure,
+        compact=True,
+    )
+    catalog.use_precompiled(None)  # Index the compact procedures (rather than precompiled terms)
+    expected = module.TEST_PROCEDURE_CATALOG.find(**criteria)
+    assert expected, "Query should match at least 1 procedure - otherwise this test proves nothing"
+    assert catalog.find(**criteria) == expected
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import pytest
+import yaml
+from dataclass_wizard import LoadMeta, YAMLWizard, fromdict
+from dataclass_wizard.errors import MissingData, MissingFields, ParseError, UnknownKeysError
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.decoders import build_decoder, resolve_field_name
+from cactus_test_definitions.schema import UniqueKeyLoader
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+
+class MyEnum(StrEnum):
+    A = "a"
+    B = "b"
+
+
+@dataclass
+class Inner:
+    name: str
+    enabled: bool = False
+
+
+@dataclass
+class Outer(YAMLWizard):
+    title: str
+    my_enum: MyEnum
+    inners: list[Inner]
+    lookup: dict[str, Any]
+    optional_inner: Inner | None = None
+    optional_list: list[MyEnum] | None = None
+
+
+LoadMeta(raise_on_unknown_json_key=True).bind_to(Outer)
+decode_outer = build_decoder(Outer)
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        ("target_versions", "target_versions"),
+        ("TargetVersions", "target_versions"),
+        ("targetVersions", "target_versions"),
+        ("target-versions", "target_versions"),
+        ("TARGET_VERSIONS", "target_versions"),
+        ("targetversions", None),
+        ("steps", None),
+    ],
+)
+def test_resolve_field_name(key: str, expected: str | None):
+    field_names = frozenset(["target_versions", "description"])
+    assert resolve_field_name(key, field_names, {f.lower(): f for f in field_names}) == expected
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        {"title": "abc", "my_enum": "a", "inners": [], "lookup": {}},
+        {
+            "Title": 123,
+            "MyEnum": "b",
+            "inners": [{"name": "n1"}, {"name": "n2", "enabled": "true"}],
+            "lookup": {1: [1, 2], "k": {"nested": None}},
+            "optionalInner": {"name": 1.5, "Enabled": 1},
+            "optional_list": ["a", "b"],
+        },
+        {"title": None, "my_enum": "a", "inners": [], "lookup": {}, "optional_inner": None, "optional_list": None},
+    ],
+)
+def test_build_decoder_matches_dataclass_wizard(raw: dict):
+    assert decode_outer(raw) == fromdict(Outer, raw)
+
+
+@pytest.mark.parametrize(
+    "raw, expected_error",
+    [
+        ({"title": "abc", "my_enum": "a", "inners": [], "lookup": {}, "unknown": 1}, UnknownKeysError),
+        ({"title": "abc", "my_enum": "a", "inners": [{"name": "n", "foo": 1}], "lookup": {}}, UnknownKeysError),
+        ({"title": "abc", "my_enum": "a", "inners": []}, MissingFields),
+        ({"title": "abc", "my_enum": "a", "inners": [{"enabled": True}], "lookup": {}}, MissingFields),
+        ({"title": "abc", "my_enum": "a", "inners": [None], "lookup": {}}, MissingData),
+        ({"title": "abc", "my_enum": "a", "inners": [5], "lookup": {}}, ParseError),
+        ({"title": "abc", "my_enum": "c", "inners": [], "lookup": {}}, ValueError),
+        ({"title": "abc", "my_enum": "a", "inners": None, "lookup": {}}, TypeError),
+        (None, MissingData),
+    ],
+)
+def test_build_decoder_errors_match_dataclass_wizard(raw: Any, expected_error: type[Exception]):
+    with pytest.raises(expected_error) as wizard_error:
+        fromdict(Outer, raw)
+
+    with pytest.raises(expected_error) as decoder_error:
+        decode_outer(raw)
+
+    assert type(decoder_error.value) is type(wizard_error.value)
+
+
+def test_build_decoder_unsupported_annotation():
+    @dataclass
+    class Unsupported:
+        value: tuple[int, int]
+
+    with pytest.raises(TypeError):
+        build_decoder(Unsupported)
+
+
+@pytest.mark.parametrize(
+    "module, tp_id",
+    [
+        pytest.param(client_test_procedures, tp_id, id=f"client-{tp_id}")
+        for tp_id in client_test_procedures.TestProcedureId
+    ]
+    + [
+        pytest.param(server_test_procedures, tp_id, id=f"server-{tp_id}")
+        for tp_id in server_test_procedures.TestProcedureId
+    ],
+)
+def test_decode_test_procedure_matches_dataclass_wizard(module, tp_id):
+    """The generated decoders must produce identical TestProcedures to the generic dataclass_wizard from_yaml"""
+    yaml_contents = module.get_yaml_contents(tp_id)
+    expected = module.TestProcedure.from_yaml(yaml_contents, decoder=yaml.load, Loader=UniqueKeyLoader)
+    assert module.parse_test_procedure(yaml_contents) == expected
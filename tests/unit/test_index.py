@@ -0,0 +1,116 @@
+from enum import StrEnum
+
+import pytest
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.csipaus import CSIPAusVersion
+from cactus_test_definitions.index import INDEX_FIELDS, ProcedureIndex, procedure_terms
+from cactus_test_definitions.precompiled import PrecompiledCatalog
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+
+class MyId(StrEnum):
+    P1 = "P1"
+    P2 = "P2"
+    P3 = "P3"
+
+
+def make_terms(**kwargs) -> dict[str, frozenset[str]]:
+    return {field: frozenset(kwargs.get(field, [])) for field in INDEX_FIELDS}
+
+
+@pytest.fixture
+def index() -> ProcedureIndex[MyId]:
+    return ProcedureIndex(
+        MyId,
+        {
+            MyId.P1: make_terms(target_version=["v1.2", "v1.3"], classes=["A"], category=["Cat1"], uses_action=["a1"]),
+            MyId.P2: make_terms(target_version=["v1.3"], classes=["A", "B"], category=["Cat2"], uses_check=["c1"]),
+            MyId.P3: make_terms(target_version=["v1.2"], classes=["C"], category=["Cat1"], uses_action=["a1", "a2"]),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "criteria, expected",
+    [
+        ({}, [MyId.P1, MyId.P2, MyId.P3]),
+        ({"target_version": "v1.2"}, [MyId.P1, MyId.P3]),
+        ({"target_version": CSIPAusVersion.RELEASE_1_3}, [MyId.P1, MyId.P2]),
+        ({"classes_any": ["B", "C"]}, [MyId.P2, MyId.P3]),
+        ({"classes_any": []}, []),
+        ({"category": "Cat1", "uses_action": "a1"}, [MyId.P1, MyId.P3]),
+        ({"category": "Cat1", "uses_action": "a2", "target_version": "v1.2"}, [MyId.P3]),
+        ({"uses_check": "c1", "uses_action": "a1"}, []),
+        ({"uses_event": "unknown-event"}, []),
+    ],
+)
+def test_ProcedureIndex_find(index: ProcedureIndex[MyId], criteria: dict, expected: list[MyId]):
+    assert index.find(**criteria) == expected
+
+
+def test_ProcedureIndex_terms(index: ProcedureIndex[MyId]):
+    assert index.terms("uses_action") == ["a1", "a2"]
+    assert index.terms("client_type") == []
+    assert index.lookup("category", "Cat1") == {MyId.P1, MyId.P3}
+
+
+def test_procedure_terms():
+    terms = procedure_terms(server_test_procedures.get_test_procedure(server_test_procedures.TestProcedureId.S_ALL_01))
+    assert set(terms.keys()) == set(INDEX_FIELDS)
+    assert terms["target_version"] == {"v1.2", "v1.3"}
+    assert terms["classes"] == {"A"}
+    assert terms["category"] == {"Registration"}
+    assert "discovery" in terms["uses_action"]
+    assert terms["uses_event"] == frozenset()
+
+
+@pytest.mark.parametrize(
+    "module, criteria",
+    [
+        (client_test_procedures, {"target_version": CSIPAusVersion.RELEASE_1_2}),
+        (client_test_procedures, {"classes_any": ["A", "DR-A"]}),
+        (client_test_procedures, {"uses_action": "create-der-control", "target_version": CSIPAusVersion.RELEASE_1_3}),
+        (client_test_procedures, {"uses_check": "all-steps-complete"}),
+        (client_test_procedures, {"uses_event": "POST-request-received", "classes_any": ["DER-A"]}),
+        (server_test_procedures, {"client_type": "aggregator", "category": "Registration"}),
+        (server_test_procedures, {"uses_action": "discovery", "uses_check": "discovered"}),
+    ],
+)
+def test_TestProcedureCatalog_find_matches_scan(module, criteria: dict):
+    """Every query should match a brute force walk over all of the parsed procedures"""
+    expected = []
+    for tp_id in module.TestProcedureId:
+        terms = procedure_terms(module.get_test_procedure(tp_id))
+        if all(
+            (set(value) & terms["classes"]) if field == "classes_any" else (str(value) in terms[field])
+            for field, value in criteria.items()
+        ):
+            expected.append(tp_id)
+
+    assert expected, "Query should match at least 1 procedure - otherwise this test proves nothing"
+    assert module.TEST_PROCEDURE_CATALOG.find(**criteria) == expected
+
+
+def test_TestProcedureCatalog_index_precompiled():
+    tp_ids = list(server_test_procedures.TestProcedureId)
+    procedures = {tp_id: server_test_procedures.get_test_procedure(tp_id) for tp_id in tp_ids}
+    terms = {tp_id: procedure_terms(tp) for tp_id, tp in procedures.items()}
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build(procedures, "my-digest", terms=terms))
+    assert precompiled.terms(tp_ids[0]) == terms[tp_ids[0]]
+
+    def raise_on_parse(yaml_contents: str):
+        raise AssertionError("The precompiled terms should have been used instead of parsing YAML")
+
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.server.procedures", server_test_procedures.TestProcedureId, raise_on_parse
+    )
+    catalog.use_precompiled(precompiled)
+
+    index = catalog.index()
+    assert catalog.index() is index, "Should be memoized"
+    assert catalog.cache_info().size == 0, "No procedures should have been loaded"
+    assert catalog.find(client_type="aggregator") == server_test_procedures.TEST_PROCEDURE_CATALOG.find(
+        client_type="aggregator"
+    )
@@ -0,0 +1,173 @@
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions import instrumentation
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client.validate import VALIDATION_CACHE
+from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_test_procedure
+from cactus_test_definitions.instrumentation import (
+    DECODE,
+    EXPRESSIONS,
+    READ,
+    SCAN,
+    VALIDATE,
+    PhaseRecorder,
+    PhaseTiming,
+    add_phase_listener,
+    instrumented,
+    is_enabled,
+    phase,
+    procedure_scope,
+    record_phases,
+    remove_phase_listener,
+)
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+ALL_01 = client_test_procedures.TestProcedureId.ALL_01
+
+
+def test_phase_disabled():
+    assert not is_enabled()
+    assert phase(SCAN) is phase(DECODE)  # Shared no-op
+    with phase(SCAN):
+        pass
+
+
+def test_phase_listener():
+    listener = Mock()
+    add_phase_listener(listener)
+    try:
+        assert is_enabled()
+        with procedure_scope("my-id"):
+            with phase("outer"):
+                with phase("inner"):
+                    pass
+        with phase("unscoped"):
+            pass
+    finally:
+        remove_phase_listener(listener)
+    assert not is_enabled()
+
+    timings: list[PhaseTiming] = [c.args[0] for c in listener.call_args_list]
+    assert [(t.procedure_id, t.phase) for t in timings] == [("my-id", "inner"), ("my-id", "outer"), (None, "unscoped")]
+    inner, outer, _ = timings
+    assert outer.seconds >= inner.seconds
+    assert outer.self_seconds == pytest.approx(outer.seconds - inner.seconds)
+    assert inner.self_seconds == inner.seconds
+
+
+def test_phase_recorded_on_error():
+    with record_phases() as recorder:
+        with pytest.raises(ValueError):
+            with phase("my-phase"):
+                raise ValueError("my-error")
+    assert recorder.phases()["my-phase"].count == 1
+
+
+def test_instrumented():
+    @instrumented("my-phase")
+    def my_func(a: int, b: int = 1) -> int:
+        """my-docs"""
+        return a + b
+
+    assert my_func.__doc__ == "my-docs"
+    assert my_func(1, b=2) == 3  # Disabled
+
+    with record_phases() as recorder:
+        assert my_func(2) == 3
+        assert my_func(3) == 4
+    assert recorder.phases()["my-phase"].count == 2
+
+
+def test_phase_recorder_threads():
+    def run():
+        with procedure_scope(threading.current_thread().name):
+            for _ in range(10):
+                with phase("my-phase"):
+                    pass
+
+    with record_phases() as recorder:
+        threads = [threading.Thread(target=run, name=f"thread-{i}") for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert recorder.phases()["my-phase"].count == 40
+    procedures = recorder.procedures()
+    assert set(procedures) == {f"thread-{i}" for i in range(4)}
+    assert all(phases["my-phase"].count == 10 for phases in procedures.values())
+
+
+def test_phase_recorder_export():
+    recorder = PhaseRecorder()
+    recorder(PhaseTiming("my-id", "my-phase", 2.0, 1.5))
+    recorder(PhaseTiming("my-id", "my-phase", 1.0, 1.0))
+    recorder(PhaseTiming(None, "my-phase", 4.0, 4.0))
+
+    expected = {
+        "phases": {"my-phase": {"count": 3, "total_seconds": 7.0, "self_seconds": 6.5, "max_seconds": 4.0}},
+        "procedures": {
+            "my-id": {"my-phase": {"count": 2, "total_seconds": 3.0, "self_seconds": 2.5, "max_seconds": 2.0}},
+            "": {"my-phase": {"count": 1, "total_seconds": 4.0, "self_seconds": 4.0, "max_seconds": 4.0}},
+        },
+    }
+    assert recorder.to_dict() == expected
+    assert json.loads(recorder.to_json()) == expected
+
+    recorder.clear()
+    assert recorder.to_dict() == {"phases": {}, "procedures": {}}
+
+
+@pytest.mark.parametrize("test_procedures", [client_test_procedures, server_test_procedures])
+def test_catalog_load_phases(test_procedures):
+    procedure_id = next(iter(test_procedures.TestProcedureId))
+    catalog = test_procedures.TestProcedureCatalog(
+        test_procedures.TEST_PROCEDURE_CATALOG.procedures_package,
+        test_procedures.TestProcedureId,
+        test_procedures._parse_test_procedure,
+    )
+    catalog.use_precompiled(None)
+
+    with record_phases() as recorder:
+        catalog.get(procedure_id)
+        catalog.get(procedure_id)  # Cached - no additional phases
+
+    phases = recorder.procedures()[str(procedure_id)]
+    assert {READ, SCAN, DECODE} <= set(phases)
+    assert all(stats.count == 1 for name, stats in phases.items() if name != EXPRESSIONS)
+    assert recorder.procedures().keys() == {str(procedure_id)}
+
+
+def test_expression_phases_nested_in_decode():
+    yaml_contents = client_test_procedures.get_yaml_contents(client_test_procedures.TestProcedureId.ALL_06)
+    assert "$(" in yaml_contents  # ALL-06 has variable expressions
+
+    with record_phases() as recorder:
+        client_test_procedures._parse_test_procedure(yaml_contents)
+
+    phases = recorder.phases()
+    assert phases[EXPRESSIONS].count > 0
+    assert phases[DECODE].self_seconds < phases[DECODE].total_seconds
+
+
+def test_validate_phase():
+    VALIDATION_CACHE.clear()
+    procedure = client_test_procedures.get_test_procedure(ALL_01)
+    with record_phases() as recorder:
+        validate_client_test_procedure(procedure, ALL_01)
+    assert recorder.procedures()[str(ALL_01)][VALIDATE].count == 1
+
+
+def test_record_phases_existing_recorder():
+    recorder = PhaseRecorder()
+    for _ in range(2):
+        with record_phases(recorder) as active:
+            assert active is recorder
+            with phase("my-phase"):
+                pass
+    assert recorder.phases()["my-phase"].count == 2
+    assert instrumentation._listeners == ()
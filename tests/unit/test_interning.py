@@ -0,0 +1,98 @@
+import pickle
+from dataclasses import dataclass
+from enum import StrEnum
+
+import pytest
+import yaml
+
+from cactus_test_definitions.client.test_procedures import TestProcedureId, get_yaml_contents, parse_test_procedure
+from cactus_test_definitions.interning import MAX_INTERNED_LENGTH, intern_str, intern_strings
+from cactus_test_definitions.precompiled import PrecompiledCatalog
+from cactus_test_definitions.schema import FastUniqueKeyLoader, UniqueKeyLoader
+
+
+def fresh_str(value: str) -> str:
+    """Creates a new (uninterned) str instance equal to value"""
+    return "".join(list(value))
+
+
+class MyEnum(StrEnum):
+    A = "abc"
+
+
+@dataclass
+class MyDataclass:
+    name: str
+    values: list
+    lookup: dict
+
+
+@dataclass(slots=True, frozen=True)
+class MySlottedDataclass:
+    name: str
+
+
+def test_intern_str():
+    short = fresh_str("my-identifier")
+    assert intern_str(short) is intern_str(fresh_str("my-identifier"))
+
+    long_str = "x" * (MAX_INTERNED_LENGTH + 1)
+    assert intern_str(long_str) is long_str
+    assert intern_str(fresh_str(long_str)) is not long_str
+
+
+def test_intern_strings():
+    original = MyDataclass(
+        name=fresh_str("name-value"),
+        values=[fresh_str("list-value"), (fresh_str("tuple-value"), 1), MyEnum.A, MySlottedDataclass(fresh_str("s"))],
+        lookup={fresh_str("key"): fresh_str("dict-value"), "nested": {"a": [fresh_str("list-value")]}},
+    )
+    original_values = original.values
+    original_lookup = original.lookup
+
+    result = intern_strings(original)
+    assert result is original, "Updated in place"
+    assert result.values is original_values
+    assert result.lookup is original_lookup
+
+    assert result.name is intern_str("name-value")
+    assert result.values[0] is intern_str("list-value")
+    assert result.values[1][0] is intern_str("tuple-value")
+    assert result.values[2] is MyEnum.A, "StrEnum values should be unchanged"
+    assert result.values[3].name is intern_str("s")
+    assert result.lookup["nested"]["a"][0] is result.values[0]
+    assert [k for k in result.lookup.keys()][0] is intern_str("key")
+    assert result.lookup["key"] is intern_str("dict-value")
+
+
+@pytest.mark.parametrize("loader", [UniqueKeyLoader, FastUniqueKeyLoader])
+def test_loader_interns_strings(loader):
+    doc1 = yaml.load("type: create-der-control\nparameters: {opModExpLimW: 1}", Loader=loader)  # noqa: S506
+    doc2 = yaml.load("type: create-der-control\nopModExpLimW: '2'", Loader=loader)  # noqa: S506
+
+    assert doc1["type"] is doc2["type"]
+    assert list(doc1["parameters"].keys())[0] is list(doc2.keys())[1]
+
+    long_value = "y" * (MAX_INTERNED_LENGTH + 1)
+    doc3 = yaml.load(f"a: {long_value}\nb: {long_value}", Loader=loader)  # noqa: S506
+    assert doc3["a"] == doc3["b"]
+    assert doc3["a"] is not doc3["b"], "Long strings shouldn't be interned"
+
+
+def test_parsed_procedures_share_strings():
+    tp1 = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    tp2 = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    assert tp1 == tp2
+    assert tp1.category is tp2.category
+    assert tp1.classes[0] is tp2.classes[0]
+
+
+def test_precompiled_load_interns_strings():
+    tp = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    unpickled = pickle.loads(pickle.dumps(tp))
+    assert unpickled.category is not tp.category, "Sanity check - pickle doesn't intern"
+
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build({TestProcedureId.ALL_01: tp}, "my-digest"))
+    loaded = precompiled.load(TestProcedureId.ALL_01)
+    assert loaded == tp
+    assert loaded.category is tp.category
@@ -0,0 +1,82 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+# Modules that should never be imported by the lightweight import paths (eg for only CSIPAusVersion / TestProcedureId)
+HEAVY_MODULES = [
+    "yaml",
+    "dataclass_wizard",
+    "tokenize",
+    "pickle",
+    "multiprocessing",
+    "cactus_test_definitions.catalog",
+    "cactus_test_definitions.variable_expressions",
+    "cactus_test_definitions.client.test_procedures",
+    "cactus_test_definitions.server.test_procedures",
+]
+
+
+def imported_modules(code: str) -> dict[str, int]:
+    """Runs code in a new interpreter with -X importtime - returning the cumulative import time (in us) of every module
+    it imported, keyed by module name"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True, timeout=60
+    )
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import cactus_test_definitions",
+        "from cactus_test_definitions import CSIPAusVersion",
+        "from cactus_test_definitions.client import TestProcedureId",
+        "from cactus_test_definitions.server import TestProcedureId",
+    ],
+)
+def test_lightweight_imports(code: str):
+    baseline = imported_modules("pass")  # Whatever the interpreter imports at startup (eg via site)
+    modules = imported_modules(code)
+    assert "cactus_test_definitions" in modules
+
+    heavy = [m for m in HEAVY_MODULES if m in modules and m not in baseline]
+    assert heavy == [], f"'{code}' should not import {heavy}"
+
+
+def test_heavy_imports_still_work():
+    """Sanity check that imported_modules can detect the heavy modules being imported"""
+    modules = imported_modules("from cactus_test_definitions.client import TestProcedure")
+    assert "yaml" in modules
+    assert "cactus_test_definitions.client.test_procedures" in modules
+
+
+@pytest.mark.parametrize(
+    "package", ["cactus_test_definitions", "cactus_test_definitions.client", "cactus_test_definitions.server"]
+)
+def test_lazy_attributes(package: str):
+    module = importlib.import_module(package)
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
+
+    exec(f"from {package} import *", {})  # noqa: S102
+
+    with pytest.raises(AttributeError):
+        module.not_a_real_attribute  # noqa: B018
+
+
+def test_catalog_imports():
+    """Only the standard library should be imported by the catalog - the rest is imported by the methods using it"""
+    baseline = imported_modules("pass")
+    modules = imported_modules("import cactus_test_definitions.catalog")
+    imported = [m for m in modules if m not in baseline and m.startswith("cactus_test_definitions.")]
+    assert imported == ["cactus_test_definitions.lazy", "cactus_test_definitions.catalog"]
+    assert "concurrent.futures.process" not in modules
@@ -0,0 +1,93 @@
+import tracemalloc
+
+import pytest
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.memory import (
+    REPORTED_TYPES,
+    MemoryReport,
+    ProcedureFootprint,
+    count_objects,
+    measure_all,
+    measure_procedure,
+)
+from cactus_test_definitions.variable_expressions import NamedVariable, NamedVariableType
+
+
+def test_count_objects():
+    shared = "shared-value"
+    procedure = client_test_procedures.Step(
+        event=client_test_procedures.Event("my-event", {"a": shared, "b": shared}),
+        actions=[client_test_procedures.Action("my-action", {"c": NamedVariable(NamedVariableType.NOW)})],
+    )
+    counts, sizes = count_objects(procedure)
+
+    assert counts["Step"] == 1
+    assert counts["Event"] == 1
+    assert counts["Action"] == 1
+    assert counts["NamedVariable"] == 1
+    assert counts["dict"] == 2
+    assert counts["list"] == 1
+    assert counts["str"] == 6  # Distinct strings only (shared is counted once)
+    assert counts["Check"] == 0  # Always reported
+    assert "NamedVariableType" not in counts  # Enums are shared by every procedure
+    assert set(REPORTED_TYPES) <= set(counts)
+    assert counts.keys() == sizes.keys()
+    assert all(sizes[name] > 0 for name, count in counts.items() if count)
+
+
+def test_measure_procedure():
+    footprint = measure_procedure("client", "GEN-10")
+    assert footprint.kind == "client"
+    assert footprint.procedure_id == "GEN-10"
+    assert footprint.retained_bytes > 0
+    assert footprint.object_counts["Step"] == len(
+        client_test_procedures.get_test_procedure(client_test_procedures.TestProcedureId.GEN_10).steps
+    )
+    assert footprint.object_count == sum(footprint.object_counts.values())
+    assert len(footprint.top_types(3)) == 3
+    assert not tracemalloc.is_tracing()
+
+
+def test_measure_all():
+    report = measure_all(procedure_ids=["ALL-01", "GEN-10", "S-ALL-01"])
+    assert [(f.kind, f.procedure_id) for f in report.footprints] == [
+        ("client", "ALL-01"),
+        ("client", "GEN-10"),
+        ("server", "S-ALL-01"),
+    ]
+    assert report.top(1)[0].procedure_id == "GEN-10"
+    assert report.retained_bytes == sum(f.retained_bytes for f in report.footprints)
+    assert report.object_counts()["Step"] == sum(f.object_counts["Step"] for f in report.footprints)
+    assert not tracemalloc.is_tracing()
+
+    data = report.to_dict()
+    assert data["procedures"] == 3
+    assert data["footprints"][1]["procedure_id"] == "GEN-10"
+    assert report.to_json()
+
+
+def test_measure_all_compact():
+    regular = measure_all(["client"], procedure_ids=["GEN-10"])
+    compact = measure_all(["client"], compact=True, procedure_ids=["GEN-10"])
+    assert compact.compact
+    assert compact.retained_bytes < regular.retained_bytes
+    assert compact.footprints[0].object_counts["dict"] == 0  # dicts are ReadOnlyDict once compact
+    assert compact.footprints[0].object_counts["ReadOnlyDict"] > 0
+
+
+def test_measure_all_errors():
+    with pytest.raises(ValueError):
+        measure_all(["not-a-kind"])
+    with pytest.raises(ValueError):
+        measure_all(["server"], procedure_ids=["ALL-01"])  # Not a server procedure
+
+
+def test_memory_report_top():
+    def footprint(procedure_id: str, size: int) -> ProcedureFootprint:
+        return ProcedureFootprint("client", procedure_id, size, {"Expression": 1}, {"Expression": size})
+
+    report = MemoryReport(False, (footprint("a", 1), footprint("b", 3), footprint("c", 2)))
+    assert [f.procedure_id for f in report.top(2)] == ["b", "c"]
+    assert report.retained_bytes == 6
+    assert report.object_counts() == {"Expression": 3}
@@ -9,7 +9,9 @@ from cactus_test_definitions.errors import TestProcedureDefinitionError
 from cactus_test_definitions.parameters import (
     ParameterSchema,
     ParameterType,
+    SchemaTable,
     is_valid_parameter_type,
+    schema_generation,
     validate_parameters,
 )
 from cactus_test_definitions.variable_expressions import (
@@ -78,6 +80,7 @@ def test_is_valid_parameter_type_skipped_values(value: Any, type: ParameterType)
         (ParameterType.ListString, [], True),
         (ParameterType.ListString, [""], True),
         (ParameterType.ListString, ["", "b"], True),
+        (ParameterType.ListString, ("", "b"), True),  # Compact procedures have tuples instead of lists
         (ParameterType.ListString, ["", 4, "b"], False),
         (ParameterType.ListString, [3, 4, 5], False),
         (ParameterType.ListString, False, False),
@@ -85,6 +88,7 @@ def test_is_valid_parameter_type_skipped_values(value: Any, type: ParameterType)
         (ParameterType.ListString, 123, False),
         (ParameterType.ListInteger, [], True),
         (ParameterType.ListInteger, [0], True),
+        (ParameterType.ListInteger, (0, 1), True),
         (ParameterType.ListInteger, [""], False),
         (ParameterType.ListInteger, [3, 4, "5"], False),
         (ParameterType.ListInteger, [3, 4, 5], True),
@@ -205,3 +209,40 @@ def test_validate_action_parameters(parameters: dict, schema: dict, is_valid: bo
     else:
         with pytest.raises(TestProcedureDefinitionError):
             validate_parameters("foo", parameters, schema)
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda t: t.__setitem__("new", {}),
+        lambda t: t.__delitem__("a"),
+        lambda t: t.update({"new": {}}),
+        lambda t: t.__ior__({"new": {}}),
+        lambda t: t.setdefault("new", {}),
+        lambda t: t.pop("a"),
+        lambda t: t.popitem(),
+        lambda t: t.clear(),
+        lambda t: t["a"].__setitem__("p2", ParameterSchema(False, ParameterType.String)),  # Nested modification
+        lambda t: t["a"].pop("p1"),
+    ],
+)
+def test_schema_table_modifications(modify):
+    table = SchemaTable({"a": {"p1": ParameterSchema(True, ParameterType.Integer)}})
+    assert table == {"a": {"p1": ParameterSchema(True, ParameterType.Integer)}}
+    assert isinstance(table["a"], SchemaTable)
+
+    generation = schema_generation()
+    assert table.get("a") is table["a"]  # Reads don't modify
+    assert schema_generation() == generation
+
+    modify(table)
+    assert schema_generation() > generation
+    if "new" in table:
+        assert isinstance(table["new"], SchemaTable)
+
+
+def test_schema_table_setdefault_existing():
+    table = SchemaTable({"a": {}})
+    generation = schema_generation()
+    assert table.setdefault("a", {"x": ParameterSchema(True, ParameterType.Integer)}) == {}
+    assert schema_generation() == generation
@@ -0,0 +1,171 @@
+import importlib
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions import __version__
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client.test_procedures import TestProcedureId, get_yaml_contents, parse_test_procedure
+from cactus_test_definitions.precompiled import (
+    PRECOMPILED_RESOURCE,
+    PrecompiledCatalog,
+    SourcesStamp,
+    load_precompiled_catalog,
+    source_stats,
+    sources_digest,
+)
+
+
+@pytest.fixture
+def procedures_package(tmp_path, monkeypatch) -> str:
+    """Creates an importable package holding a single (not recently modified) YAML definition - returns its name"""
+    package_dir = tmp_path / "stamped_test_procedures"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    write_yaml(package_dir / "A-01.yaml", "description: a\n", age_seconds=60)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "stamped_test_procedures", raising=False)
+    importlib.invalidate_caches()
+    return "stamped_test_procedures"
+
+
+def write_yaml(path, contents: str, age_seconds: float = 0) -> None:
+    path.write_text(contents)
+    mtime_ns = time.time_ns() - int(age_seconds * 1_000_000_000)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def raise_on_parse(yaml_contents: str):
+    raise AssertionError("The precompiled artifact should have been used instead of parsing YAML")
+
+
+def test_PrecompiledCatalog_roundtrip():
+    procedures = {
+        tp_id: parse_test_procedure(get_yaml_contents(tp_id))
+        for tp_id in [TestProcedureId.ALL_01, TestProcedureId.GEN_10]
+    }
+
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build(procedures, "my-digest"))
+
+    assert precompiled.header.library_version == __version__
+    assert precompiled.header.sources_digest == "my-digest"
+    assert precompiled.header.stamp == SourcesStamp(__version__, "my-digest")
+    assert precompiled.is_current("my-digest")
+    assert not precompiled.is_current("other-digest")
+
+    assert TestProcedureId.ALL_01 in precompiled
+    assert "GEN-10" in precompiled
+    assert TestProcedureId.ALL_02 not in precompiled
+
+    for tp_id, expected in procedures.items():
+        actual = precompiled.load(tp_id)
+        assert actual == expected
+        assert actual is not expected
+        assert precompiled.load(tp_id) is not actual, "Each load should produce a new instance"
+
+    with pytest.raises(KeyError):
+        precompiled.load(TestProcedureId.ALL_02)
+
+
+def test_PrecompiledCatalog_invalid_buffer():
+    with pytest.raises(ValueError):
+        PrecompiledCatalog(b"not a precompiled artifact")
+
+
+def test_sources_digest():
+    digest = sources_digest("cactus_test_definitions.client.procedures")
+    assert digest == sources_digest("cactus_test_definitions.client.procedures"), "Should be deterministic"
+    assert digest != sources_digest("cactus_test_definitions.server.procedures")
+
+
+def test_SourcesStamp(procedures_package, tmp_path, monkeypatch):
+    monkeypatch.setattr("cactus_test_definitions.precompiled._RACY_SOURCE_NS", 0)  # eg library sources just checked out
+    stamp = SourcesStamp.of(procedures_package)
+    assert stamp.library_version == __version__
+    assert stamp.sources_digest == sources_digest(procedures_package)
+    assert stamp.source_stats == source_stats(procedures_package)
+    assert f"{procedures_package}[0]:A-01.yaml" in stamp.source_stats
+    assert not stamp.release
+
+    # Unchanged sources are detected without reading them
+    with monkeypatch.context() as m:
+        m.setattr("cactus_test_definitions.precompiled.sources_digest", Mock(side_effect=AssertionError))
+        assert stamp.is_current(procedures_package)
+
+    yaml_path = tmp_path / procedures_package / "A-01.yaml"
+    os.utime(yaml_path)
+    assert stamp.is_current(procedures_package), "Touched (eg by a checkout) - but the contents are unchanged"
+
+    write_yaml(yaml_path, "description: b\n", age_seconds=60)
+    assert not stamp.is_current(procedures_package), "Contents changed"
+    assert SourcesStamp(__version__, stamp.sources_digest, release=True).is_current(procedures_package)
+    assert SourcesStamp.of(procedures_package, release=True).source_stats == {}, "Only the version is checked"
+    assert not SourcesStamp(__version__ + ".other", stamp.sources_digest, release=True).is_current(procedures_package)
+
+
+def test_SourcesStamp_recently_modified(procedures_package, tmp_path):
+    """The stats of sources modified immediately before stamping can't be trusted"""
+    write_yaml(tmp_path / procedures_package / "A-01.yaml", "description: b\n")
+    stamp = SourcesStamp.of(procedures_package)
+    assert stamp.source_stats == {}
+    assert stamp.is_current(procedures_package)
+
+    write_yaml(tmp_path / procedures_package / "A-01.yaml", "description: c\n")
+    assert not stamp.is_current(procedures_package)
+
+
+def test_load_precompiled_catalog(procedures_package, tmp_path):
+    assert load_precompiled_catalog(procedures_package) is None, "No artifact"
+
+    expected = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    artifact = PrecompiledCatalog.build({TestProcedureId.ALL_01: expected}, SourcesStamp.of(procedures_package))
+    (tmp_path / procedures_package / PRECOMPILED_RESOURCE).write_bytes(artifact)
+    precompiled = load_precompiled_catalog(procedures_package)
+    assert precompiled is not None
+    assert precompiled.load(TestProcedureId.ALL_01) == expected
+
+    write_yaml(tmp_path / procedures_package / "B-01.yaml", "description: b\n", age_seconds=60)
+    assert load_precompiled_catalog(procedures_package) is None, "Stale"
+
+
+def test_TestProcedureCatalog_uses_precompiled():
+    expected = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build({TestProcedureId.ALL_01: expected}, "digest"))
+
+    catalog = TestProcedureCatalog("cactus_test_definitions.client.procedures", TestProcedureId, raise_on_parse)
+    catalog.use_precompiled(precompiled)
+    assert catalog.get(TestProcedureId.ALL_01) == expected
+
+    # Anything missing from the artifact falls back to the YAML
+    with pytest.raises(AssertionError):
+        catalog.get(TestProcedureId.ALL_02)
+
+
+def test_TestProcedureCatalog_precompiled_fallback():
+    """A corrupt artifact entry should fall back to parsing the YAML"""
+    expected = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    artifact = bytearray(PrecompiledCatalog.build({TestProcedureId.ALL_01: expected}, "digest"))
+    artifact[-20:] = b"\x00" * 20
+
+    catalog = TestProcedureCatalog("cactus_test_definitions.client.procedures", TestProcedureId, parse_test_procedure)
+    catalog.use_precompiled(PrecompiledCatalog(bytes(artifact)))
+    assert catalog.get(TestProcedureId.ALL_01) == expected
+
+
+def test_TestProcedureCatalog_precompiled_rechecked(monkeypatch):
+    """Clearing the catalog shouldn't permanently disable the precompiled artifact"""
+    expected = parse_test_procedure(get_yaml_contents(TestProcedureId.ALL_01))
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build({TestProcedureId.ALL_01: expected}, "digest"))
+    load_precompiled = Mock(return_value=precompiled)
+    monkeypatch.setattr("cactus_test_definitions.precompiled.load_precompiled_catalog", load_precompiled)
+
+    catalog = TestProcedureCatalog("cactus_test_definitions.client.procedures", TestProcedureId, raise_on_parse)
+    assert catalog.get(TestProcedureId.ALL_01) == expected
+    load_precompiled.assert_called_once()
+
+    catalog.clear()
+    assert catalog.get(TestProcedureId.ALL_01) == expected
+    assert load_precompiled.call_count == 2
@@ -0,0 +1,44 @@
+import gc
+
+import pytest
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.errors import TestProcedureDefinitionError
+from cactus_test_definitions.preload import PreloadInfo, preload
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def test_preload(unfreeze):
+    info = preload()
+    assert isinstance(info, PreloadInfo)
+    assert info.client_procedures == len(client_test_procedures.TestProcedureId)
+    assert info.server_procedures == len(server_test_procedures.TestProcedureId)
+    assert info.frozen_objects > 0
+    assert gc.get_freeze_count() == info.frozen_objects
+
+    for module in [client_test_procedures, server_test_procedures]:
+        assert module.TEST_PROCEDURE_CATALOG.cache_info().size == len(module.TestProcedureId)
+
+
+def test_preload_no_freeze():
+    frozen_before = gc.get_freeze_count()
+    info = preload(validate=False, freeze=False)
+    assert info.frozen_objects == 0
+    assert gc.get_freeze_count() == frozen_before
+
+
+def test_preload_validation_failure(monkeypatch):
+    def raise_error(test_procedure, test_procedure_id):
+        raise TestProcedureDefinitionError(f"{test_procedure_id} is invalid")
+
+    monkeypatch.setattr("cactus_test_definitions.preload.validate_server_test_procedure", raise_error)
+    frozen_before = gc.get_freeze_count()
+    with pytest.raises(TestProcedureDefinitionError):
+        preload(freeze=False)
+    assert gc.get_freeze_count() == frozen_before
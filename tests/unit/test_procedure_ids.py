@@ -0,0 +1,22 @@
+import pytest
+
+from cactus_test_definitions import procedure_ids as kinds
+from cactus_test_definitions.client.procedure_ids import TestProcedureId as ClientTestProcedureId
+from cactus_test_definitions.procedure_ids import KINDS, check_kind, kind_module, procedure_ids
+from cactus_test_definitions.server.procedure_ids import TestProcedureId as ServerTestProcedureId
+
+
+def test_procedure_ids():
+    assert KINDS == ("client", "server")
+    assert procedure_ids("client") is ClientTestProcedureId
+    assert procedure_ids("server") is ServerTestProcedureId
+    assert kinds.test_procedures_module("client").TestProcedureId is ClientTestProcedureId
+    assert kind_module("server", "validate").__name__ == "cactus_test_definitions.server.validate"
+
+
+@pytest.mark.parametrize("kind", ["", "Client", "shared", "client.procedures"])
+def test_check_kind_invalid(kind: str):
+    with pytest.raises(ValueError):
+        check_kind(kind)
+    with pytest.raises(ValueError):
+        kind_module(kind, "procedure_ids")
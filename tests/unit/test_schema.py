@@ -0,0 +1,57 @@
+import pytest
+import yaml
+
+from cactus_test_definitions.client.test_procedures import TestProcedureId as ClientTestProcedureId
+from cactus_test_definitions.client.test_procedures import get_yaml_contents as get_client_yaml_contents
+from cactus_test_definitions.schema import FastUniqueKeyLoader, UniqueKeyLoader
+from cactus_test_definitions.server.test_procedures import TestProcedureId as ServerTestProcedureId
+from cactus_test_definitions.server.test_procedures import get_yaml_contents as get_server_yaml_contents
+
+ALL_LOADERS = [UniqueKeyLoader]
+if yaml.__with_libyaml__:
+    from cactus_test_definitions.schema import CUniqueKeyLoader
+
+    ALL_LOADERS.append(CUniqueKeyLoader)
+
+
+def test_FastUniqueKeyLoader_selection():
+    if yaml.__with_libyaml__:
+        assert issubclass(FastUniqueKeyLoader, yaml.CSafeLoader)
+    else:
+        assert FastUniqueKeyLoader is UniqueKeyLoader
+
+
+@pytest.mark.parametrize("loader", ALL_LOADERS)
+@pytest.mark.parametrize(
+    "yaml_contents",
+    [
+        "key1: abc\nkey1: def\n",
+        "parent:\n  child: 1\n  child: 2\n",
+        "items:\n  - a: 1\n    a: 1\n",
+    ],
+)
+def test_UniqueKeyLoader_duplicate_keys(loader, yaml_contents: str):
+    with pytest.raises(ValueError):
+        yaml.load(yaml_contents, Loader=loader)
+
+
+@pytest.mark.parametrize("loader", ALL_LOADERS)
+def test_UniqueKeyLoader_valid(loader):
+    assert yaml.load("a: 1\nb:\n  a: [1, 2]\nc: $now\n", Loader=loader) == {
+        "a": 1,
+        "b": {"a": [1, 2]},
+        "c": "$now",
+    }
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML installed without libyaml")
+@pytest.mark.parametrize(
+    "yaml_contents",
+    [pytest.param(get_client_yaml_contents(tp_id), id=tp_id) for tp_id in ClientTestProcedureId]
+    + [pytest.param(get_server_yaml_contents(tp_id), id=tp_id) for tp_id in ServerTestProcedureId],
+)
+def test_CUniqueKeyLoader_matches_UniqueKeyLoader(yaml_contents: str):
+    """The libyaml loader should produce identical output for every definition"""
+    expected = yaml.load(yaml_contents, Loader=UniqueKeyLoader)
+    actual = yaml.load(yaml_contents, Loader=FastUniqueKeyLoader)
+    assert actual == expected
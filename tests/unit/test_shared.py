@@ -0,0 +1,87 @@
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.precompiled import PrecompiledCatalog
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.shared import SharedCatalog, initialise_worker
+
+
+def new_server_catalog() -> TestProcedureCatalog:
+    return TestProcedureCatalog(
+        "cactus_test_definitions.server.procedures",
+        server_test_procedures.TestProcedureId,
+        server_test_procedures.parse_test_procedure,
+    )
+
+
+@pytest.mark.parametrize("packaged", [True, False])
+def test_SharedCatalog(monkeypatch, packaged: bool):
+    if not packaged:
+        monkeypatch.setattr("cactus_test_definitions.shared.load_precompiled_catalog", lambda package: None)
+
+    tp_id = server_test_procedures.TestProcedureId.S_ALL_01
+    with SharedCatalog.create(new_server_catalog()) as created:
+        assert created.owner
+        attached = SharedCatalog.attach(created.name)
+        assert not attached.owner
+        assert tp_id in attached.precompiled
+        assert attached.precompiled.summary(tp_id) == server_test_procedures.get_procedure_summaries()[tp_id]
+
+        catalog = new_server_catalog()
+        catalog.use_precompiled(attached.precompiled)
+        assert catalog.get(tp_id) == server_test_procedures.get_test_procedure(tp_id)
+
+        # Once detached - the catalog should fall back to the YAML
+        attached.unlink()
+        catalog.clear()
+        assert catalog.get(tp_id) == server_test_procedures.get_test_procedure(tp_id)
+
+        # The creator's block should survive the other process detaching
+        reattached = SharedCatalog.attach(created.name)
+        assert reattached.precompiled.load(tp_id) == catalog.get(tp_id)
+        reattached.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedCatalog.attach(created.name)
+
+
+def test_SharedCatalog_attach_untracked(monkeypatch):
+    """Attaching shouldn't register the block with (or otherwise modify) this process's resource tracker"""
+    with SharedCatalog.create(new_server_catalog()) as created:
+        register = Mock()
+        monkeypatch.setattr(resource_tracker, "register", register)
+        attached = SharedCatalog.attach(created.name)
+        assert resource_tracker.register is register
+        register.assert_not_called()
+
+        assert bytes(attached.shared_memory.buf) == bytes(created.shared_memory.buf)
+        attached.close()
+
+
+def test_initialise_worker_spawn():
+    """Spawned workers should load procedures from the shared block (which has been modified to prove it)"""
+    tp_ids = list(server_test_procedures.TestProcedureId)[:2]
+    procedures = {
+        tp_id: dataclasses.replace(server_test_procedures.get_test_procedure(tp_id), description=f"shared {tp_id}")
+        for tp_id in tp_ids
+    }
+    artifact = PrecompiledCatalog.build(procedures, "my-digest")
+    shared_memory = SharedMemory(create=True, size=len(artifact))
+    shared_memory.buf[: len(artifact)] = artifact
+
+    with SharedCatalog(shared_memory, owner=True) as shared:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=get_context("spawn"),
+            initializer=initialise_worker,
+            initargs=(None, shared.name),
+        ) as executor:
+            loaded = list(executor.map(server_test_procedures.get_test_procedure, tp_ids))
+
+    assert [tp.description for tp in loaded] == [f"shared {tp_id}" for tp_id in tp_ids]
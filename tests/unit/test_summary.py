@@ -0,0 +1,141 @@
+import pytest
+from dataclass_wizard.utils.string_conv import to_snake_case
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.csipaus import CSIPAusVersion
+from cactus_test_definitions.precompiled import PrecompiledCatalog
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.summary import (
+    ProcedureSummary,
+    _to_snake_case,
+    summarise_procedure,
+    summarise_procedure_yaml,
+)
+
+
+def raise_on_parse(yaml_contents: str):
+    raise AssertionError("Generating summaries should not require a full parse")
+
+
+@pytest.mark.parametrize(
+    "module, tp_id",
+    [
+        pytest.param(client_test_procedures, tp_id, id=f"client-{tp_id}")
+        for tp_id in client_test_procedures.TestProcedureId
+    ]
+    + [
+        pytest.param(server_test_procedures, tp_id, id=f"server-{tp_id}")
+        for tp_id in server_test_procedures.TestProcedureId
+    ],
+)
+def test_summarise_procedure_yaml_matches_full_parse(module, tp_id):
+    yaml_contents = module.get_yaml_contents(tp_id)
+    assert summarise_procedure_yaml(yaml_contents) == summarise_procedure(module.parse_test_procedure(yaml_contents))
+
+
+def test_summarise_procedure_yaml_key_casing():
+    yaml_contents = """
+target_versions: [v1.3]
+description: My Description
+Category: Cat
+Classes: [A, 1]
+Preconditions:
+  RequiredClients:
+    - id: client1
+    - id: client2
+      client_type: device
+Steps:
+  - id: STEP1
+    action: {type: discovery, parameters: {resources: [Time]}}
+  - id: STEP2
+    action: {type: discovery}
+"""
+    assert summarise_procedure_yaml(yaml_contents) == ProcedureSummary(
+        description="My Description",
+        category="Cat",
+        classes=("A", "1"),
+        target_versions=(CSIPAusVersion.RELEASE_1_3,),
+        step_count=2,
+        required_client_count=2,
+    )
+
+
+@pytest.mark.parametrize(
+    "yaml_contents",
+    [
+        "- Description: a\n",
+        "just a string",
+        "",
+        "Description: a\nCategory: b\nClasses: [A]\n",  # Missing target versions
+    ],
+)
+def test_summarise_procedure_yaml_invalid(yaml_contents: str):
+    with pytest.raises(ValueError):
+        summarise_procedure_yaml(yaml_contents)
+
+
+def test_TestProcedureCatalog_summaries_scanned():
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.client.procedures", client_test_procedures.TestProcedureId, raise_on_parse
+    )
+    catalog.use_precompiled(None)
+
+    summaries = catalog.summaries()
+    assert list(summaries.keys()) == list(client_test_procedures.TestProcedureId)
+    assert summaries[client_test_procedures.TestProcedureId.ALL_01] == summarise_procedure(
+        client_test_procedures.get_test_procedure(client_test_procedures.TestProcedureId.ALL_01)
+    )
+    assert catalog.summaries() is summaries, "Should be memoized"
+    assert catalog.cache_info().size == 0
+
+    catalog.clear()
+    assert catalog.summaries() is not summaries
+
+
+def test_TestProcedureCatalog_summaries_precompiled(monkeypatch):
+    tp_ids = list(server_test_procedures.TestProcedureId)
+    procedures = {tp_id: server_test_procedures.get_test_procedure(tp_id) for tp_id in tp_ids}
+    summaries = {tp_id: summarise_procedure(tp) for tp_id, tp in procedures.items()}
+    precompiled = PrecompiledCatalog(PrecompiledCatalog.build(procedures, "my-digest", summaries))
+    assert precompiled.summary(tp_ids[0]) == summaries[tp_ids[0]]
+
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.server.procedures", server_test_procedures.TestProcedureId, raise_on_parse
+    )
+    catalog.use_precompiled(precompiled)
+
+    def raise_on_read(procedure_id):
+        raise AssertionError("The precompiled summaries should have been used instead of reading YAML")
+
+    monkeypatch.setattr(catalog, "read_yaml", raise_on_read)
+    assert catalog.summaries() == summaries
+
+
+def test_get_procedure_summaries():
+    summaries = server_test_procedures.get_procedure_summaries()
+    assert set(summaries.keys()) == set(server_test_procedures.TestProcedureId)
+    assert all(s.required_client_count for s in summaries.values()), "Every server test requires a client"
+    assert all(s.step_count for s in summaries.values())
+    assert all(s.required_client_count is None for s in client_test_procedures.get_procedure_summaries().values())
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "TargetVersions",
+        "target_versions",
+        "targetVersions",
+        "target-versions",
+        "Target Versions",
+        "RequiredClients",
+        "required__clients",
+        "HTTPRequest",
+        "opModImpLimW",
+        "Description",
+        "a1B2",
+        "",
+    ],
+)
+def test_to_snake_case_matches_dataclass_wizard(key: str):
+    assert _to_snake_case(key) == to_snake_case(key)
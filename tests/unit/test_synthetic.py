@@ -0,0 +1,80 @@
+import pytest
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_test_procedure
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.server.validate import validate_test_procedure as validate_server_test_procedure
+from cactus_test_definitions.synthetic import (
+    SyntheticProcedureShape,
+    step_name,
+    synthetic_client_yaml,
+    synthetic_server_yaml,
+    synthetic_yaml,
+)
+from cactus_test_definitions.variable_expressions import BaseExpression
+
+SHAPES = [
+    SyntheticProcedureShape(steps=1),
+    SyntheticProcedureShape(
+        steps=25, actions_per_step=3, fan_out=4, expression_density=1, admin_instructions_per_step=2
+    ),
+    SyntheticProcedureShape(steps=10, actions_per_step=0, fan_out=0, expression_density=0),
+    SyntheticProcedureShape(steps=10, actions_per_step=1, fan_out=0, expression_density=0.25),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_synthetic_client_procedure(shape: SyntheticProcedureShape):
+    procedure = client_test_procedures.parse_test_procedure(synthetic_client_yaml(shape))
+    validate_client_test_procedure(procedure, "SYNTHETIC")
+
+    assert list(procedure.steps) == [step_name(i) for i in range(shape.steps)]
+    for i, step in enumerate(procedure.steps.values()):
+        expected_enabled = [step_name(j) for j in range(i + 1, min(i + 1 + shape.fan_out, shape.steps))]
+        enabled = [a.parameters["steps"] for a in step.actions if a.type == "enable-steps"]
+        assert enabled == ([expected_enabled] if expected_enabled else [])
+        assert len([a for a in step.actions if a.type == "remove-steps"]) == int(shape.fan_out > 0)
+        assert len([a for a in step.actions if a.type == "create-der-control"]) == shape.actions_per_step
+        assert len(step.instructions or []) == shape.admin_instructions_per_step
+
+    starts = [
+        a.parameters["start"] for s in procedure.steps.values() for a in s.actions if a.type == "create-der-control"
+    ]
+    expressions = [start for start in starts if isinstance(start, BaseExpression)]
+    assert len(expressions) == int(len(starts) * shape.expression_density)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_synthetic_server_procedure(shape: SyntheticProcedureShape):
+    procedure = server_test_procedures.parse_test_procedure(synthetic_server_yaml(shape))
+    validate_server_test_procedure(procedure, "SYNTHETIC")
+
+    assert [step.id for step in procedure.steps] == [step_name(i) for i in range(shape.steps)]
+    instructions = [i for step in procedure.steps for i in (step.admin_instructions or [])]
+    assert len(instructions) == shape.steps * shape.admin_instructions_per_step
+
+    expressions = [i for i in instructions if isinstance(i.parameters["opModExpLimW"], BaseExpression)]
+    assert len(expressions) == int(len(instructions) * shape.expression_density)
+
+
+def test_synthetic_yaml():
+    shape = SyntheticProcedureShape(steps=3)
+    assert synthetic_yaml("client", shape) == synthetic_client_yaml(shape)
+    assert synthetic_yaml("server", shape) == synthetic_server_yaml(shape)
+    with pytest.raises(ValueError):
+        synthetic_yaml("not-a-kind", shape)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"steps": 0},
+        {"actions_per_step": -1},
+        {"fan_out": -1},
+        {"admin_instructions_per_step": -1},
+        {"expression_density": 1.5},
+    ],
+)
+def test_synthetic_procedure_shape_invalid(kwargs: dict):
+    with pytest.raises(ValueError):
+        SyntheticProcedureShape(**kwargs)
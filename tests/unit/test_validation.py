@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.validation import (
+    PARSE_LOCATION,
+    ValidationFailure,
+    ValidationReport,
+    validate_all,
+    validate_procedure,
+)
+
+
+@pytest.mark.parametrize("kind, module", [("client", client_test_procedures), ("server", server_test_procedures)])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_all(kind: str, module, workers: int):
+    report = validate_all(kind, workers=workers)
+    assert isinstance(report, ValidationReport)
+    assert report.kind == kind
+    assert report.ok, report.to_json()
+    assert report.procedure_ids == tuple(str(procedure_id) for procedure_id in module.TestProcedureId)
+    assert report.failures == tuple()
+    assert report.duration_seconds > 0
+
+
+def test_validate_all_subset():
+    report = validate_all("server", procedure_ids=["S-ALL-01", "S-ALL-02"])
+    assert report.ok
+    assert report.procedure_ids == ("S-ALL-01", "S-ALL-02")
+
+
+def test_validate_all_unknown_kind():
+    with pytest.raises(ValueError):
+        validate_all("not-a-kind")
+
+
+def test_validate_procedure_element_failures(monkeypatch):
+    """Every invalid element should be reported (with its location) - not just the first"""
+    procedure = client_test_procedures.TEST_PROCEDURE_CATALOG.view(client_test_procedures.TestProcedureId.ALL_01)
+    step_name, step = next((name, step) for name, step in procedure.steps.items() if step.actions)
+    step.actions[0].type = "not-an-action"
+    procedure.criteria.checks[0].type = "not-a-check"
+    monkeypatch.setattr(client_test_procedures, "get_test_procedure", lambda procedure_id: procedure)
+
+    failures = validate_procedure("client", "ALL-01")
+    assert [f.location for f in failures] == [f"steps.{step_name}.actions[0]", "criteria.checks[0]"]
+    assert all(f.procedure_id == "ALL-01" for f in failures)
+    assert all(f.error_type == "TestProcedureDefinitionError" for f in failures)
+    assert "not-an-action" in failures[0].message
+
+
+def test_validate_procedure_server_element_failure(monkeypatch):
+    procedure = server_test_procedures.TEST_PROCEDURE_CATALOG.view(server_test_procedures.TestProcedureId.S_ALL_01)
+    procedure.steps[0].action.type = "not-an-action"
+    monkeypatch.setattr(server_test_procedures, "get_test_procedure", lambda procedure_id: procedure)
+
+    failures = validate_procedure("server", "S-ALL-01")
+    assert [f.location for f in failures] == [f"steps.{procedure.steps[0].id}.action"]
+
+
+def test_validate_procedure_procedure_level_failure(monkeypatch):
+    """Procedure level failures (eg references to undefined clients) are reported alongside element failures"""
+    procedure = server_test_procedures.TEST_PROCEDURE_CATALOG.view(server_test_procedures.TestProcedureId.S_ALL_01)
+    step_id = procedure.steps[0].id
+    procedure.steps[0].action.type = "not-an-action"
+    procedure.steps[0].client = "not-a-client"
+    monkeypatch.setattr(server_test_procedures, "get_test_procedure", lambda procedure_id: procedure)
+
+    failures = validate_procedure("server", "S-ALL-01")
+    assert [(f.location, f.error_type) for f in failures] == [
+        (f"steps.{step_id}.action", "TestProcedureDefinitionError"),
+        (f"steps.{step_id}.client", "TestProcedureDefinitionError"),
+    ]
+    assert "not-an-action" in failures[0].message
+    assert "not-a-client" in failures[1].message
+
+
+def test_validate_procedure_no_required_clients(monkeypatch):
+    procedure = server_test_procedures.TEST_PROCEDURE_CATALOG.view(server_test_procedures.TestProcedureId.S_ALL_01)
+    procedure.preconditions.required_clients = []
+    monkeypatch.setattr(server_test_procedures, "get_test_procedure", lambda procedure_id: procedure)
+
+    failures = validate_procedure("server", "S-ALL-01")
+    assert failures[0].location == "preconditions.required_clients"
+    assert {f.location for f in failures[1:]} == {f"steps.{step.id}.client" for step in procedure.steps if step.client}
+
+
+def test_validate_all_parse_failure(monkeypatch):
+    def raise_error(procedure_id):
+        raise ValueError(f"{procedure_id} is broken")
+
+    monkeypatch.setattr(client_test_procedures, "get_test_procedure", raise_error)
+    report = validate_all("client", workers=1, procedure_ids=["ALL-01", "ALL-02"])
+    assert not report.ok
+    assert report.failed_procedure_ids() == ["ALL-01", "ALL-02"]
+    assert report.failures[0] == ValidationFailure("ALL-01", PARSE_LOCATION, "ALL-01 is broken", "ValueError")
+
+    # Unknown procedures are reported rather than raised
+    report = validate_all("client", workers=1, procedure_ids=["not-a-procedure"])
+    assert [(f.procedure_id, f.location) for f in report.failures] == [("not-a-procedure", PARSE_LOCATION)]
+
+
+def test_validation_report_to_json():
+    failure = ValidationFailure("ALL-01", "steps.A.actions[0]", "my-error", "TestProcedureDefinitionError")
+    report = ValidationReport("client", ("ALL-01", "ALL-02"), (failure, failure), 1.5)
+
+    decoded = json.loads(report.to_json())
+    assert decoded == {
+        "kind": "client",
+        "ok": False,
+        "checked": 2,
+        "failed": 1,
+        "duration_seconds": 1.5,
+        "procedure_ids": ["ALL-01", "ALL-02"],
+        "failures": [
+            {
+                "procedure_id": "ALL-01",
+                "location": "steps.A.actions[0]",
+                "message": "my-error",
+                "error_type": "TestProcedureDefinitionError",
+            }
+        ]
+        * 2,
+    }
+    assert json.loads(ValidationReport("server", (), (), 0.0).to_json(indent=None))["ok"] is True
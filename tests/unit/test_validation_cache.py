@@ -0,0 +1,237 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from cactus_test_definitions import validation_cache
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.client.actions import ACTION_PARAMETER_SCHEMA, Action
+from cactus_test_definitions.client.validate import VALIDATION_CACHE as CLIENT_VALIDATION_CACHE
+from cactus_test_definitions.client.validate import validate_test_procedure as validate_client_test_procedure
+from cactus_test_definitions.compact import compact
+from cactus_test_definitions.errors import TestProcedureDefinitionError
+from cactus_test_definitions.parameters import ParameterSchema, ParameterType, SchemaTable
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.server.validate import VALIDATION_CACHE as SERVER_VALIDATION_CACHE
+from cactus_test_definitions.server.validate import validate_test_procedure as validate_server_test_procedure
+from cactus_test_definitions.validation_cache import (
+    ValidationCache,
+    ValidationStamp,
+    mark_read_only,
+    procedure_fingerprint,
+    read_only_token,
+    schema_version,
+)
+from cactus_test_definitions.views import view
+
+ALL_01 = client_test_procedures.TestProcedureId.ALL_01
+
+
+def parse_all_01() -> client_test_procedures.TestProcedure:
+    """A new (unshared) instance of ALL-01"""
+    return client_test_procedures.parse_test_procedure(client_test_procedures.TEST_PROCEDURE_CATALOG.read_yaml(ALL_01))
+
+
+@pytest.fixture
+def schema_table() -> SchemaTable:
+    return SchemaTable({"my-action": {"p1": ParameterSchema(True, ParameterType.Integer)}})
+
+
+def test_validation_cache_hit(schema_table):
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    validate = Mock()
+
+    stamp = cache.validate(procedure, validate)
+    assert isinstance(stamp, ValidationStamp)
+    assert stamp.fingerprint == procedure_fingerprint(procedure)
+    assert stamp.schema_version == schema_version([schema_table])
+    assert cache.stamp(procedure) == stamp
+    validate.assert_called_once()
+
+    assert cache.validate(procedure, validate) == stamp
+    validate.assert_called_once()  # Not revalidated
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().misses == 1
+    assert cache.cache_info().size == 1
+
+    cache.clear()
+    assert cache.stamp(procedure) is None
+    cache.validate(procedure, validate)
+    assert validate.call_count == 2
+
+
+def test_validation_cache_fingerprint_hit(schema_table):
+    """Distinct (but equal) procedures are matched by their fingerprint"""
+    cache = ValidationCache([schema_table])
+    validate = Mock()
+    stamp = cache.validate(parse_all_01(), validate)
+
+    other = parse_all_01()
+    assert cache.stamp(other) == stamp
+    assert cache.validate(other, validate) == stamp
+    assert cache.stamp(other) == stamp
+    validate.assert_called_once()
+
+
+def test_validation_cache_schema_modified(schema_table):
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    validate = Mock()
+    stamp = cache.validate(procedure, validate)
+
+    schema_table["my-action"]["p2"] = ParameterSchema(False, ParameterType.String)
+    assert cache.stamp(procedure) is None
+
+    new_stamp = cache.validate(procedure, validate)
+    assert validate.call_count == 2
+    assert new_stamp.fingerprint == stamp.fingerprint
+    assert new_stamp.schema_version != stamp.schema_version
+
+    # Unrelated schema tables can be modified without invalidating
+    SchemaTable({})["other"] = {}
+    assert cache.stamp(procedure) == new_stamp
+
+
+def test_validation_cache_failures_not_cached(schema_table):
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    validate = Mock(side_effect=TestProcedureDefinitionError("my-error"))
+
+    for _ in range(2):
+        with pytest.raises(TestProcedureDefinitionError):
+            cache.validate(procedure, validate)
+    assert validate.call_count == 2
+    assert cache.stamp(procedure) is None
+
+
+def test_validation_cache_views(schema_table):
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    validate = Mock()
+    stamp = cache.validate(procedure, validate)
+
+    procedure_view = view(procedure)
+    assert cache.stamp(procedure_view) == stamp
+    assert cache.validate(procedure_view, validate) == stamp
+    validate.assert_called_once()
+
+    procedure_view.description = "modified"
+    assert cache.stamp(procedure_view) is None
+    assert cache.validate(procedure_view, validate).fingerprint != stamp.fingerprint
+    assert validate.call_count == 2
+
+
+def test_validation_cache_mutated_after_validation(schema_table):
+    """A procedure modified after passing validation is revalidated (rather than reusing its stamp)"""
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    validate = Mock()
+    stamp = cache.validate(procedure, validate)
+
+    next(iter(procedure.steps.values())).actions.append(Action("not-a-real-action", {}))
+    assert cache.stamp(procedure) is None
+    assert cache.validate(procedure, validate).fingerprint != stamp.fingerprint
+    assert validate.call_count == 2
+
+
+def test_validate_test_procedure_mutated_after_validation():
+    procedure = parse_all_01()
+    validate_client_test_procedure(procedure, ALL_01)
+
+    next(iter(procedure.steps.values())).actions.append(Action("not-a-real-action", {}))
+    with pytest.raises(TestProcedureDefinitionError):
+        validate_client_test_procedure(procedure, ALL_01)
+
+
+def test_validation_cache_compact(schema_table):
+    """Compact procedures (which can't be modified) are matched by identity"""
+    cache = ValidationCache([schema_table])
+    procedure = compact(parse_all_01())
+    validate = Mock()
+
+    stamp = cache.validate(procedure, validate)
+    assert cache.stamp(procedure) is stamp
+    assert cache.validate(procedure, validate) is stamp
+    validate.assert_called_once()
+
+    assert cache.validate(compact(parse_all_01()), validate) == stamp  # Equal compact procedures share a fingerprint
+    validate.assert_called_once()
+
+
+def test_validation_cache_read_only(schema_table, monkeypatch):
+    """Read only procedures are matched by identity - their content is only fingerprinted when first validated"""
+    cache = ValidationCache([schema_table])
+    procedure = parse_all_01()
+    assert read_only_token(procedure) is None
+    mark_read_only(procedure)
+    token = read_only_token(procedure)
+    assert token is not None
+
+    fingerprint = Mock(side_effect=procedure_fingerprint)
+    monkeypatch.setattr(validation_cache, "procedure_fingerprint", fingerprint)
+    validate = Mock()
+    stamp = cache.validate(procedure, validate)
+    assert cache.validate(procedure, validate) is stamp
+    assert cache.validate(view(procedure), validate) is stamp, "Unmodified views are matched by their target"
+    assert cache.stamp(procedure) is stamp
+    fingerprint.assert_called_once()
+    validate.assert_called_once()
+
+    # Marking again (eg after modifying in place) issues a new token - so the procedure is fingerprinted again
+    next(iter(procedure.steps.values())).actions.append(Action("not-a-real-action", {}))
+    mark_read_only(procedure)
+    assert read_only_token(procedure) != token
+    assert cache.validate(procedure, validate).fingerprint != stamp.fingerprint
+    assert validate.call_count == 2
+
+
+def test_catalog_procedures_read_only():
+    assert read_only_token(client_test_procedures.get_test_procedure(ALL_01)) is not None
+    assert read_only_token(client_test_procedures.TEST_PROCEDURE_CATALOG.load(ALL_01)) is None, "Not cached"
+    assert read_only_token(parse_all_01()) is None
+    assert read_only_token(compact(parse_all_01())) is not None
+
+
+def test_validation_cache_max_fingerprints(schema_table):
+    cache = ValidationCache([schema_table], max_fingerprints=1)
+    validate = Mock()
+    first = compact(parse_all_01())
+    cache.validate(first, validate)
+    cache.validate(
+        compact(client_test_procedures.get_test_procedure(client_test_procedures.TestProcedureId.ALL_02)), validate
+    )
+
+    cache.validate(first, validate)  # Evicted
+    assert validate.call_count == 3
+
+
+def test_validate_test_procedure_memoized(monkeypatch):
+    procedure = parse_all_01()
+    stamp = validate_client_test_procedure(procedure, ALL_01)
+    assert CLIENT_VALIDATION_CACHE.stamp(procedure) == stamp
+
+    # Removing an action type used by ALL-01 invalidates (and then fails) the cached validation
+    action_type = next(a.type for step in procedure.steps.values() for a in step.actions)
+    monkeypatch.delitem(ACTION_PARAMETER_SCHEMA, action_type)
+    assert CLIENT_VALIDATION_CACHE.stamp(procedure) is None
+    with pytest.raises(TestProcedureDefinitionError):
+        validate_client_test_procedure(procedure, ALL_01)
+
+    monkeypatch.undo()
+    assert validate_client_test_procedure(procedure, ALL_01).fingerprint == stamp.fingerprint
+
+
+def test_validate_server_test_procedure_memoized():
+    procedure = server_test_procedures.get_test_procedure(server_test_procedures.TestProcedureId.S_ALL_01)
+    stamp = validate_server_test_procedure(procedure, server_test_procedures.TestProcedureId.S_ALL_01)
+    assert SERVER_VALIDATION_CACHE.stamp(procedure) == stamp
+
+
+def test_validate_test_procedure_invalid_not_memoized():
+    with open(Path("tests/data/client/tp_invalid_bad_param.yaml")) as fp:
+        procedure = client_test_procedures.parse_test_procedure(fp.read())
+
+    for _ in range(2):
+        with pytest.raises(TestProcedureDefinitionError):
+            validate_client_test_procedure(procedure, ALL_01)
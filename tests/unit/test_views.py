@@ -0,0 +1,200 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from cactus_test_definitions.catalog import TestProcedureCatalog
+from cactus_test_definitions.client import test_procedures as client_test_procedures
+from cactus_test_definitions.server import test_procedures as server_test_procedures
+from cactus_test_definitions.variable_expressions import Constant
+from cactus_test_definitions.views import ProcedureView, materialize, view
+
+
+@dataclasses.dataclass
+class MyChild:
+    name: str
+    values: list
+
+    @property
+    def size(self) -> int:
+        return len(self.values)
+
+    def describe(self) -> str:
+        return f"{self.name}: {self.values}"
+
+
+@dataclasses.dataclass
+class MyParent:
+    child: MyChild
+    children: dict[str, MyChild]
+    expression: Constant
+    optional: MyChild | None = None
+
+
+@pytest.fixture
+def original() -> MyParent:
+    return MyParent(
+        child=MyChild("c1", [1, 2]),
+        children={"c2": MyChild("c2", [MyChild("c3", [])])},
+        expression=Constant(1),
+    )
+
+
+def test_view_reads(original: MyParent):
+    v = view(original)
+    assert isinstance(v, MyParent)
+    assert isinstance(v, ProcedureView)
+    assert dataclasses.is_dataclass(v)
+    assert v == original
+    assert original == v
+    assert v.child is v.child, "Nested views should be retained"
+    assert v.children is v.children
+    assert v.expression is original.expression
+    assert v.optional is None
+    assert not v.is_modified()
+    assert dataclasses.asdict(v) == dataclasses.asdict(original)
+    assert repr(v).startswith("MyParentView(")
+
+
+def test_view_writes(original: MyParent):
+    v = view(original)
+    v.child.name = "new-name"
+    v.child.values.append(3)
+    v.children["c2"].values[0].name = "new-c3"
+    v.children["c4"] = MyChild("c4", [])
+    v.optional = MyChild("opt", [])
+
+    assert v.is_modified()
+    assert v != original
+    assert v.child.name == "new-name"
+    assert v.child.values == [1, 2, 3]
+    assert v.children["c2"].values[0].name == "new-c3"
+    assert set(v.children.keys()) == {"c2", "c4"}
+
+    # Nothing should have leaked through to the original
+    assert original == MyParent(
+        child=MyChild("c1", [1, 2]),
+        children={"c2": MyChild("c2", [MyChild("c3", [])])},
+        expression=original.expression,
+    )
+
+    # Other views should also be unaffected
+    assert view(original) == original
+
+    with pytest.raises(AttributeError):
+        v.not_a_field = 123
+    with pytest.raises(AttributeError):
+        del v.child
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda v: setattr(v.child, "name", "new-name"),
+        lambda v: v.child.values.pop(),
+        lambda v: v.children.pop("c2"),
+        lambda v: setattr(v.children["c2"].values[0], "values", [1]),
+    ],
+)
+def test_view_is_modified(original: MyParent, mutate):
+    v = view(original)
+    assert not v.is_modified()
+    assert v.children["c2"].values[0].values == [], "Reads shouldn't modify"
+    assert not v.is_modified()
+    mutate(v)
+    assert v.is_modified()
+
+
+def test_materialize(original: MyParent):
+    v = view(original)
+    v.children["c2"].values[0].name = "new-c3"
+    m = materialize(v)
+
+    assert type(m) is MyParent
+    assert type(m.children["c2"].values[0]) is MyChild
+    assert m == v
+    assert m.child is not original.child
+    assert m.expression is original.expression
+
+    assert pickle.loads(pickle.dumps(v)) == m
+    assert type(copy.deepcopy(v)) is MyParent
+
+
+def test_view_methods(original: MyParent):
+    """Methods / properties should see writes made through the view (not just the underlying instance)"""
+    v = view(original)
+    v.child.name = "new-name"
+    v.child.values.append(3)
+    assert v.child.describe() == "new-name: [1, 2, 3]"
+    assert v.child.size == 3
+    assert original.child.describe() == "c1: [1, 2]"
+
+
+@pytest.mark.parametrize("module", [client_test_procedures, server_test_procedures])
+def test_get_test_procedure_view_to_yaml(module):
+    """Inherited YAMLWizard methods should serialise the view (including any writes)"""
+    tp_id = list(module.TestProcedureId)[0]
+    v = module.get_test_procedure(tp_id, view=True)
+    v.description = "my-changed-description"
+    assert "my-changed-description" in v.to_yaml()
+    assert "my-changed-description" not in module.get_test_procedure(tp_id).to_yaml()
+
+
+@pytest.mark.parametrize(
+    "module, get_action",
+    [
+        (client_test_procedures, lambda tp: next(iter(tp.steps.values())).actions[0]),
+        (server_test_procedures, lambda tp: tp.steps[0].action),
+    ],
+)
+def test_get_test_procedure_view(module, get_action):
+    tp_id = list(module.TestProcedureId)[0]
+    shared = module.get_test_procedure(tp_id)
+    snapshot = copy.deepcopy(shared)
+
+    v1 = module.get_test_procedure(tp_id, view=True)
+    v2 = module.get_test_procedure(tp_id, view=True)
+    assert v1 is not v2
+    assert isinstance(v1, module.TestProcedure)
+    assert v1 == shared
+
+    action = get_action(v1)
+    assert isinstance(action, module.Action)
+    action.parameters["my-parameter"] = 123
+    assert get_action(v1).parameters["my-parameter"] == 123
+    v1.classes.append("my-class")
+
+    assert v1 != shared
+    assert v2 == shared
+    assert shared == snapshot
+    assert "my-parameter" not in get_action(v2).parameters
+
+    v1.steps.clear()
+    assert shared.steps
+
+
+def test_TestProcedureCatalog_view_compact():
+    catalog = TestProcedureCatalog(
+        "cactus_test_definitions.client.procedures",
+        client_test_procedures.TestProcedureId,
+        client_test_procedures.parse_test_procedure,
+        compact=True,
+    )
+    catalog.use_precompiled(None)
+    tp_id = client_test_procedures.TestProcedureId.ALL_01
+    compacted = catalog.get(tp_id)
+
+    v = catalog.view(tp_id)
+    assert isinstance(v.classes, list), "Compact tuples should be viewed as (mutable) lists"
+    v.classes.append("my-class")
+    v.description = "my-description"  # Compact classes are frozen - but the view isn't
+    first_step = next(iter(v.steps.values()))
+    first_step.actions[0].parameters["my-parameter"] = 1
+    assert "my-class" not in compacted.classes
+    assert compacted.description != "my-description"
+    assert "my-parameter" not in next(iter(compacted.steps.values())).actions[0].parameters
+
+    m = materialize(v)
+    assert m.description == "my-description"
+    assert type(m) is type(compacted), "Materializing should retain the compact classes"